@@ -5,6 +5,8 @@ import redis
 import yaml
 from pathlib import Path
 
+from services.dedup_store import create_id_store
+
 def clear_cache():
     """清空 ID 缓存"""
     
@@ -36,17 +38,17 @@ def clear_cache():
         return
     
     # 检查当前缓存
-    key_type = r.type(cache_key)
+    id_store = create_id_store(r, cache_key, config.get('deduplication', {}))
+    status = id_store.get_status()
+    key_type = status['type']
     print(f"\n当前缓存:")
     print(f"  键名: {cache_key}")
     print(f"  类型: {key_type}")
     
-    if key_type == 'set':
-        count = r.scard(cache_key)
-        print(f"  数量: {count} 个 ID")
-    elif key_type == 'zset':
-        count = r.zcard(cache_key)
-        print(f"  数量: {count} 个 ID")
+    if key_type in ('set', 'zset', 'buckets'):
+        print(f"  数量: {status['count']} 个 ID")
+        if key_type == 'buckets':
+            print(f"  小时桶: {status['buckets']} 个")
     elif key_type == 'none':
         print(f"  状态: 空")
     
@@ -55,7 +57,7 @@ def clear_cache():
     confirm = input("确认删除？(yes/no): ").strip().lower()
     
     if confirm == 'yes':
-        deleted = r.delete(cache_key)
+        deleted = id_store.clear()
         if deleted > 0:
             print(f"\n✅ 已删除缓存键: {cache_key}")
         else:
@@ -0,0 +1,87 @@
+"""
+关注列表管理
+登记 / 删除关注词，查看当前列表，实时查看提醒
+
+用法:
+    python manage_watchlist.py add TSLA "Tesla" "rate cut" --label 特斯拉
+    python manage_watchlist.py remove "rate cut"
+    python manage_watchlist.py list
+    python manage_watchlist.py tail              # 订阅提醒频道
+    python manage_watchlist.py tail --history 20 # 先显示提醒流中最近 20 条
+"""
+import argparse
+import json
+from pathlib import Path
+
+import redis
+import yaml
+
+from services.watchlist import add_patterns, remove_patterns
+
+
+def _print_alert(raw: str):
+    alert = json.loads(raw)
+    print(f"🔔 [{alert.get('matched_at')}] {alert.get('label')} ← {alert.get('source')} "
+          f"{alert.get('id')}: {alert.get('snippet', '')[:80]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='关注列表管理')
+    sub = parser.add_subparsers(dest='command', required=True)
+    add = sub.add_parser('add', help='登记关注词')
+    add.add_argument('patterns', nargs='+', help='关注词（股票代码、公司名、短语）')
+    add.add_argument('--label', default=None, help='提醒中显示的标签（默认为关注词本身）')
+    remove = sub.add_parser('remove', help='删除关注词')
+    remove.add_argument('patterns', nargs='+')
+    sub.add_parser('list', help='显示当前关注词')
+    tail = sub.add_parser('tail', help='实时查看提醒')
+    tail.add_argument('--history', type=int, default=0, help='先显示提醒流中最近 N 条')
+    args = parser.parse_args()
+
+    # 加载配置（当前目录下的配置文件）
+    config_path = Path(__file__).parent / "config_processing.yaml"
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+
+    redis_config = config['redis']
+    watchlist_config = config.get('watchlist', {})
+    patterns_key = watchlist_config.get('patterns_key', 'watchlist:patterns')
+    version_key = watchlist_config.get('version_key', 'watchlist:version')
+    client = redis.Redis(
+        host=redis_config['host'],
+        port=redis_config['port'],
+        db=redis_config['db_out'],
+        decode_responses=True
+    )
+
+    try:
+        if args.command == 'add':
+            version = add_patterns(client, {p: args.label or p for p in args.patterns}, patterns_key, version_key)
+            print(f"✅ 已登记 {len(args.patterns)} 个关注词 (版本 {version})")
+        elif args.command == 'remove':
+            removed, version = remove_patterns(client, args.patterns, patterns_key, version_key)
+            print(f"✅ 已删除 {removed} 个关注词 (版本 {version})")
+        elif args.command == 'list':
+            entries = client.hgetall(patterns_key)
+            print(f"关注词 {len(entries)} 个 (版本 {client.get(version_key) or 0}):")
+            for pattern, label in sorted(entries.items()):
+                print(f"  {pattern}" + (f"  → {label}" if label != pattern else ""))
+        else:
+            stream = watchlist_config.get('alert_stream', 'watchlist:alerts')
+            if args.history > 0:
+                for _, fields in reversed(client.xrevrange(stream, count=args.history)):
+                    _print_alert(fields['data'])
+            pubsub = client.pubsub()
+            pubsub.subscribe(watchlist_config.get('alert_channel', 'watchlist_alerts'))
+            print("等待提醒中（Ctrl+C 退出）...")
+            for message in pubsub.listen():
+                if message['type'] == 'message':
+                    _print_alert(message['data'])
+    except KeyboardInterrupt:
+        pass
+    except redis.ConnectionError as e:
+        print(f"❌ Redis 连接失败: {e}")
+
+
+if __name__ == "__main__":
+    main()
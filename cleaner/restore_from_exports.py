@@ -0,0 +1,92 @@
+"""
+从 JSONL 导出恢复清洗结果
+Redis 被清空或无持久化重启后，用 output 下的 cleaned_YYYY-MM-DD.jsonl 重建
+clean_data_queue 与去重 ID，Processor 无需等待 Scraper 重新填满 24 小时窗口。
+
+用法:
+    python restore_from_exports.py                  # 恢复最近 24 小时
+    python restore_from_exports.py --dry-run        # 只统计，不写入
+    python restore_from_exports.py --output-dir ./output --batch-size 10000
+
+说明:
+    近似重复索引、关注列表提醒与运行指标不会回放；恢复后发送一次完成通知即可触发 Processor。
+"""
+import argparse
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import redis
+import yaml
+
+from services.export_restore import HourlyQueue, find_export_files, restore_exports
+
+
+def main():
+    parser = argparse.ArgumentParser(description='从 JSONL 导出恢复清洗结果')
+    parser.add_argument('--output-dir', default=None, help='导出目录（默认为配置中的 paths.output）')
+    parser.add_argument('--hours', type=int, default=24, help='恢复的时间窗口（小时，与过期清理一致）')
+    parser.add_argument('--batch-size', type=int, default=5000, help='每个 pipeline 写入的数量')
+    parser.add_argument('--force', action='store_true', help='去重存储中已有的 ID 也重新写入')
+    parser.add_argument('--dry-run', action='store_true', help='只读取文件并统计，不写入 Redis')
+    args = parser.parse_args()
+
+    # 加载配置（当前目录下的配置文件）
+    base_dir = Path(__file__).parent
+    with open(base_dir / "config_processing.yaml", 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+
+    redis_config = config['redis']
+    output_dir = Path(args.output_dir) if args.output_dir else base_dir / config.get('paths', {}).get('output', './output')
+
+    # 导出文件按本地日期命名，多取一天覆盖时区差
+    since_date = (datetime.now() - timedelta(hours=args.hours, days=1)).strftime('%Y-%m-%d')
+    files = find_export_files(output_dir, since_date)
+
+    print("=" * 70)
+    print("从 JSONL 导出恢复清洗结果")
+    print("=" * 70)
+    print(f"导出目录: {output_dir}")
+    if not files:
+        print(f"⚠️ 没有 {since_date} 之后的导出文件")
+        return
+    for path in files:
+        print(f"  📄 {path.name} ({path.stat().st_size / 1024 / 1024:.1f} MB)")
+
+    r = redis.Redis(
+        host=redis_config['host'],
+        port=redis_config['port'],
+        db=redis_config['db_out'],
+        decode_responses=True
+    )
+
+    try:
+        r.ping()
+        hourly = HourlyQueue.from_config(r, redis_config['queue_out'], redis_config.get('queue_out_layout'))
+        stats = restore_exports(
+            r,
+            redis_config['queue_out'],
+            redis_config['id_cache'],
+            files,
+            dedup_config=config.get('deduplication', {}),
+            hourly=hourly,
+            retention_hours=args.hours,
+            batch_size=args.batch_size,
+            skip_existing=not args.force,
+            dry_run=args.dry_run
+        )
+    except redis.ConnectionError as e:
+        print(f"❌ Redis 连接失败: {e}")
+        return
+
+    print(f"\n保留窗口起点: {stats['cutoff_time']}")
+    print(f"读取 {stats['lines']} 行（过期 {stats['expired']}，无效 {stats['invalid']}，"
+          f"重复 {stats['superseded']}，已存在 {stats['existing']}）")
+    action = "可恢复" if args.dry_run else "已恢复"
+    print(f"✅ {action} {stats['restored']} 条 → {redis_config['queue_out']}"
+          f"{'（按小时分区）' if hourly is not None else ''}")
+    print(f"⏱️ 读取 {stats['read_sec']}s，写入 {stats['write_sec']}s，"
+          f"合计 {stats['elapsed_sec']}s（{stats['records_per_sec']} 条/秒）")
+
+
+if __name__ == "__main__":
+    main()
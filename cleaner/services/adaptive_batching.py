@@ -0,0 +1,230 @@
+"""
+自适应批量控制
+根据观测到的到达速率、清洗吞吐量与下游 Processor 的滞后，动态调整
+BatchedQueueMonitor 的触发批量与最长等待时间：
+
+- 平稳时：批量 ≈ 到达速率 × 目标延迟，数据在目标延迟内被清洗
+- 零星数据（目标延迟内预计不足 2 条）：等待 min_wait_sec 后立即清洗，单条突发新闻不再等 5 秒
+- 清洗跟不上到达速率或 Processor 滞后过大：批量翻倍（直到 max_batch），摊薄每次触发的固定开销
+"""
+import json
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveBatchController:
+    """基于 EWMA 的批量大小 / 等待时间控制器"""
+
+    def __init__(
+        self,
+        min_batch: int = 1,
+        max_batch: int = 2000,
+        min_wait_sec: float = 0.5,
+        max_wait_sec: float = 5.0,
+        target_latency_sec: float = 2.0,
+        throughput_headroom: float = 0.8,
+        max_processor_lag_sec: float = 120.0,
+        smoothing: float = 0.3,
+        lag_probe: Optional[Callable[[], Optional[float]]] = None,
+        lag_probe_interval_sec: float = 10.0
+    ):
+        """
+        初始化控制器
+
+        Args:
+            min_batch: 批量下限
+            max_batch: 批量上限
+            min_wait_sec: 最短等待时间（零星数据的触发延迟）
+            max_wait_sec: 最长等待时间
+            target_latency_sec: 目标延迟（数据到达到开始清洗）
+            throughput_headroom: 到达速率超过 吞吐量 × 该比例 时视为清洗跟不上
+            max_processor_lag_sec: Processor 滞后超过该值时合并更大的批次
+            smoothing: EWMA 平滑系数（越大越偏向最近的观测）
+            lag_probe: 返回 Processor 最近一次发布时间（epoch 秒）的函数，可选
+            lag_probe_interval_sec: 查询 Processor 发布时间的间隔（秒）
+        """
+        self.min_batch = max(1, int(min_batch))
+        self.max_batch = max(self.min_batch, int(max_batch))
+        self.min_wait_sec = min_wait_sec
+        self.max_wait_sec = max(min_wait_sec, max_wait_sec)
+        self.target_latency_sec = target_latency_sec
+        self.throughput_headroom = throughput_headroom
+        self.max_processor_lag_sec = max_processor_lag_sec
+        self.smoothing = smoothing
+        self.lag_probe = lag_probe
+        self.lag_probe_interval_sec = lag_probe_interval_sec
+
+        # 观测状态
+        self.arrival_rate = 0.0                 # 条/秒
+        self.throughput: Optional[float] = None  # 条/秒
+        self.processor_lag = 0.0                # 秒
+        self.boost = 0                          # 过载时的批量下限
+        self.last_output_time: Optional[float] = None
+        self.last_probe_time = 0.0
+
+    @classmethod
+    def from_config(cls, adaptive_config: Optional[Dict[str, Any]],
+                    lag_probe: Optional[Callable[[], Optional[float]]] = None) -> Optional['AdaptiveBatchController']:
+        """
+        根据 redis.queue_monitor.adaptive 配置创建实例
+
+        Returns:
+            AdaptiveBatchController，未启用时返回 None
+        """
+        if not adaptive_config or not adaptive_config.get('enabled', False):
+            return None
+
+        return cls(
+            min_batch=adaptive_config.get('min_batch', 1),
+            max_batch=adaptive_config.get('max_batch', 2000),
+            min_wait_sec=adaptive_config.get('min_wait_sec', 0.5),
+            max_wait_sec=adaptive_config.get('max_wait_sec', 5.0),
+            target_latency_sec=adaptive_config.get('target_latency_sec', 2.0),
+            throughput_headroom=adaptive_config.get('throughput_headroom', 0.8),
+            max_processor_lag_sec=adaptive_config.get('max_processor_lag_sec', 120.0),
+            smoothing=adaptive_config.get('smoothing', 0.3),
+            lag_probe=lag_probe,
+            lag_probe_interval_sec=adaptive_config.get('lag_probe_interval_sec', 10.0)
+        )
+
+    def _ewma(self, current: Optional[float], sample: float) -> float:
+        if current is None:
+            return sample
+        return self.smoothing * sample + (1 - self.smoothing) * current
+
+    def observe_arrivals(self, count: int, interval_sec: float):
+        """
+        记录一次轮询间隔内的新增数据（没有新数据时也应调用，使速率回落）
+
+        Args:
+            count: 新增条数
+            interval_sec: 距上次观测的时间（秒）
+        """
+        if interval_sec <= 0:
+            return
+        self.arrival_rate = self._ewma(self.arrival_rate, max(0, count) / interval_sec)
+
+    def observe_clean(self, items: int, duration_sec: float, now: Optional[float] = None,
+                      written: Optional[int] = None):
+        """
+        记录一次清洗，并据此调整过载时的批量下限
+
+        Args:
+            items: 本次清洗的条数
+            duration_sec: 清洗耗时（秒）
+            now: 当前时间（默认 time.time()）
+            written: 实际写入输出队列的条数（None 表示未知，按 items 计）；
+                为 0 时（全部去重 / 无效）Processor 没有新数据可发布，不更新最近输出时间
+        """
+        if (written if written is not None else items) > 0:
+            self.last_output_time = now if now is not None else time.time()
+        if items > 0 and duration_sec > 0:
+            self.throughput = self._ewma(self.throughput, items / duration_sec)
+
+        overloaded = (self.throughput is not None
+                      and self.arrival_rate > self.throughput * self.throughput_headroom)
+        lagging = self.processor_lag > self.max_processor_lag_sec
+        if overloaded or lagging:
+            self.boost = min(self.max_batch, max(self.boost * 2, items * 2, self.min_batch))
+        else:
+            self.boost //= 2
+
+    def observe_processor(self, publish_time: Optional[float]):
+        """
+        记录 Processor 最近一次发布结果的时间，滞后 = 本地最近一次输出时间 - 发布时间
+
+        Args:
+            publish_time: Processor 发布时间（epoch 秒），未知时为 None
+        """
+        if publish_time is None or self.last_output_time is None:
+            self.processor_lag = 0.0
+            return
+        self.processor_lag = max(0.0, self.last_output_time - publish_time)
+
+    def maybe_probe(self, now: Optional[float] = None):
+        """按 lag_probe_interval_sec 查询一次 Processor 的发布时间"""
+        if self.lag_probe is None:
+            return
+        now = now if now is not None else time.time()
+        if now - self.last_probe_time < self.lag_probe_interval_sec:
+            return
+        self.last_probe_time = now
+        try:
+            self.observe_processor(self.lag_probe())
+        except Exception as e:
+            logger.debug(f"查询 Processor 发布时间失败: {e}")
+
+    @property
+    def batch_size(self) -> int:
+        """当前的触发批量"""
+        expected = int(self.arrival_rate * self.target_latency_sec)
+        return max(self.min_batch, min(self.max_batch, max(expected, self.boost)))
+
+    @property
+    def max_wait(self) -> float:
+        """当前的最长等待时间（从第一条未清洗数据到达算起）"""
+        if self.processor_lag > self.max_processor_lag_sec:
+            return self.max_wait_sec
+        if self.arrival_rate * self.target_latency_sec < 2:
+            # 零星数据：等不到更多数据，尽快清洗
+            return self.min_wait_sec
+        return max(self.min_wait_sec, min(self.max_wait_sec, self.target_latency_sec))
+
+    def should_trigger(self, pending: int, waited_sec: float) -> Optional[str]:
+        """
+        判断是否触发清洗
+
+        Args:
+            pending: 累计未清洗的条数
+            waited_sec: 第一条未清洗数据已等待的时间（秒）
+
+        Returns:
+            触发原因，不触发时返回 None
+        """
+        if pending <= 0:
+            return None
+        batch_size = self.batch_size
+        if pending >= batch_size:
+            return f"达到自适应批量 ({batch_size})"
+        max_wait = self.max_wait
+        if waited_sec >= max_wait:
+            return f"超过自适应等待时间 ({max_wait:.1f}秒)"
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """控制器状态"""
+        return {
+            'arrival_rate': round(self.arrival_rate, 2),
+            'throughput': round(self.throughput, 2) if self.throughput is not None else None,
+            'processor_lag_sec': round(self.processor_lag, 1),
+            'batch_size': self.batch_size,
+            'max_wait_sec': round(self.max_wait, 2)
+        }
+
+
+def processor_publish_probe(client, metadata_key: str = "processed_data:metadata") -> Callable[[], Optional[float]]:
+    """
+    创建读取 Processor 发布时间的函数（metadata.redis_publish_time，ISO 8601 UTC）
+
+    Args:
+        client: Processor 输出所在的 Redis 客户端
+        metadata_key: 元数据键
+
+    Returns:
+        无参函数，返回发布时间的 epoch 秒，未发布时返回 None
+    """
+    from datetime import datetime, timezone
+
+    def probe() -> Optional[float]:
+        raw = client.get(metadata_key)
+        if not raw:
+            return None
+        published = json.loads(raw).get('redis_publish_time')
+        if not published:
+            return None
+        return datetime.strptime(published, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc).timestamp()
+
+    return probe
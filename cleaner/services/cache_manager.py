@@ -3,9 +3,10 @@ ID 缓存管理器
 负责管理去重 ID 缓存的状态和操作
 """
 import logging
-import time
 from typing import Dict, Any
 
+from .dedup_store import create_id_store
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,11 +27,12 @@ class CacheManager:
         self.dedup_mode = dedup_config.get('mode', 'permanent')
         self.window_hours = dedup_config.get('window_hours', 24)
         self.clear_on_start = dedup_config.get('clear_on_start', False)
+        self.id_store = create_id_store(redis_connector.r, cache_key, dedup_config)
     
     def clear_cache(self):
         """清空 ID 缓存"""
         try:
-            deleted = self.redis_connector.r.delete(self.cache_key)
+            deleted = self.id_store.clear()
             
             if deleted > 0:
                 logger.info(f"✓ 已清空 ID 缓存: {self.cache_key}")
@@ -47,41 +49,7 @@ class CacheManager:
             包含缓存状态的字典
         """
         try:
-            key_type = self.redis_connector.r.type(self.cache_key)
-            
-            status = {
-                'type': key_type,
-                'count': 0,
-                'valid_count': 0,
-                'expired_count': 0
-            }
-            
-            if key_type == 'set':
-                # SET 类型（永久模式）
-                status['count'] = self.redis_connector.r.scard(self.cache_key)
-                status['mode'] = 'permanent'
-            
-            elif key_type == 'zset':
-                # ZSET 类型（时间窗口模式）
-                count = self.redis_connector.r.zcard(self.cache_key)
-                status['count'] = count
-                status['mode'] = 'time_window'
-                
-                if count > 0 and self.dedup_mode == 'time_window':
-                    # 统计过期和有效 ID
-                    current_time = time.time()
-                    expiry_time = current_time - (self.window_hours * 3600)
-                    expired_count = self.redis_connector.r.zcount(self.cache_key, 0, expiry_time)
-                    status['valid_count'] = count - expired_count
-                    status['expired_count'] = expired_count
-            
-            elif key_type == 'none':
-                status['mode'] = 'empty'
-            else:
-                status['mode'] = 'unknown'
-            
-            return status
-            
+            return self.id_store.get_status()
         except Exception as e:
             logger.warning(f"获取缓存状态失败: {e}")
             return {'type': 'error', 'error': str(e)}
@@ -114,6 +82,16 @@ class CacheManager:
                 logger.info(f"  有效 ID: {status['valid_count']}")
                 logger.info(f"  过期 ID: {status['expired_count']}")
         
+        elif key_type == 'buckets':
+            logger.info(f"  类型: 小时分桶 SET (时间窗口模式, {status['window_hours']} 小时)")
+            logger.info(f"  有效桶数: {status['buckets']}")
+            logger.info(f"  总 ID 数: {status['count']}")
+        
+        elif key_type == 'bloom':
+            logger.info(f"  类型: 可扩展布隆过滤器 (永久模式, 误判率 {status['error_rate']})")
+            logger.info(f"  总 ID 数: {status['count']}")
+            logger.info(f"  层数: {status['layers']}, 占用: {status['memory_bytes'] / 1024:.0f} KB")
+        
         elif key_type == 'none':
             logger.info(f"  状态: 空（未初始化）")
         elif key_type == 'error':
@@ -7,7 +7,7 @@
 """
 import logging
 import time
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from pathlib import Path
 import sys
 
@@ -27,6 +27,16 @@ QUEUE_OUT = CONFIG['redis']['queue_out']
 ID_CACHE_KEY = CONFIG['redis']['id_cache']
 LOG_DIR = Path(__file__).parent.parent / "logs"
 LOG_DIR.mkdir(exist_ok=True)
+OUTPUT_DIR = Path(__file__).parent.parent / "output"
+
+# 仓库根目录（共用的 utils 模块）
+REPO_ROOT = str(Path(__file__).resolve().parent.parent.parent)
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from utils.time_parser import parse_epoch
+from utils.text_tokenizer import TextTokenizer, load_stop_words
+from utils.hourly_queue import HourlyQueue
 
 # 导入本模块的组件
 from .redis_manager import RedisConnectionManager
@@ -34,7 +44,14 @@ from .notification_handler import NotificationHandler
 from .cache_manager import CacheManager
 from .signal_handler import SignalHandler
 from .single_pass_cleaner import SinglePassCleaner
-from .queue_monitor import QueueMonitor, BatchedQueueMonitor
+from .local_dedup_cache import LocalDedupCache
+from .cleaning_pool import CleaningPool
+from .export_writer import JsonlExporter
+from .queue_monitor import QueueMonitor, BatchedQueueMonitor, BlockingQueueConsumer
+from .partitioning import PartitionRouter, partition_key
+from .adaptive_batching import AdaptiveBatchController, processor_publish_probe
+from .cleaner_metrics import CleanerMetrics
+from .watchlist import Watchlist
 
 # 配置日志
 logging.basicConfig(
@@ -51,17 +68,36 @@ logger = logging.getLogger(__name__)
 class EventDrivenCleaner:
     """事件驱动的清洗器 - 现在改为基于队列变化自动触发清洗"""
     
-    def __init__(self):
-        """初始化清洗器"""
+    def __init__(self, worker_index: int = 0, worker_count: Optional[int] = None):
+        """
+        初始化清洗器
+        
+        Args:
+            worker_index: 本 worker 的序号（多 worker 分区模式）
+            worker_count: worker 总数（默认读取 partitioning.worker_count，大于 1 时启用分区模式）
+        """
         self.config = CONFIG
         
+        # 多 worker 分区配置（每个 worker 只消费 {queue_in}:part:<worker_index>）
+        partitioning_config = self.config.get('partitioning', {})
+        self.worker_count = max(1, int(worker_count or partitioning_config.get('worker_count', 1)))
+        self.worker_index = worker_index
+        if not 0 <= self.worker_index < self.worker_count:
+            raise ValueError(f"worker_index 必须在 [0, {self.worker_count}) 范围内: {worker_index}")
+        self.partitioned = self.worker_count > 1
+        self.router_consumer: Optional[BlockingQueueConsumer] = None
+        
         # 队列监控配置（新）
         self.queue_monitor_config = self.config.get('redis', {}).get('queue_monitor', {})
         self.monitor_enabled = self.queue_monitor_config.get('enabled', True)
-        self.monitor_mode = self.queue_monitor_config.get('mode', 'batched')  # 'realtime' 或 'batched'
+        self.monitor_mode = self.queue_monitor_config.get('mode', 'batched')  # 'realtime' / 'batched' / 'blocking'
         self.batch_size = self.queue_monitor_config.get('batch_size', 10)
         self.max_wait_sec = self.queue_monitor_config.get('max_wait_sec', 5.0)
         self.check_interval = self.queue_monitor_config.get('check_interval_sec', 0.5)
+        self.blocking_config = self.queue_monitor_config.get('blocking', {})
+        self.adaptive_config = self.queue_monitor_config.get('adaptive', {})
+        self.retention_interval = self.blocking_config.get('retention_interval_sec', 60)
+        self.last_retention = 0.0
         
         # 旧配置（兼容，用于可选的通知发送）
         self.notification_listen = self.config.get('redis', {}).get('notification_listen', {})
@@ -77,6 +113,34 @@ class EventDrivenCleaner:
         # 去重配置
         self.dedup_config = self.config.get('deduplication', {})
         
+        # 进程内去重缓存（跨批次复用，避免重复 ID 反复查询 Redis）
+        self.local_dedup_cache = LocalDedupCache.from_config(
+            self.dedup_config.get('local_cache', {})
+        )
+        
+        # 多进程清洗池（积压较多时并行解析与清洗，跨轮次复用子进程）
+        self.cleaning_pool = CleaningPool.from_config(self.config.get('processing', {}))
+        
+        # 预先分词（停用词取自 Processor 配置，Processor 在版本一致时直接使用）
+        self.tokenizer: Optional[TextTokenizer] = None
+        if self.config.get('tokenizer', {}).get('enabled', False):
+            self.tokenizer = TextTokenizer(load_stop_words())
+        
+        # 输出队列布局（单个列表 / 按小时分区）
+        self.output_layout_config = self.config.get('redis', {}).get('queue_out_layout', {})
+        
+        # 读取配置与常驻清洗器（首次清洗时创建）
+        self.reader_config = self.config.get('reader', {})
+        self.worker: Optional[SinglePassCleaner] = None
+        
+        # 导出配置（追加写入 + 大小滚动 + 定期合并）
+        export_config = self.config.get('output', {})
+        self.export_max_bytes = export_config.get('export_max_mb', 64) * 1024 * 1024
+        self.consolidate_interval = export_config.get('consolidate_interval_sec', 3600)
+        # 分区模式下每个 worker 写自己的导出文件，避免多进程追加同一文件
+        self.export_prefix = f"cleaned-w{self.worker_index}" if self.partitioned else "cleaned"
+        self.last_consolidation = 0.0
+        
         # 运行状态
         self.running = True
         
@@ -100,10 +164,19 @@ class EventDrivenCleaner:
         logger.info("=" * 70)
         logger.info(f"监控模式: {self.monitor_mode}")
         logger.info(f"监控启用: {self.monitor_enabled}")
-        
-        if self.monitor_mode == 'batched':
+        if self.partitioned:
+            logger.info(f"分区模式: worker {self.worker_index}/{self.worker_count} "
+                        f"(消费 {partition_key(QUEUE_IN, self.worker_index)})")
+        
+        if self.monitor_mode == 'batched' and self.adaptive_config.get('enabled', False):
+            logger.info(f"自适应批量: {self.adaptive_config.get('min_batch', 1)}~"
+                        f"{self.adaptive_config.get('max_batch', 2000)} 条, "
+                        f"目标延迟 {self.adaptive_config.get('target_latency_sec', 2.0)} 秒")
+        elif self.monitor_mode == 'batched':
             logger.info(f"批量大小: {self.batch_size} 条数据")
             logger.info(f"最长等待: {self.max_wait_sec} 秒")
+        elif self.monitor_mode == 'blocking':
+            logger.info(f"阻塞消费: 每批最多 {self.blocking_config.get('max_batch', 200)} 条 (会从输入队列取走数据)")
         
         logger.info(f"检查间隔: {self.check_interval} 秒")
         logger.info(f"发送通知: {self.send_enabled} ({self.send_channel})")
@@ -112,6 +185,25 @@ class EventDrivenCleaner:
         if self.dedup_config.get('mode') == 'time_window':
             logger.info(f"时间窗口: {self.dedup_config.get('window_hours', 24)} 小时")
         logger.info(f"启动时清空: {'是' if self.dedup_config.get('clear_on_start', False) else '否'}")
+        logger.info(f"本地去重缓存: {'启用' if self.local_dedup_cache else '禁用'}")
+        logger.info(f"预先分词: {self.tokenizer.version if self.tokenizer else '禁用'}")
+        watchlist_config = self.config.get('watchlist', {})
+        if watchlist_config.get('enabled', False):
+            logger.info(f"关注提醒: {watchlist_config.get('alert_channel', 'watchlist_alerts')} / "
+                        f"{watchlist_config.get('alert_stream', 'watchlist:alerts')}")
+        else:
+            logger.info("关注提醒: 禁用")
+        if self.output_layout_config.get('layout', 'list') == 'hourly':
+            logger.info(f"输出布局: 按小时分区 ({QUEUE_OUT}:YYYYMMDDHH)")
+        else:
+            logger.info(f"输出布局: 单个列表 ({QUEUE_OUT})")
+        if self.cleaning_pool:
+            logger.info(f"多进程清洗: {self.cleaning_pool.workers} 个子进程 "
+                        f"(积压 ≥ {self.cleaning_pool.parallel_threshold} 条时启用)")
+        else:
+            logger.info("多进程清洗: 禁用")
+        columnar_threshold = self._columnar_threshold()
+        logger.info(f"列式清洗: {f'积压 ≥ {columnar_threshold} 条时启用' if columnar_threshold else '禁用'}")
         logger.info("=" * 70)
     
     def _stop(self):
@@ -127,6 +219,10 @@ class EventDrivenCleaner:
                 logger.info("  ✓ 队列监控器已停止")
             except Exception as e:
                 logger.warning(f"  ⚠️  停止队列监控器出错: {e}")
+        
+        # 停止分区分发器（如果存在）
+        if self.router_consumer:
+            self.router_consumer.stop()
     
     def _connect_redis(self):
         """连接 Redis"""
@@ -147,48 +243,99 @@ class EventDrivenCleaner:
         )
         
         # 初始化缓存管理器（创建一个简单的连接器对象）
-        import redis
         class SimpleConnector:
-            def __init__(self, host, port, db):
-                self.r = redis.Redis(host=host, port=port, db=db, decode_responses=True)
+            def __init__(self, client):
+                self.r = client
         
-        r_out = SimpleConnector(REDIS_HOST, REDIS_PORT, DB_OUT)
+        r_out = SimpleConnector(self.redis_manager.get_client(DB_OUT))
         self.cache_manager = CacheManager(r_out, ID_CACHE_KEY, self.dedup_config)
         
         # 如果配置要求，清空 ID 缓存
         if self.dedup_config.get('clear_on_start', False):
-            self.cache_manager.clear_cache()
+            self._clear_dedup_state()
     
-    def _run_cleaning(self) -> int:
+    def _clear_dedup_state(self):
+        """清空 ID 缓存、本地去重缓存与读取游标（下一轮全量重新清洗）"""
+        self.cache_manager.clear_cache()
+        if self.local_dedup_cache:
+            self.local_dedup_cache.clear()
+        worker = self._get_worker()
+        if worker.cursor is not None:
+            worker.cursor.reset()
+    
+    def _get_worker(self) -> SinglePassCleaner:
         """
-        执行清洗任务（单次处理）
+        获取常驻清洗器（首次调用时创建）
         
-        Returns:
-            清洗的数据量
+        清洗器复用共享连接池，并在多轮清洗之间保留 ID 存储、近似去重索引与读取游标等状态
         """
-        try:
-            # 创建单次清洗器
-            cleaner = SinglePassCleaner(
+        if self.worker is None:
+            self.worker = SinglePassCleaner(
                 redis_host=REDIS_HOST,
                 redis_port=REDIS_PORT,
                 db_in=DB_IN,
                 db_out=DB_OUT,
                 queue_in=QUEUE_IN,
                 queue_out=QUEUE_OUT,
-                id_cache_key=ID_CACHE_KEY
+                id_cache_key=ID_CACHE_KEY,
+                local_cache=self.local_dedup_cache,
+                dedup_config=self.dedup_config,
+                pool=self.cleaning_pool,
+                near_dup_config=self.config.get('near_duplicate', {}),
+                r_in=self.redis_manager.get_client(DB_IN),
+                r_out=self.redis_manager.get_client(DB_OUT),
+                reader_config=self.reader_config,
+                metrics=CleanerMetrics.from_config(
+                    self.redis_manager.get_client(DB_OUT),
+                    self.config.get('stats', {}),
+                    self.config.get('monitor', {})
+                ),
+                tokenizer=self.tokenizer,
+                hourly_output=HourlyQueue.from_config(
+                    self.redis_manager.get_client(DB_OUT), QUEUE_OUT, self.output_layout_config
+                ),
+                watchlist=Watchlist.from_config(
+                    self.redis_manager.get_client(DB_OUT), self.config.get('watchlist', {})
+                ),
+                columnar_threshold=self._columnar_threshold()
             )
+        return self.worker
+    
+    def _columnar_threshold(self) -> Optional[int]:
+        """列式清洗的阈值（processing.columnar 未启用时为 None）"""
+        processing_config = self.config.get('processing', {})
+        if not processing_config.get('columnar', False):
+            return None
+        return processing_config.get('columnar_threshold', 500)
+    
+    def _output_length(self, redis_conn) -> int:
+        """输出队列的数据量（按小时分区时为各小时列表之和）"""
+        hourly = self._get_worker().hourly_output
+        if hourly is not None:
+            return hourly.length()
+        return redis_conn.llen(QUEUE_OUT)
+    
+    def _run_cleaning(self) -> int:
+        """
+        执行清洗任务（单次处理）
+        
+        Returns:
+            清洗的数据量
+        """
+        try:
+            # 复用常驻清洗器
+            cleaner = self._get_worker()
             
             # 执行单次清洗
-            stats = cleaner.clean_once(batch_size=100)
+            stats = cleaner.clean_once(batch_size=self.reader_config.get('batch_size', 100))
             
-            # 导出到文件
+            # 追加导出本轮新数据
             if stats['cleaned'] > 0:
                 logger.info("\n📦 导出清洗结果到文件...")
-                output_dir = Path(__file__).parent.parent / "output"
-                cleaner.export_to_file(output_dir)
+                cleaner.export_to_file(OUTPUT_DIR, self.export_max_bytes, self.export_prefix)
             
-            # 关闭清洗器
-            cleaner.close()
+            # 定期合并往日的导出分段
+            self._maybe_consolidate_exports()
             
             return stats['cleaned']
             
@@ -198,6 +345,17 @@ class EventDrivenCleaner:
             traceback.print_exc()
             return 0
     
+    def _maybe_consolidate_exports(self):
+        """距上次合并超过 consolidate_interval_sec 时合并往日的导出分段"""
+        now = time.time()
+        if now - self.last_consolidation < self.consolidate_interval:
+            return
+        self.last_consolidation = now
+        try:
+            JsonlExporter(OUTPUT_DIR, self.export_max_bytes, self.export_prefix).consolidate()
+        except Exception as e:
+            logger.warning(f"合并导出文件失败: {e}")
+    
     def _process_notification(self, message: Dict[str, Any]):
         """
         处理收到的通知消息
@@ -221,20 +379,13 @@ class EventDrivenCleaner:
             # 发送完成通知给 Processor
             logger.info("📤 准备发送清洗完成通知...")
             # 获取输出队列长度
-            import redis
-            r_out = redis.Redis(
-                host=REDIS_HOST,
-                port=REDIS_PORT,
-                db=DB_OUT,
-                decode_responses=True
-            )
+            r_out = self.redis_manager.get_client(DB_OUT)
             
             # 清理超过 24 小时的旧数据
             logger.info("\n🧹 清理超过 24 小时的旧数据...")
             clean_result = self._clean_old_data(r_out, QUEUE_OUT, hours=24)
             
-            queue_length = r_out.llen(QUEUE_OUT)
-            r_out.close()
+            queue_length = self._output_length(r_out)
             crawler_stats = message.get('statistics', {})
             
             self.notification_handler.send_completion_notification(
@@ -272,6 +423,11 @@ class EventDrivenCleaner:
             dict: 清理结果统计
         """
         logger.info(f"\n🗑️  开始清理数据 - 仅保留当前整点往前 {hours} 小时的数据...")
+        
+        hourly = self._get_worker().hourly_output
+        if hourly is not None:
+            return self._drop_old_hours(hourly, hours)
+        
         logger.info(f"   📌 时间基准字段: created_at (原始发布时间) 或 timestamp (如果无 created_at)")
         
         try:
@@ -306,89 +462,76 @@ class EventDrivenCleaner:
                     'remaining': 0
                 }
             
-            # 从队列尾部（最旧的数据）开始检查
-            # 使用 LINDEX 逐个检查，遇到新数据就停止
+            # 从队列尾部（最旧的数据）开始按块读取检查，遇到新数据就停止
             items_to_remove = []
+            chunk_size = 500
+            end_index = queue_length - 1
+            reached_new_data = False
             
-            for i in range(queue_length - 1, -1, -1):  # 从尾部向头部遍历
-                try:
-                    # 获取队列中的数据
-                    data_str = redis_conn.lindex(queue_name, i)
-                    if not data_str:
-                        continue
-                    
-                    checked_count += 1
-                    data = json.loads(data_str)
-                    
-                    # 优先使用 created_at（原始发布时间），其次使用 timestamp（处理时间）
-                    # created_at 是数据的原始发布时间（如 Reddit 帖子发布时间）
-                    # timestamp 是 Cleaner 处理数据时添加的当前时间
-                    time_field = None
-                    if 'created_at' in data:
-                        time_field = 'created_at'
-                    elif 'timestamp' in data:
-                        time_field = 'timestamp'
-                    else:
-                        logger.warning(f"数据既无 created_at 也无 timestamp，跳过: {data_str[:100]}")
-                        continue
-                    
-                    time_value = data[time_field]
-                    
-                    # 转换时间戳为浮点数（处理字符串或数字类型）
+            while end_index >= 0 and not reached_new_data:
+                start_index = max(0, end_index - chunk_size + 1)
+                chunk = redis_conn.lrange(queue_name, start_index, end_index)
+                
+                for offset in range(len(chunk) - 1, -1, -1):  # 从尾部向头部遍历
+                    i = start_index + offset
+                    data_str = chunk[offset]
                     try:
-                        if isinstance(time_value, str):
-                            # 如果是 ISO 格式字符串，转换为时间戳
-                            if 'T' in time_value or '-' in time_value:
-                                from datetime import datetime
-                                # 处理不同的 ISO 格式
-                                ts = time_value.replace('Z', '+00:00').replace(' ', 'T')
-                                dt = datetime.fromisoformat(ts)
-                                timestamp = dt.timestamp()
-                            else:
-                                # 尝试直接转为浮点数
-                                timestamp = float(time_value)
-                        elif isinstance(time_value, (int, float)):
-                            # 已经是数字类型
-                            timestamp = float(time_value)
+                        if not data_str:
+                            continue
+                        
+                        checked_count += 1
+                        data = json.loads(data_str)
+                        
+                        # 优先使用 created_ts / created_at（原始发布时间），其次使用 timestamp（处理时间）
+                        # created_at 是数据的原始发布时间（如 Reddit 帖子发布时间），created_ts 是其 epoch 秒
+                        # timestamp 是 Cleaner 处理数据时添加的当前时间
+                        if 'created_ts' in data:
+                            time_field = 'created_ts'
+                        elif 'created_at' in data:
+                            time_field = 'created_at'
+                        elif 'timestamp' in data:
+                            time_field = 'timestamp'
                         else:
-                            logger.warning(f"时间值类型不支持: {type(time_value)}, 跳过")
+                            logger.warning(f"数据既无 created_at 也无 timestamp，跳过: {data_str[:100]}")
                             continue
                         
-                    except (ValueError, TypeError) as e:
-                        logger.warning(f"时间值转换失败: {time_value} ({type(time_value)}), 字段: {time_field}, 错误: {e}")
-                        continue
-                    
-                    # 如果是旧数据，标记删除
-                    if timestamp < cutoff_timestamp:
-                        items_to_remove.append(i)
-                        removed_count += 1
-                    else:
-                        # 遇到新数据，停止检查（因为队列是按时间顺序的）
-                        break
+                        time_value = data[time_field]
+                        timestamp = parse_epoch(time_value, queue_name, time_field)
+                        if timestamp is None:
+                            logger.warning(f"时间值转换失败: {time_value} ({type(time_value)}), 字段: {time_field}")
+                            continue
+                        
+                        # 如果是旧数据，标记删除
+                        if timestamp < cutoff_timestamp:
+                            items_to_remove.append(i)
+                            removed_count += 1
+                        else:
+                            # 遇到新数据，停止检查（因为队列是按时间顺序的）
+                            reached_new_data = True
+                            break
+                        
+                        # 每检查 100 条数据输出一次进度
+                        if checked_count % 100 == 0:
+                            logger.info(f"已检查 {checked_count} 条数据，发现 {removed_count} 条旧数据")
                     
-                    # 每检查 100 条数据输出一次进度
-                    if checked_count % 100 == 0:
-                        logger.info(f"已检查 {checked_count} 条数据，发现 {removed_count} 条旧数据")
+                    except json.JSONDecodeError as e:
+                        logger.error(f"JSON 解析失败: {e}")
+                        continue
+                    except Exception as e:
+                        logger.error(f"处理数据时出错: {e}")
+                        continue
                 
-                except json.JSONDecodeError as e:
-                    logger.error(f"JSON 解析失败: {e}")
-                    continue
-                except Exception as e:
-                    logger.error(f"处理数据时出错: {e}")
-                    continue
+                end_index = start_index - 1
             
             # 删除旧数据（从后往前删除，避免索引变化）
             if items_to_remove:
                 logger.info(f"正在删除 {len(items_to_remove)} 条旧数据...")
                 
                 # 使用 LTRIM 删除尾部旧数据
-                # 因为旧数据在尾部，我们只需要保留前面的新数据
-                keep_count = queue_length - removed_count
-                if keep_count > 0:
-                    redis_conn.ltrim(queue_name, 0, keep_count - 1)
-                else:
-                    # 全部是旧数据，清空队列
-                    redis_conn.delete(queue_name)
+                # 因为旧数据在尾部，我们只需要保留前面的新数据；
+                # 用相对尾部的下标，检查期间其他 worker 在头部写入的数据不会被误删
+                # （全部是旧数据时等价于清空队列）
+                redis_conn.ltrim(queue_name, 0, -(removed_count + 1))
             
             remaining = redis_conn.llen(queue_name)
             
@@ -418,6 +561,37 @@ class EventDrivenCleaner:
                 'error': str(e)
             }
     
+    def _drop_old_hours(self, hourly: HourlyQueue, hours: int = 24) -> Dict[str, Any]:
+        """
+        按小时分区布局的过期清理：直接删除早于保留下界的整小时列表，不逐条检查
+        
+        Args:
+            hourly: 按小时分区的输出队列
+            hours: 保留时间（小时）
+            
+        Returns:
+            dict: 清理结果统计（与 _clean_old_data 相同的字段）
+        """
+        from datetime import datetime, timezone, timedelta
+        
+        current_hour = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        cutoff_time = current_hour - timedelta(hours=hours)
+        try:
+            result = hourly.drop_before(cutoff_time.timestamp())
+            remaining = hourly.length()
+            logger.info(f"✅ 清理完成: 删除 {result['hours']} 个小时列表共 {result['removed']} 条数据 "
+                        f"(早于 {cutoff_time.isoformat()})，保留 {remaining} 条")
+            return {
+                'removed': result['removed'],
+                'checked': 0,
+                'remaining': remaining,
+                'cutoff_time': cutoff_time.isoformat(),
+                'current_hour': current_hour.isoformat()
+            }
+        except Exception as e:
+            logger.error(f"清理旧数据时出错: {e}")
+            return {'removed': 0, 'checked': 0, 'remaining': None, 'error': str(e)}
+    
     def run_queue_driven(self):
         """
         基于队列变化触发的运行模式（新方式）
@@ -433,25 +607,24 @@ class EventDrivenCleaner:
         
         try:
             # 初始化缓存管理器
-            import redis
             class SimpleConnector:
-                def __init__(self, host, port, db):
-                    self.r = redis.Redis(host=host, port=port, db=db, decode_responses=True)
+                def __init__(self, client):
+                    self.r = client
             
-            r_out = SimpleConnector(REDIS_HOST, REDIS_PORT, DB_OUT)
+            r_out = SimpleConnector(self.redis_manager.get_client(DB_OUT))
             self.cache_manager = CacheManager(r_out, ID_CACHE_KEY, self.dedup_config)
             
-            if self.dedup_config.get('clear_on_start', False):
-                self.cache_manager.clear_cache()
+            if self.dedup_config.get('clear_on_start', False) and self.worker_index == 0:
+                self._clear_dedup_state()
+            
+            # 重置运行指标（分区模式下只由 worker 0 执行）
+            metrics = self._get_worker().metrics
+            if metrics and self.config.get('stats', {}).get('reset_on_start', False) and self.worker_index == 0:
+                metrics.reset()
             
             # 初始化通知处理器（可选，仅用于发送完成通知）
             if self.send_enabled:
-                r_publish = redis.Redis(
-                    host=REDIS_HOST,
-                    port=REDIS_PORT,
-                    db=DB_OUT,
-                    decode_responses=True
-                )
+                r_publish = self.redis_manager.get_client(DB_OUT)
                 self.notification_handler = NotificationHandler(
                     r_publish,
                     self.send_enabled,
@@ -459,8 +632,24 @@ class EventDrivenCleaner:
                 )
             
             # 创建队列监控器
-            if self.monitor_mode == 'batched':
-                # 批量模式：累积到指定数量或超时才清洗
+            if self.partitioned:
+                # 分区模式：后台线程把 data_queue 分发到各分区，本 worker 阻塞消费自己的分区
+                self._start_partition_router()
+                self.queue_monitor = self._create_blocking_consumer(
+                    partition_key(QUEUE_IN, self.worker_index),
+                    f"part-{self.worker_index}"
+                )
+            elif self.monitor_mode == 'blocking':
+                # 阻塞消费模式：BLMOVE 取走数据，清洗成功后确认
+                self.queue_monitor = self._create_blocking_consumer(
+                    QUEUE_IN, self.blocking_config.get('worker_id') or None
+                )
+            elif self.monitor_mode == 'batched':
+                # 批量模式：累积到指定数量或超时才清洗（可按到达速率、吞吐量与 Processor 滞后自适应）
+                lag_probe = processor_publish_probe(
+                    self.redis_manager.get_client(self.adaptive_config.get('processor_db', 2)),
+                    self.adaptive_config.get('processor_metadata_key', 'processed_data:metadata')
+                )
                 self.queue_monitor = BatchedQueueMonitor(
                     redis_host=REDIS_HOST,
                     redis_port=REDIS_PORT,
@@ -469,7 +658,8 @@ class EventDrivenCleaner:
                     on_queue_update=self._on_queue_update,
                     batch_size=self.batch_size,
                     max_wait_sec=self.max_wait_sec,
-                    check_interval_sec=self.check_interval
+                    check_interval_sec=self.check_interval,
+                    controller=AdaptiveBatchController.from_config(self.adaptive_config, lag_probe)
                 )
             else:
                 # 实时模式：有任何变化都立即清洗
@@ -495,12 +685,56 @@ class EventDrivenCleaner:
         finally:
             self._cleanup()
     
-    def _on_queue_update(self, new_items: int):
+    def _create_blocking_consumer(self, queue_name: str, worker_id: Optional[str]) -> BlockingQueueConsumer:
+        """
+        创建清洗用的阻塞消费器
+        
+        Args:
+            queue_name: 消费的队列（data_queue 或分区列表）
+            worker_id: 处理列表标识
+        """
+        return BlockingQueueConsumer(
+            redis_host=REDIS_HOST,
+            redis_port=REDIS_PORT,
+            queue_name=queue_name,
+            db=DB_IN,
+            on_items=self._on_items_consumed,
+            worker_id=worker_id,
+            processing_prefix=self.blocking_config.get('processing_prefix', 'processing'),
+            max_batch=self.blocking_config.get('max_batch', 200),
+            block_timeout_sec=self.blocking_config.get('block_timeout_sec', 1.0),
+            archive_key=self.blocking_config.get('archive_key') or None,
+            archive_max=self.blocking_config.get('archive_max', 10000)
+        )
+    
+    def _start_partition_router(self):
+        """在后台线程中把 data_queue 的数据按去重 ID 分发到各分区列表"""
+        import threading
+        
+        router = PartitionRouter(self.redis_manager.get_client(DB_IN), QUEUE_IN, self.worker_count)
+        self.router_consumer = BlockingQueueConsumer(
+            redis_host=REDIS_HOST,
+            redis_port=REDIS_PORT,
+            queue_name=QUEUE_IN,
+            db=DB_IN,
+            on_items=router.route,
+            worker_id=f"router-{self.worker_index}",
+            processing_prefix=self.blocking_config.get('processing_prefix', 'processing'),
+            max_batch=self.blocking_config.get('max_batch', 200),
+            block_timeout_sec=self.blocking_config.get('block_timeout_sec', 1.0)
+        )
+        threading.Thread(target=self.router_consumer.run, name="partition-router", daemon=True).start()
+        logger.info(f"🔀 分区分发器已启动: {QUEUE_IN} → {self.worker_count} 个分区")
+    
+    def _on_queue_update(self, new_items: int) -> int:
         """
         队列更新回调 - 执行清洗
         
         Args:
             new_items: 新增的数据条数
+            
+        Returns:
+            写入输出队列的条数（出错时为 0）
         """
         logger.info(f"\n📨 队列更新回调: 新增 {new_items} 条数据")
         
@@ -518,16 +752,9 @@ class EventDrivenCleaner:
             
             # 清理超过 24 小时的旧数据
             logger.info("\n🧹 清理超过 24 小时的旧数据...")
-            import redis
-            r_out = redis.Redis(
-                host=REDIS_HOST,
-                port=REDIS_PORT,
-                db=DB_OUT,
-                decode_responses=True
-            )
+            r_out = self.redis_manager.get_client(DB_OUT)
             clean_result = self._clean_old_data(r_out, QUEUE_OUT, hours=24)
-            queue_length = r_out.llen(QUEUE_OUT)
-            r_out.close()
+            queue_length = self._output_length(r_out)
             
             # 发送完成通知（如果启用）
             if self.send_enabled and self.notification_handler:
@@ -541,11 +768,41 @@ class EventDrivenCleaner:
             logger.info("=" * 70)
             logger.info(f"✨ 本次清洗完成: {cleaned_count} 条数据")
             logger.info("=" * 70 + "\n")
+            return cleaned_count
             
         except Exception as e:
             logger.error(f"清洗回调出错: {e}")
             import traceback
             traceback.print_exc()
+            return 0
+    
+    def _on_items_consumed(self, items: List[str]):
+        """
+        阻塞消费回调 - 清洗取出的数据（异常向上抛出，数据保留在处理列表中稍后重试）
+        
+        Args:
+            items: 原始 JSON 字符串列表
+        """
+        worker = self._get_worker()
+        stats = worker.clean_items(items)
+        
+        if stats['cleaned'] > 0:
+            worker.export_to_file(OUTPUT_DIR, self.export_max_bytes, self.export_prefix)
+        self._maybe_consolidate_exports()
+        
+        # 每批只有几条数据，过期清理按时间间隔执行（分区模式下只由 worker 0 执行）
+        r_out = self.redis_manager.get_client(DB_OUT)
+        now = time.time()
+        if self.worker_index == 0 and now - self.last_retention >= self.retention_interval:
+            self.last_retention = now
+            self._clean_old_data(r_out, QUEUE_OUT, hours=24)
+        
+        if stats['cleaned'] > 0 and self.send_enabled and self.notification_handler:
+            self.notification_handler.send_completion_notification(
+                stats['cleaned'],
+                self._output_length(r_out),
+                {'new_items': len(items)}
+            )
     
     def run_event_driven(self):
         """事件驱动模式：等待通知（兼容旧模式）"""
@@ -633,6 +890,10 @@ class EventDrivenCleaner:
         # 清理 Redis 连接
         self.redis_manager.cleanup(self.listen_channel)
         
+        # 关闭多进程清洗池
+        if self.cleaning_pool:
+            self.cleaning_pool.shutdown()
+        
         # 恢复信号处理器
         self.signal_handler.restore()
         
@@ -641,8 +902,11 @@ class EventDrivenCleaner:
     
     def run(self):
         """根据配置运行"""
+        # 分区模式只支持阻塞消费
+        if self.partitioned:
+            self.run_queue_driven()
         # 优先使用基于队列监控的新方式
-        if self.monitor_enabled and self.mode == 'queue_driven':
+        elif self.monitor_enabled and self.mode == 'queue_driven':
             self.run_queue_driven()
         # 兼容旧的基于通知的方式
         elif self.listen_enabled and self.mode == 'event_driven':
@@ -663,9 +927,21 @@ def main():
         default=None,
         help='运行模式 (默认使用配置文件中的设置)'
     )
+    parser.add_argument(
+        '--worker-index',
+        type=int,
+        default=0,
+        help='本 worker 的序号（多 worker 分区模式，从 0 开始）'
+    )
+    parser.add_argument(
+        '--worker-count',
+        type=int,
+        default=None,
+        help='worker 总数（大于 1 时启用分区模式，默认使用配置文件中的设置）'
+    )
     args = parser.parse_args()
     
-    cleaner = EventDrivenCleaner()
+    cleaner = EventDrivenCleaner(worker_index=args.worker_index, worker_count=args.worker_count)
     
     # 命令行参数覆盖配置
     if args.mode:
@@ -0,0 +1,230 @@
+"""
+清洗器运行指标
+- 分阶段耗时：read / parse / validate / id / dedup / clean / near_dup / write / watchlist（并行清洗时 parse+validate+id+clean 合并为 identify）
+- 按来源的接收数与按来源 + 原因的丢弃数（Redis 哈希 stats:accepted / stats:discarded）
+- 滚动速率：每秒一个计数哈希 {rate_prefix}:<epoch 秒>，快照时汇总最近 rate_window_sec 秒
+
+指标在进程内累加，每批结束时用一条 pipeline 写入 Redis，不为每条数据单独发命令。
+"""
+import logging
+import re
+import time
+from collections import Counter
+from typing import Any, Dict, Optional
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+STAGES = ('read', 'parse', 'validate', 'id', 'identify', 'dedup', 'clean', 'near_dup', 'write', 'watchlist')
+
+_SOURCE_RE = re.compile(r'"source"\s*:\s*"([^"]*)"')
+
+
+def source_of(payload: Any) -> str:
+    """
+    数据的来源（payload 为字典或原始 JSON 字符串，后者用正则提取，避免再次解析）
+
+    Returns:
+        来源，未知时为 "unknown"
+    """
+    if isinstance(payload, dict):
+        return str(payload.get('source') or 'unknown')
+    if isinstance(payload, str):
+        match = _SOURCE_RE.search(payload)
+        if match and match.group(1):
+            return match.group(1)
+    return 'unknown'
+
+
+class CleanerMetrics:
+    """清洗器指标（进程内累加，按批写入 Redis）"""
+
+    def __init__(
+        self,
+        client: Optional[redis.Redis],
+        accepted_key: str = "stats:accepted",
+        discarded_key: str = "stats:discarded",
+        stages_key: str = "stats:stages",
+        rate_prefix: str = "stats:rate",
+        rate_window_sec: int = 10
+    ):
+        """
+        初始化指标
+
+        Args:
+            client: 写入指标的 Redis 客户端（db_out），为 None 时只在进程内统计
+            accepted_key: 按来源的接收数哈希
+            discarded_key: 按 "来源:原因" 的丢弃数哈希
+            stages_key: 分阶段累计耗时哈希（字段 "<阶段>:sec" 与 "<阶段>:items"）
+            rate_prefix: 每秒计数哈希的键前缀
+            rate_window_sec: 滚动速率窗口（秒）
+        """
+        self.client = client
+        self.accepted_key = accepted_key
+        self.discarded_key = discarded_key
+        self.stages_key = stages_key
+        self.rate_prefix = rate_prefix
+        self.rate_window_sec = max(1, int(rate_window_sec))
+
+        # 未写入 Redis 的增量
+        self.accepted: Counter = Counter()
+        self.discarded: Counter = Counter()
+        self.stage_seconds: Dict[str, float] = {}
+        self.stage_items: Counter = Counter()
+
+        # 进程内累计（日志用）
+        self.total_seconds: Dict[str, float] = {}
+
+    @classmethod
+    def from_config(cls, client: redis.Redis, stats_config: Optional[Dict[str, Any]],
+                    monitor_config: Optional[Dict[str, Any]] = None) -> Optional['CleanerMetrics']:
+        """
+        根据 stats / monitor 配置创建实例
+
+        Returns:
+            CleanerMetrics，未启用时返回 None
+        """
+        if not stats_config or not stats_config.get('enabled', False):
+            return None
+
+        monitor_config = monitor_config or {}
+        return cls(
+            client,
+            accepted_key=stats_config.get('accepted_key', 'stats:accepted'),
+            discarded_key=stats_config.get('discarded_key', 'stats:discarded'),
+            stages_key=stats_config.get('stages_key', 'stats:stages'),
+            rate_prefix=stats_config.get('rate_prefix', 'stats:rate'),
+            rate_window_sec=monitor_config.get('rate_window_sec', 10)
+        )
+
+    def add_stage(self, stage: str, seconds: float, items: int = 0):
+        """累加一个阶段的耗时"""
+        self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+        self.stage_items[stage] += items
+        self.total_seconds[stage] = self.total_seconds.get(stage, 0.0) + seconds
+
+    def accept(self, source: str, count: int = 1):
+        """记录写入的数据"""
+        self.accepted[source] += count
+
+    def discard(self, source: str, reason: str, count: int = 1):
+        """记录丢弃的数据（reason: json / invalid / duplicate / near_duplicate / clean_error）"""
+        self.discarded[f"{source}:{reason}"] += count
+
+    def flush(self, now: Optional[float] = None):
+        """把本批增量写入 Redis（一条 pipeline），写入失败只记录警告"""
+        if self.client is None or not (self.accepted or self.discarded or self.stage_seconds):
+            self._reset_pending()
+            return
+
+        now = now if now is not None else time.time()
+        rate_key = f"{self.rate_prefix}:{int(now)}"
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for source, count in self.accepted.items():
+                pipe.hincrby(self.accepted_key, source, count)
+            for field, count in self.discarded.items():
+                pipe.hincrby(self.discarded_key, field, count)
+            for stage, seconds in self.stage_seconds.items():
+                pipe.hincrbyfloat(self.stages_key, f"{stage}:sec", round(seconds, 6))
+                if self.stage_items[stage]:
+                    pipe.hincrby(self.stages_key, f"{stage}:items", self.stage_items[stage])
+
+            accepted = sum(self.accepted.values())
+            discarded = sum(self.discarded.values())
+            if accepted:
+                pipe.hincrby(rate_key, 'accepted', accepted)
+            if discarded:
+                pipe.hincrby(rate_key, 'discarded', discarded)
+            pipe.expire(rate_key, self.rate_window_sec * 2)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"写入清洗指标失败: {e}")
+        self._reset_pending()
+
+    def _reset_pending(self):
+        self.accepted.clear()
+        self.discarded.clear()
+        self.stage_seconds.clear()
+        self.stage_items.clear()
+
+    def reset(self):
+        """清除 Redis 中的累计指标"""
+        if self.client is None:
+            return
+        keys = [self.accepted_key, self.discarded_key, self.stages_key]
+        keys.extend(self.client.scan_iter(match=f"{self.rate_prefix}:*", count=500))
+        self.client.delete(*keys)
+        self.total_seconds.clear()
+
+    def stage_summary(self) -> str:
+        """进程内累计的分阶段耗时（一行，供日志使用）"""
+        return ", ".join(f"{stage} {self.total_seconds[stage]:.2f}s"
+                         for stage in STAGES if stage in self.total_seconds)
+
+    def snapshot(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        读取 Redis 中的指标快照
+
+        Returns:
+            {'accepted': {...}, 'discarded': {...}, 'stages': {...}, 'rate': {...}}
+        """
+        now = now if now is not None else time.time()
+        current = int(now)
+        # 当前这一秒尚未结束，窗口取之前的完整秒
+        rate_keys = [f"{self.rate_prefix}:{second}" for second in range(current - self.rate_window_sec, current)]
+
+        pipe = self.client.pipeline(transaction=False)
+        pipe.hgetall(self.accepted_key)
+        pipe.hgetall(self.discarded_key)
+        pipe.hgetall(self.stages_key)
+        for key in rate_keys:
+            pipe.hgetall(key)
+        accepted, discarded, stages, *rates = pipe.execute()
+
+        stage_view = {}
+        for stage in STAGES:
+            seconds = float(stages.get(f"{stage}:sec", 0))
+            if not seconds:
+                continue
+            items = int(stages.get(f"{stage}:items", 0))
+            stage_view[stage] = {
+                'seconds': round(seconds, 3),
+                'items': items,
+                'us_per_item': round(seconds / items * 1e6, 1) if items else None
+            }
+
+        window_accepted = sum(int(rate.get('accepted', 0)) for rate in rates)
+        window_discarded = sum(int(rate.get('discarded', 0)) for rate in rates)
+        return {
+            'accepted': {source: int(count) for source, count in accepted.items()},
+            'discarded': {field: int(count) for field, count in discarded.items()},
+            'stages': stage_view,
+            'rate': {
+                'window_sec': self.rate_window_sec,
+                'accepted_per_sec': round(window_accepted / self.rate_window_sec, 2),
+                'discarded_per_sec': round(window_discarded / self.rate_window_sec, 2)
+            }
+        }
+
+
+def format_snapshot(snapshot: Dict[str, Any]) -> str:
+    """紧凑的多行快照文本"""
+    rate = snapshot['rate']
+    lines = [
+        f"rate({rate['window_sec']}s): accepted {rate['accepted_per_sec']}/s, "
+        f"discarded {rate['discarded_per_sec']}/s"
+    ]
+    if snapshot['accepted']:
+        lines.append("accepted: " + ", ".join(
+            f"{source}={count}" for source, count in sorted(snapshot['accepted'].items())))
+    if snapshot['discarded']:
+        lines.append("discarded: " + ", ".join(
+            f"{field}={count}" for field, count in sorted(snapshot['discarded'].items())))
+    if snapshot['stages']:
+        lines.append("stages: " + ", ".join(
+            f"{stage} {view['seconds']}s"
+            + (f" ({view['us_per_item']}us/item)" if view['us_per_item'] is not None else "")
+            for stage, view in snapshot['stages'].items()))
+    return "\n".join(lines)
@@ -0,0 +1,98 @@
+"""
+多进程清洗池
+积压数据较多时，把解析 / 验证 / ID 生成 / 清洗分片交给子进程并行执行
+（每条数据在一个任务内完成，只解析一次），去重与写入仍由主进程按原始顺序完成
+"""
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, Any, List, Optional, Tuple
+
+from .record_cleaner import prepare_records, TextTokenizer
+
+logger = logging.getLogger(__name__)
+
+
+class CleaningPool:
+    """清洗子进程池（跨清洗轮次复用，避免反复启动子进程）"""
+
+    def __init__(self, workers: int, parallel_threshold: int = 2000, chunk_size: int = 500):
+        """
+        初始化清洗池
+
+        Args:
+            workers: 子进程数量
+            parallel_threshold: 单轮待处理数据量达到该值才启用多进程
+            chunk_size: 每个任务分片的数据量
+        """
+        self.workers = workers
+        self.parallel_threshold = parallel_threshold
+        self.chunk_size = max(1, chunk_size)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @classmethod
+    def from_config(cls, processing_config: Dict[str, Any]) -> Optional['CleaningPool']:
+        """
+        根据 processing 配置创建实例
+
+        Returns:
+            CleaningPool，workers 不大于 1 时返回 None（单进程清洗）
+        """
+        processing_config = processing_config or {}
+        workers = processing_config.get('workers', 1)
+        if workers == 0:
+            workers = os.cpu_count() or 1
+        if workers <= 1:
+            return None
+
+        return cls(
+            workers=workers,
+            parallel_threshold=processing_config.get('parallel_threshold', 2000),
+            chunk_size=processing_config.get('chunk_size', 500)
+        )
+
+    @property
+    def window_size(self) -> int:
+        """主进程每次从 Redis 读取并分发的数据量"""
+        return self.workers * self.chunk_size * 2
+
+    def should_parallelize(self, pending: int) -> bool:
+        """待处理数据量是否值得启用多进程"""
+        return pending >= self.parallel_threshold
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            logger.info(f"⚙️  多进程清洗池已启动: {self.workers} 个子进程")
+        return self._executor
+
+    def _map_chunks(self, func, items: List[Any]) -> List[Any]:
+        """按分片并行执行 func，结果保持输入顺序"""
+        chunks = [items[i:i + self.chunk_size] for i in range(0, len(items), self.chunk_size)]
+        results: List[Any] = []
+        for chunk_result in self._get_executor().map(func, chunks):
+            results.extend(chunk_result)
+        return results
+
+    def prepare(self, raw_items: List[str],
+                tokenizer: Optional[TextTokenizer] = None) -> List[Tuple[Optional[str], Optional[Dict[str, Any]]]]:
+        """
+        并行解析、验证、生成 ID 并清洗（每条数据只解析一次、只跨进程传输一次）
+
+        Args:
+            raw_items: 原始 JSON 字符串列表
+            tokenizer: 分词器（可选，随任务传给子进程）
+
+        Returns:
+            与输入一一对应的 (ID, 清洗结果)：无效数据 ID 为 None，清洗出错时清洗结果为 None
+        """
+        if tokenizer is not None:
+            return self._map_chunks(partial(prepare_records, tokenizer=tokenizer), raw_items)
+        return self._map_chunks(prepare_records, raw_items)
+
+    def shutdown(self):
+        """关闭子进程"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
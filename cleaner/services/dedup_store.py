@@ -0,0 +1,578 @@
+"""
+去重 ID 存储
+封装 Redis 中已清洗 ID 的存储结构，按 deduplication.mode 选择实现：
+- permanent: 单个 SET，永久保留；或 Redis 位图上的可扩展布隆过滤器（permanent_backend: bloom）
+- time_window: 按小时分桶的 SET，每个桶通过 EXPIREAT 自动过期
+"""
+import logging
+import math
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+import redis
+
+from .local_dedup_cache import bloom_positions
+
+logger = logging.getLogger(__name__)
+
+
+class SetIdStore:
+    """永久模式：所有 ID 保存在一个 SET 中"""
+
+    mode = 'permanent'
+    enumerable = True
+
+    def __init__(self, client: redis.Redis, cache_key: str):
+        """
+        初始化 SET 存储
+
+        Args:
+            client: Redis 客户端（db_out）
+            cache_key: ID 缓存键
+        """
+        self.client = client
+        self.cache_key = cache_key
+        self._migrated = False
+
+    def _ensure_migrated(self):
+        """旧版本在键不存在时会创建 ZSET，这里一次性转换为 SET"""
+        if self._migrated:
+            return
+        self._migrated = True
+
+        if self.client.type(self.cache_key) != 'zset':
+            return
+
+        legacy_key = f"{self.cache_key}:legacy_zset"
+        self.client.rename(self.cache_key, legacy_key)
+        migrated = 0
+        batch = []
+        for member, _ in self.client.zscan_iter(legacy_key, count=1000):
+            batch.append(member)
+            if len(batch) >= 1000:
+                self.client.sadd(self.cache_key, *batch)
+                migrated += len(batch)
+                batch = []
+        if batch:
+            self.client.sadd(self.cache_key, *batch)
+            migrated += len(batch)
+        self.client.delete(legacy_key)
+        logger.info(f"🔁 已将旧 ZSET ID 缓存转换为 SET: {migrated} 个 ID")
+
+    def contains_many(self, item_ids: List[str]) -> List[bool]:
+        """
+        批量检查 ID 是否已存在
+
+        Args:
+            item_ids: ID 列表
+
+        Returns:
+            与输入一一对应的布尔列表
+        """
+        if not item_ids:
+            return []
+        self._ensure_migrated()
+        return [bool(flag) for flag in self.client.smismember(self.cache_key, item_ids)]
+
+    def add_many(self, item_ids: List[str], pipe: Optional[redis.client.Pipeline] = None):
+        """
+        批量写入 ID
+
+        Args:
+            item_ids: ID 列表
+            pipe: 可选的 pipeline（传入时只入队，由调用方 execute）
+        """
+        if not item_ids:
+            return
+        self._ensure_migrated()
+        target = pipe if pipe is not None else self.client
+        target.sadd(self.cache_key, *item_ids)
+
+    def entry_expiry(self, existing: bool = False) -> Optional[float]:
+        """ID 在 Redis 中的过期时间（永久模式不过期）"""
+        return None
+
+    def scan_ids(self) -> Tuple[int, Iterator[str]]:
+        """
+        遍历全部 ID（用于重建本地布隆过滤器）
+
+        Returns:
+            (ID 数量, ID 迭代器)
+        """
+        self._ensure_migrated()
+        count = self.client.scard(self.cache_key)
+        return count, self.client.sscan_iter(self.cache_key, count=1000)
+
+    def clear(self) -> int:
+        """清空 ID 缓存，返回删除的键数量"""
+        return self.client.delete(self.cache_key)
+
+    def get_status(self) -> Dict[str, Any]:
+        """获取缓存状态"""
+        key_type = self.client.type(self.cache_key)
+        status = {
+            'type': key_type,
+            'mode': self.mode if key_type != 'none' else 'empty',
+            'count': 0,
+            'valid_count': 0,
+            'expired_count': 0
+        }
+        if key_type == 'set':
+            status['count'] = status['valid_count'] = self.client.scard(self.cache_key)
+        elif key_type == 'zset':
+            status['count'] = self.client.zcard(self.cache_key)
+        return status
+
+
+class HourBucketIdStore:
+    """
+    时间窗口模式：ID 按写入时间落入整点小时桶
+
+    桶键为 {cache_key}:YYYYMMDDHH（UTC），写入时设置 EXPIREAT，过期由 Redis 负责；
+    查询时检查当前小时及之前 window_hours 个小时的桶，因此实际窗口为
+    window_hours ~ window_hours + 1 小时。
+    """
+
+    mode = 'time_window'
+    enumerable = True
+
+    def __init__(self, client: redis.Redis, cache_key: str, window_hours: int = 24):
+        """
+        初始化小时分桶存储
+
+        Args:
+            client: Redis 客户端（db_out）
+            cache_key: ID 缓存键（作为桶键前缀）
+            window_hours: 去重窗口（小时）
+        """
+        self.client = client
+        self.cache_key = cache_key
+        self.window_hours = max(1, int(window_hours))
+        self._migrated = False
+
+    @staticmethod
+    def _hour_start(ts: float) -> int:
+        return int(ts // 3600 * 3600)
+
+    def _bucket_key(self, hour_start: int) -> str:
+        hour = datetime.fromtimestamp(hour_start, tz=timezone.utc)
+        return f"{self.cache_key}:{hour.strftime('%Y%m%d%H')}"
+
+    def _bucket_expire_at(self, hour_start: int) -> int:
+        return hour_start + (self.window_hours + 1) * 3600
+
+    def _active_buckets(self, now: Optional[float] = None) -> List[str]:
+        """当前有效的桶键（从新到旧）"""
+        current = self._hour_start(now if now is not None else time.time())
+        return [self._bucket_key(current - i * 3600) for i in range(self.window_hours + 1)]
+
+    def _ensure_migrated(self):
+        """把旧版本单个 ZSET 中仍在窗口内的 ID 迁移到小时桶"""
+        if self._migrated:
+            return
+        self._migrated = True
+
+        if self.client.type(self.cache_key) != 'zset':
+            return
+
+        now = time.time()
+        min_score = self._hour_start(now) - self.window_hours * 3600
+        pipe = self.client.pipeline(transaction=False)
+        buckets = set()
+        migrated = 0
+        for member, score in self.client.zscan_iter(self.cache_key, count=1000):
+            if score < min_score:
+                continue
+            hour_start = self._hour_start(score)
+            bucket = self._bucket_key(hour_start)
+            pipe.sadd(bucket, member)
+            if bucket not in buckets:
+                buckets.add(bucket)
+                pipe.expireat(bucket, self._bucket_expire_at(hour_start))
+            migrated += 1
+        pipe.delete(self.cache_key)
+        pipe.execute()
+        logger.info(f"🔁 已将旧 ZSET ID 缓存迁移到 {len(buckets)} 个小时桶: {migrated} 个 ID")
+
+    def contains_many(self, item_ids: List[str]) -> List[bool]:
+        """
+        批量检查 ID 是否在窗口内出现过（每个桶一条 SMISMEMBER）
+
+        Args:
+            item_ids: ID 列表
+
+        Returns:
+            与输入一一对应的布尔列表
+        """
+        if not item_ids:
+            return []
+        self._ensure_migrated()
+
+        pipe = self.client.pipeline(transaction=False)
+        for bucket in self._active_buckets():
+            pipe.smismember(bucket, item_ids)
+
+        found = [False] * len(item_ids)
+        for flags in pipe.execute():
+            for i, flag in enumerate(flags):
+                if flag:
+                    found[i] = True
+        return found
+
+    def add_many(self, item_ids: List[str], pipe: Optional[redis.client.Pipeline] = None):
+        """
+        批量写入当前小时桶
+
+        Args:
+            item_ids: ID 列表
+            pipe: 可选的 pipeline（传入时只入队，由调用方 execute）
+        """
+        if not item_ids:
+            return
+        self._ensure_migrated()
+
+        hour_start = self._hour_start(time.time())
+        bucket = self._bucket_key(hour_start)
+        target = pipe if pipe is not None else self.client.pipeline(transaction=False)
+        target.sadd(bucket, *item_ids)
+        target.expireat(bucket, self._bucket_expire_at(hour_start))
+        if pipe is None:
+            target.execute()
+
+    def entry_expiry(self, existing: bool = False) -> Optional[float]:
+        """
+        ID 最晚在何时退出窗口（供本地缓存设置过期时间）
+
+        Args:
+            existing: 是否为 Redis 中已存在的 ID（无法确定所在桶，按最旧的桶保守估计）
+        """
+        current = self._hour_start(time.time())
+        if existing:
+            return current + 3600
+        return self._bucket_expire_at(current)
+
+    def scan_ids(self) -> Tuple[int, Iterator[str]]:
+        """
+        遍历窗口内全部 ID（用于重建本地布隆过滤器）
+
+        Returns:
+            (ID 数量上限, ID 迭代器)
+        """
+        self._ensure_migrated()
+        buckets = self._active_buckets()
+        pipe = self.client.pipeline(transaction=False)
+        for bucket in buckets:
+            pipe.scard(bucket)
+        count = sum(pipe.execute())
+
+        def _iter():
+            for bucket in buckets:
+                yield from self.client.sscan_iter(bucket, count=1000)
+
+        return count, _iter()
+
+    def clear(self) -> int:
+        """清空所有小时桶（以及旧版本的 ZSET），返回删除的键数量"""
+        keys = list(self.client.scan_iter(match=f"{self.cache_key}:" + "[0-9]" * 10, count=1000))
+        keys.append(self.cache_key)
+        return self.client.delete(*keys)
+
+    def get_status(self) -> Dict[str, Any]:
+        """获取缓存状态"""
+        buckets = self._active_buckets()
+        pipe = self.client.pipeline(transaction=False)
+        for bucket in buckets:
+            pipe.scard(bucket)
+        counts = pipe.execute()
+        active = sum(1 for c in counts if c)
+
+        total = sum(counts)
+        return {
+            'type': 'buckets' if active else 'none',
+            'mode': self.mode if active else 'empty',
+            'count': total,
+            'valid_count': total,
+            'expired_count': 0,
+            'buckets': active,
+            'window_hours': self.window_hours
+        }
+
+
+class ScalableBloomIdStore:
+    """
+    永久模式：Redis 位图上的可扩展布隆过滤器
+
+    每一层是一个独立的位图键 {cache_key}:bloom:<n>，通过 BITFIELD 批量读写；
+    当前层写满后追加容量为 growth 倍、误判率减半的新层，总误判率不超过 error_rate。
+    内存只取决于 ID 数量与误判率，与 ID 字符串长度无关。
+    层参数与计数保存在 {cache_key}:bloom:meta 哈希中；已有过滤器时以 meta 中的参数为准
+    （位图的位数与哈希函数个数由建立时的参数决定，改用配置中的新参数会查不到已有 ID）。
+    """
+
+    mode = 'permanent'
+    enumerable = False
+    TIGHTENING_RATIO = 0.5
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        cache_key: str,
+        error_rate: float = 0.001,
+        initial_capacity: int = 100000,
+        growth: int = 2,
+        drop_legacy_set: bool = False
+    ):
+        """
+        初始化可扩展布隆过滤器存储
+
+        Args:
+            client: Redis 客户端（db_out）
+            cache_key: ID 缓存键（旧 SET 的键名，同时作为布隆过滤器键前缀）
+            error_rate: 目标总误判率（误判的新数据会被当作重复丢弃）
+            initial_capacity: 第一层容量
+            growth: 每层容量增长倍数
+            drop_legacy_set: 从旧 SET 迁移完成后是否删除旧 SET
+        """
+        self.client = client
+        self.cache_key = cache_key
+        self.error_rate = error_rate
+        self.initial_capacity = max(1, int(initial_capacity))
+        self.growth = max(1, int(growth))
+        self.drop_legacy_set = drop_legacy_set
+
+        self.meta_key = f"{cache_key}:bloom:meta"
+        self.layers: List[Dict[str, int]] = []
+        self._migrated = False
+        self._mismatch_warned = False
+
+    def _layer_key(self, index: int) -> str:
+        return f"{self.cache_key}:bloom:{index}"
+
+    def _layer_params(self, index: int) -> Dict[str, int]:
+        """第 index 层的容量、位数与哈希函数个数"""
+        capacity = self.initial_capacity * (self.growth ** index)
+        layer_error = self.error_rate * (1 - self.TIGHTENING_RATIO) * (self.TIGHTENING_RATIO ** index)
+        num_bits = max(8, int(math.ceil(-capacity * math.log(layer_error) / (math.log(2) ** 2))))
+        num_hashes = max(1, int(round(num_bits / capacity * math.log(2))))
+        return {'capacity': capacity, 'bits': num_bits, 'hashes': num_hashes, 'count': 0}
+
+    def _adopt_stored_params(self, meta: Dict[str, str]):
+        """
+        使用已有过滤器建立时的参数（与配置不同时警告一次）
+
+        Args:
+            meta: {cache_key}:bloom:meta 哈希
+        """
+        if 'error_rate' not in meta:
+            return
+        stored = {
+            'error_rate': float(meta['error_rate']),
+            'initial_capacity': int(meta.get('initial_capacity', self.initial_capacity)),
+            'growth': int(meta.get('growth', self.growth)),
+        }
+        configured = {
+            'error_rate': self.error_rate,
+            'initial_capacity': self.initial_capacity,
+            'growth': self.growth,
+        }
+        if stored != configured and not self._mismatch_warned:
+            self._mismatch_warned = True
+            logger.warning(f"⚠️  布隆过滤器 {self.meta_key} 已按 {stored} 建立，与配置 {configured} 不同；"
+                           f"继续使用已有参数（如需改用新参数，请先清空过滤器后重新迁移）")
+        self.error_rate = stored['error_rate']
+        self.initial_capacity = stored['initial_capacity']
+        self.growth = stored['growth']
+
+    def _load_layers(self):
+        """从 meta 哈希加载层信息（层参数按过滤器建立时的参数计算）"""
+        meta = self.client.hgetall(self.meta_key)
+        self._adopt_stored_params(meta)
+        layer_count = int(meta.get('layers', 0))
+        layers = []
+        for index in range(layer_count):
+            params = self._layer_params(index)
+            params['count'] = int(meta.get(f"count:{index}", 0))
+            layers.append(params)
+        self.layers = layers
+
+    def _add_layer(self):
+        """追加一层（多个进程同时追加时写入的参数相同，结果一致）"""
+        index = len(self.layers)
+        self.client.hset(self.meta_key, mapping={
+            'layers': index + 1,
+            'error_rate': self.error_rate,
+            'initial_capacity': self.initial_capacity,
+            'growth': self.growth
+        })
+        self.layers.append(self._layer_params(index))
+        logger.info(f"🌸 布隆过滤器追加第 {index + 1} 层: 容量 {self.layers[-1]['capacity']}, "
+                    f"{self.layers[-1]['bits'] / 8 / 1024:.0f} KB")
+
+    def _ensure_migrated(self):
+        """布隆过滤器为空且存在旧 SET 时，把旧 SET 中的 ID 全部导入"""
+        if self._migrated:
+            return
+        self._migrated = True
+
+        self._load_layers()
+        if self.layers or self.client.type(self.cache_key) != 'set':
+            return
+
+        total = self.client.scard(self.cache_key)
+        logger.info(f"🔁 从旧 SET 迁移 {total} 个 ID 到布隆过滤器...")
+        migrated = 0
+        batch = []
+        for item_id in self.client.sscan_iter(self.cache_key, count=1000):
+            batch.append(item_id)
+            if len(batch) >= 1000:
+                self.add_many(batch)
+                migrated += len(batch)
+                batch = []
+        if batch:
+            self.add_many(batch)
+            migrated += len(batch)
+
+        if self.drop_legacy_set:
+            self.client.delete(self.cache_key)
+        logger.info(f"✓ 迁移完成: {migrated} 个 ID"
+                    f"{'，已删除旧 SET' if self.drop_legacy_set else '（旧 SET 保留，可手动删除）'}")
+
+    def contains_many(self, item_ids: List[str]) -> List[bool]:
+        """
+        批量检查 ID 是否（可能）已存在：每个 ID 每层一条 BITFIELD GET
+
+        Args:
+            item_ids: ID 列表
+
+        Returns:
+            与输入一一对应的布尔列表
+        """
+        if not item_ids:
+            return []
+        self._ensure_migrated()
+        self._load_layers()
+        if not self.layers:
+            return [False] * len(item_ids)
+
+        pipe = self.client.pipeline(transaction=False)
+        for item_id in item_ids:
+            for index, layer in enumerate(self.layers):
+                args = []
+                for pos in bloom_positions(item_id, layer['bits'], layer['hashes']):
+                    args.extend(('GET', 'u1', pos))
+                pipe.execute_command('BITFIELD', self._layer_key(index), *args)
+        replies = pipe.execute()
+
+        found = []
+        layer_count = len(self.layers)
+        for i in range(len(item_ids)):
+            layer_replies = replies[i * layer_count:(i + 1) * layer_count]
+            found.append(any(all(bits) for bits in layer_replies))
+        return found
+
+    def add_many(self, item_ids: List[str], pipe: Optional[redis.client.Pipeline] = None):
+        """
+        批量写入最新一层，写满时先追加新层
+
+        Args:
+            item_ids: ID 列表
+            pipe: 可选的 pipeline（传入时只入队，由调用方 execute）
+        """
+        if not item_ids:
+            return
+        self._ensure_migrated()
+        if not self.layers:
+            self._add_layer()
+
+        target = pipe if pipe is not None else self.client.pipeline(transaction=False)
+        remaining = list(item_ids)
+        while remaining:
+            layer = self.layers[-1]
+            room = layer['capacity'] - layer['count']
+            if room <= 0:
+                self._add_layer()
+                continue
+
+            chunk, remaining = remaining[:room], remaining[room:]
+            index = len(self.layers) - 1
+            for item_id in chunk:
+                args = []
+                for pos in bloom_positions(item_id, layer['bits'], layer['hashes']):
+                    args.extend(('SET', 'u1', pos, 1))
+                target.execute_command('BITFIELD', self._layer_key(index), *args)
+            target.hincrby(self.meta_key, f"count:{index}", len(chunk))
+            layer['count'] += len(chunk)
+
+        if pipe is None:
+            target.execute()
+
+    def entry_expiry(self, existing: bool = False) -> Optional[float]:
+        """ID 在 Redis 中的过期时间（永久模式不过期）"""
+        return None
+
+    def scan_ids(self) -> Optional[Tuple[int, Iterator[str]]]:
+        """布隆过滤器无法遍历 ID，返回 None"""
+        return None
+
+    def clear(self) -> int:
+        """删除所有层与 meta（旧 SET 不受影响），返回删除的键数量"""
+        self._load_layers()
+        keys = [self.meta_key] + [self._layer_key(i) for i in range(len(self.layers))]
+        self.layers = []
+        return self.client.delete(*keys)
+
+    def get_status(self) -> Dict[str, Any]:
+        """获取缓存状态"""
+        self._load_layers()
+        if not self.layers:
+            return {'type': 'none', 'mode': 'empty', 'count': 0, 'valid_count': 0, 'expired_count': 0}
+
+        pipe = self.client.pipeline(transaction=False)
+        for index in range(len(self.layers)):
+            pipe.strlen(self._layer_key(index))
+        memory_bytes = sum(pipe.execute())
+
+        count = sum(layer['count'] for layer in self.layers)
+        return {
+            'type': 'bloom',
+            'mode': self.mode,
+            'count': count,
+            'valid_count': count,
+            'expired_count': 0,
+            'layers': len(self.layers),
+            'error_rate': self.error_rate,
+            'memory_bytes': memory_bytes
+        }
+
+
+def create_id_store(client: redis.Redis, cache_key: str, dedup_config: Optional[Dict[str, Any]] = None):
+    """
+    根据去重配置创建 ID 存储
+
+    Args:
+        client: Redis 客户端（db_out）
+        cache_key: ID 缓存键
+        dedup_config: deduplication 配置段
+
+    Returns:
+        SetIdStore / ScalableBloomIdStore / HourBucketIdStore
+    """
+    dedup_config = dedup_config or {}
+    mode = dedup_config.get('mode', 'permanent')
+
+    if mode == 'time_window':
+        return HourBucketIdStore(client, cache_key, dedup_config.get('window_hours', 24))
+
+    if dedup_config.get('permanent_backend', 'set') == 'bloom':
+        bloom_config = dedup_config.get('bloom', {})
+        return ScalableBloomIdStore(
+            client,
+            cache_key,
+            error_rate=bloom_config.get('error_rate', 0.001),
+            initial_capacity=bloom_config.get('initial_capacity', 100000),
+            growth=bloom_config.get('growth', 2),
+            drop_legacy_set=bloom_config.get('drop_legacy_set', False)
+        )
+
+    return SetIdStore(client, cache_key)
@@ -0,0 +1,178 @@
+"""
+从 JSONL 导出恢复清洗结果
+Redis 被清空（或无持久化重启）后，用 cleaner/output 下的 cleaned*_YYYY-MM-DD[.N].jsonl
+重建输出队列与去重 ID：
+- 流式读取导出文件，按 id 去重（后写入的覆盖先写入的，与导出合并规则一致）
+- 只恢复保留窗口内的数据（created_ts ≥ 当前整点 - retention_hours，与过期清理相同）
+- 按 created_ts 从旧到新写入，LPUSH 后最新的数据在队列头部，与在线清洗的顺序一致
+- 大批量 pipeline 写入数据与去重 ID；去重存储中已有的 ID 跳过，重复执行不会写入两次
+"""
+import json
+import logging
+import re
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import redis
+
+from .dedup_store import create_id_store
+
+# 仓库根目录（共用的 utils 模块）
+_REPO_ROOT = str(Path(__file__).resolve().parent.parent.parent)
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+from utils.time_parser import parse_epoch
+from utils.hourly_queue import HourlyQueue
+
+logger = logging.getLogger(__name__)
+
+# cleaned_2025-11-02.jsonl / cleaned_2025-11-02.1.jsonl / cleaned-w1_2025-11-02.jsonl
+EXPORT_FILE_RE = re.compile(r"^cleaned(?:-w\d+)?_(\d{4}-\d{2}-\d{2})(?:\.(\d+))?\.jsonl$")
+
+
+def find_export_files(output_dir: Path, since_date: Optional[str] = None) -> List[Path]:
+    """
+    列出导出文件（按日期、文件名排序）
+
+    Args:
+        output_dir: 导出目录
+        since_date: 只返回该日期（YYYY-MM-DD）及之后的文件
+
+    Returns:
+        文件路径列表
+    """
+    output_dir = Path(output_dir)
+    if not output_dir.exists():
+        return []
+
+    files = []
+    for path in output_dir.iterdir():
+        match = EXPORT_FILE_RE.match(path.name)
+        if match and (since_date is None or match.group(1) >= since_date):
+            files.append((match.group(1), int(match.group(2) or 0), path.name, path))
+    return [path for *_, path in sorted(files)]
+
+
+def _record_epoch(record: Dict[str, Any]) -> Optional[int]:
+    """清洗结果的发布时间（优先 created_ts，旧导出只有 created_at）"""
+    created_ts = record.get('created_ts')
+    if isinstance(created_ts, (int, float)) and not isinstance(created_ts, bool):
+        return int(created_ts)
+    return parse_epoch(record.get('created_at'), record.get('source'), 'created_at')
+
+
+def load_exports(files: List[Path], cutoff: float) -> Tuple[List[Tuple[int, str, str]], Dict[str, int]]:
+    """
+    流式读取导出文件，保留窗口内的数据并按 id 去重
+
+    Args:
+        files: 导出文件
+        cutoff: 保留下界（epoch 秒）
+
+    Returns:
+        ([(created_ts, id, JSON 行), ...] 按时间从旧到新, 读取统计)
+    """
+    stats = {'files': len(files), 'lines': 0, 'invalid': 0, 'expired': 0, 'superseded': 0}
+    latest: Dict[str, Tuple[int, str]] = {}
+
+    for path in files:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                stats['lines'] += 1
+                try:
+                    record = json.loads(line)
+                    item_id = record.get('id')
+                    created_ts = _record_epoch(record)
+                except (json.JSONDecodeError, AttributeError):
+                    stats['invalid'] += 1
+                    continue
+                if not item_id or created_ts is None:
+                    stats['invalid'] += 1
+                    continue
+                if created_ts < cutoff:
+                    stats['expired'] += 1
+                    continue
+                if item_id in latest:
+                    stats['superseded'] += 1
+                latest[item_id] = (created_ts, line)
+
+    entries = sorted((created_ts, item_id, line) for item_id, (created_ts, line) in latest.items())
+    return entries, stats
+
+
+def restore_exports(
+    client: redis.Redis,
+    queue_out: str,
+    id_cache_key: str,
+    files: List[Path],
+    dedup_config: Optional[Dict[str, Any]] = None,
+    hourly: Optional[HourlyQueue] = None,
+    retention_hours: int = 24,
+    batch_size: int = 5000,
+    skip_existing: bool = True,
+    dry_run: bool = False,
+    now: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    从导出文件恢复输出队列与去重 ID
+
+    Args:
+        client: 输出库客户端（db_out）
+        queue_out: 输出队列
+        id_cache_key: ID 缓存键
+        files: 导出文件
+        dedup_config: deduplication 配置段（决定 ID 存储结构）
+        hourly: 按小时分区的输出队列（可选，传入时写入小时列表）
+        retention_hours: 保留时间（小时），与过期清理一致
+        batch_size: 每个 pipeline 的数据量
+        skip_existing: 跳过去重存储中已有的 ID（重复执行时不重复写入）
+        dry_run: 只读取文件并统计，不写入 Redis
+        now: 当前时间（epoch 秒，默认 time.time()）
+
+    Returns:
+        恢复统计
+    """
+    started = time.perf_counter()
+    now = now if now is not None else time.time()
+    current_hour = datetime.fromtimestamp(now, tz=timezone.utc).replace(minute=0, second=0, microsecond=0)
+    cutoff_time = current_hour - timedelta(hours=retention_hours)
+
+    entries, stats = load_exports(files, cutoff_time.timestamp())
+    stats.update({'cutoff_time': cutoff_time.isoformat(), 'restored': 0, 'existing': 0})
+    loaded = time.perf_counter()
+    stats['read_sec'] = round(loaded - started, 3)
+
+    if not dry_run and entries:
+        id_store = create_id_store(client, id_cache_key, dedup_config)
+        for offset in range(0, len(entries), max(1, batch_size)):
+            chunk = entries[offset:offset + batch_size]
+            if skip_existing:
+                existing = id_store.contains_many([item_id for _, item_id, _ in chunk])
+                stats['existing'] += sum(existing)
+                chunk = [entry for entry, found in zip(chunk, existing) if not found]
+            if not chunk:
+                continue
+
+            pipe = client.pipeline(transaction=False)
+            if hourly is not None:
+                hourly.push(pipe, [(created_ts, line) for created_ts, _, line in chunk])
+            else:
+                pipe.lpush(queue_out, *[line for _, _, line in chunk])
+            id_store.add_many([item_id for _, item_id, _ in chunk], pipe)
+            pipe.execute()
+            stats['restored'] += len(chunk)
+    elif dry_run:
+        stats['restored'] = len(entries)
+
+    elapsed = time.perf_counter() - started
+    stats['write_sec'] = round(elapsed - stats['read_sec'], 3)
+    stats['elapsed_sec'] = round(elapsed, 3)
+    stats['records_per_sec'] = round(stats['restored'] / elapsed, 1) if elapsed > 0 else None
+    return stats
@@ -0,0 +1,145 @@
+"""
+清洗结果导出
+每轮清洗只把本轮新数据追加到当天的 JSONL 文件，文件超过大小上限时滚动到新分段；
+定期把往日的分段合并为一个文件（按 id 去重）
+"""
+import json
+import logging
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class JsonlExporter:
+    """
+    追加写入的 JSONL 导出
+
+    文件命名：cleaned_YYYY-MM-DD.jsonl 为当天第一个分段，
+    之后的分段为 cleaned_YYYY-MM-DD.1.jsonl、cleaned_YYYY-MM-DD.2.jsonl ...
+    """
+
+    def __init__(self, output_dir: Path, max_bytes: int = DEFAULT_MAX_BYTES, prefix: str = "cleaned"):
+        """
+        初始化导出器
+
+        Args:
+            output_dir: 输出目录
+            max_bytes: 单个分段的大小上限（字节）
+            prefix: 文件名前缀
+        """
+        self.output_dir = Path(output_dir)
+        self.max_bytes = max_bytes
+        self.prefix = prefix
+        self._segment_re = re.compile(rf"^{re.escape(prefix)}_(\d{{4}}-\d{{2}}-\d{{2}})(?:\.(\d+))?\.jsonl$")
+
+    def _segment_path(self, date: str, index: int) -> Path:
+        suffix = f".{index}" if index else ""
+        return self.output_dir / f"{self.prefix}_{date}{suffix}.jsonl"
+
+    def _segments(self) -> Dict[str, List[Path]]:
+        """按日期列出所有分段（按分段序号排序）"""
+        segments: Dict[str, List[tuple]] = {}
+        if not self.output_dir.exists():
+            return {}
+        for path in self.output_dir.iterdir():
+            match = self._segment_re.match(path.name)
+            if match:
+                segments.setdefault(match.group(1), []).append((int(match.group(2) or 0), path))
+        return {date: [path for _, path in sorted(items)] for date, items in segments.items()}
+
+    def current_file(self, date: Optional[str] = None) -> Path:
+        """
+        当天应写入的分段（最后一个分段已满时滚动到下一个）
+
+        Args:
+            date: 日期字符串 YYYY-MM-DD（默认今天）
+
+        Returns:
+            分段路径
+        """
+        date = date or datetime.now().strftime("%Y-%m-%d")
+        paths = self._segments().get(date, [])
+        if not paths:
+            return self._segment_path(date, 0)
+
+        last = paths[-1]
+        if last.stat().st_size < self.max_bytes:
+            return last
+        index = int(self._segment_re.match(last.name).group(2) or 0)
+        return self._segment_path(date, index + 1)
+
+    def append(self, lines: List[str], date: Optional[str] = None) -> Optional[str]:
+        """
+        追加 JSON 行
+
+        Args:
+            lines: 已序列化的 JSON 字符串列表
+            date: 日期字符串（默认今天）
+
+        Returns:
+            写入的文件路径，没有数据时返回 None
+        """
+        if not lines:
+            return None
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        output_file = self.current_file(date)
+        with open(output_file, 'a', encoding='utf-8') as f:
+            for line in lines:
+                f.write(line + '\n')
+        return str(output_file)
+
+    def consolidate(self, today: Optional[str] = None) -> int:
+        """
+        合并往日的分段为单个文件（按 id 去重，保留最后一次写入的内容），当天的文件不动
+
+        Args:
+            today: 今天的日期字符串（默认今天）
+
+        Returns:
+            合并的日期数量
+        """
+        today = today or datetime.now().strftime("%Y-%m-%d")
+        consolidated = 0
+
+        for date, paths in sorted(self._segments().items()):
+            if date >= today or len(paths) <= 1:
+                continue
+
+            records: Dict[str, str] = {}
+            anonymous: List[str] = []
+            for path in paths:
+                with open(path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            item_id = json.loads(line).get('id')
+                        except (json.JSONDecodeError, AttributeError):
+                            continue
+                        if item_id:
+                            records[item_id] = line
+                        else:
+                            anonymous.append(line)
+
+            target = self._segment_path(date, 0)
+            tmp_file = target.with_suffix('.jsonl.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                for line in list(records.values()) + anonymous:
+                    f.write(line + '\n')
+            os.replace(tmp_file, target)
+            for path in paths:
+                if path != target:
+                    path.unlink()
+
+            consolidated += 1
+            logger.info(f"🗜️  已合并 {date} 的 {len(paths)} 个导出分段: {len(records) + len(anonymous)} 条")
+
+        return consolidated
@@ -0,0 +1,265 @@
+"""
+进程内去重缓存
+作为 Redis ID 缓存前的第一级：LRU 记录最近确认过的 ID，布隆过滤器记录已清洗 ID 全集，
+只有两者都无法确定的 ID 才需要访问 Redis
+"""
+import hashlib
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def bloom_positions(item: str, num_bits: int, num_hashes: int) -> List[int]:
+    """
+    布隆过滤器位下标（blake2b 双重哈希），本地与 Redis 布隆过滤器共用
+
+    Args:
+        item: 元素
+        num_bits: 位图大小
+        num_hashes: 哈希函数个数
+
+    Returns:
+        位下标列表
+    """
+    digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], 'little')
+    h2 = int.from_bytes(digest[8:], 'little') | 1
+    return [(h1 + i * h2) % num_bits for i in range(num_hashes)]
+
+
+class LRUIdCache:
+    """最近 ID 的 LRU 缓存（ID -> 过期时间，None 表示永不过期）"""
+
+    def __init__(self, max_size: int = 50000):
+        """
+        初始化 LRU 缓存
+
+        Args:
+            max_size: 最多保留的 ID 数量
+        """
+        self.max_size = max_size
+        self._items: "OrderedDict[str, Optional[float]]" = OrderedDict()
+
+    def get(self, item_id: str, now: float) -> bool:
+        """
+        查询 ID 是否在缓存中且未过期
+
+        Args:
+            item_id: 数据ID
+            now: 当前时间戳
+
+        Returns:
+            是否命中
+        """
+        if item_id not in self._items:
+            return False
+
+        expires_at = self._items[item_id]
+        if expires_at is not None and expires_at <= now:
+            del self._items[item_id]
+            return False
+
+        self._items.move_to_end(item_id)
+        return True
+
+    def put(self, item_id: str, expires_at: Optional[float] = None):
+        """
+        写入 ID
+
+        Args:
+            item_id: 数据ID
+            expires_at: 过期时间戳（None 表示永不过期）
+        """
+        self._items[item_id] = expires_at
+        self._items.move_to_end(item_id)
+        if len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def clear(self):
+        """清空缓存"""
+        self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class BloomFilter:
+    """布隆过滤器（bytearray 位图 + 双重哈希）"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """
+        初始化布隆过滤器
+
+        Args:
+            capacity: 预计容纳的元素数量
+            error_rate: 目标误判率
+        """
+        self.capacity = max(1, int(capacity))
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, int(round(self.num_bits / self.capacity * math.log(2))))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        """计算元素对应的位下标"""
+        return bloom_positions(item, self.num_bits, self.num_hashes)
+
+    def add(self, item: str):
+        """添加元素"""
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class LocalDedupCache:
+    """
+    两级去重的本地层
+
+    - LRU 命中：ID 已确认写入 Redis，直接判定重复
+    - 布隆过滤器未命中：ID 一定没有被清洗过，直接判定为新数据
+    - 其余情况返回 None，由调用方查询 Redis
+
+    布隆过滤器只能给出"一定不存在"的结论，因此假定本进程是 ID 缓存的唯一写入方；
+    通过 refresh_sec 定期从 Redis 重建，以纳入其他进程写入的 ID。
+    """
+
+    def __init__(
+        self,
+        lru_size: int = 50000,
+        bloom_capacity: int = 200000,
+        bloom_error_rate: float = 0.001,
+        refresh_sec: float = 300
+    ):
+        """
+        初始化本地去重缓存
+
+        Args:
+            lru_size: LRU 容量
+            bloom_capacity: 布隆过滤器初始容量
+            bloom_error_rate: 布隆过滤器误判率
+            refresh_sec: 从 Redis 重建布隆过滤器的间隔（秒）
+        """
+        self.lru = LRUIdCache(lru_size)
+        self.bloom_capacity = bloom_capacity
+        self.bloom_error_rate = bloom_error_rate
+        self.refresh_sec = refresh_sec
+
+        self.bloom: Optional[BloomFilter] = None
+        self.last_refresh = 0.0
+
+        self.stats = {
+            'lookups': 0,
+            'lru_hits': 0,
+            'bloom_negatives': 0,
+            'redis_lookups': 0,
+        }
+
+    @classmethod
+    def from_config(cls, cache_config: Dict[str, Any]) -> Optional['LocalDedupCache']:
+        """
+        根据 deduplication.local_cache 配置创建实例
+
+        Returns:
+            LocalDedupCache，未启用时返回 None
+        """
+        if not cache_config or not cache_config.get('enabled', False):
+            return None
+
+        return cls(
+            lru_size=cache_config.get('lru_size', 50000),
+            bloom_capacity=cache_config.get('bloom_capacity', 200000),
+            bloom_error_rate=cache_config.get('bloom_error_rate', 0.001),
+            refresh_sec=cache_config.get('refresh_sec', 300)
+        )
+
+    def lookup(self, item_id: str) -> Optional[bool]:
+        """
+        本地判定是否重复
+
+        Args:
+            item_id: 数据ID
+
+        Returns:
+            True=确定重复，False=确定未清洗，None=需要查询 Redis
+        """
+        self.stats['lookups'] += 1
+
+        if self.lru.get(item_id, time.time()):
+            self.stats['lru_hits'] += 1
+            return True
+
+        if self.bloom is not None and item_id not in self.bloom:
+            self.stats['bloom_negatives'] += 1
+            return False
+
+        self.stats['redis_lookups'] += 1
+        return None
+
+    def record(self, item_id: str, expires_at: Optional[float] = None):
+        """
+        记录已确认存在于 Redis 的 ID
+
+        Args:
+            item_id: 数据ID
+            expires_at: Redis 中该 ID 的过期时间戳（永久模式为 None）
+        """
+        self.lru.put(item_id, expires_at)
+        if self.bloom is not None:
+            self.bloom.add(item_id)
+
+    def needs_refresh(self) -> bool:
+        """布隆过滤器是否需要从 Redis 重建"""
+        return self.last_refresh == 0.0 or (time.time() - self.last_refresh) >= self.refresh_sec
+
+    def rebuild(self, item_ids: Iterable[str], count_hint: int = 0):
+        """
+        用 Redis 中的 ID 全集重建布隆过滤器
+
+        Args:
+            item_ids: ID 迭代器
+            count_hint: ID 数量（用于确定容量）
+        """
+        capacity = max(self.bloom_capacity, count_hint * 2)
+        bloom = BloomFilter(capacity, self.bloom_error_rate)
+        for item_id in item_ids:
+            bloom.add(item_id)
+
+        self.bloom = bloom
+        self.last_refresh = time.time()
+        logger.info(f"🌸 本地布隆过滤器已重建: {bloom.count} 个 ID "
+                    f"(容量 {capacity}, {len(bloom._bits) / 1024:.0f} KB)")
+
+    def disable_bloom(self):
+        """ID 存储无法遍历时（如 Redis 布隆过滤器）停用本地布隆过滤器，只保留 LRU"""
+        self.bloom = None
+        self.last_refresh = time.time()
+
+    def clear(self):
+        """清空本地缓存（Redis ID 缓存被清空时调用）"""
+        self.lru.clear()
+        self.bloom = None
+        self.last_refresh = 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取命中率统计（进程启动以来累计）
+
+        Returns:
+            统计字典
+        """
+        lookups = self.stats['lookups']
+        local_hits = self.stats['lru_hits'] + self.stats['bloom_negatives']
+        return {
+            **self.stats,
+            'lru_size': len(self.lru),
+            'lru_hit_rate': round(self.stats['lru_hits'] / lookups, 4) if lookups else 0.0,
+            'local_hit_rate': round(local_hits / lookups, 4) if lookups else 0.0,
+        }
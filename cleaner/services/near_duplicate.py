@@ -0,0 +1,241 @@
+"""
+近似重复检测
+同一篇报道经 RSS / NewsAPI / AlphaVantage 等不同渠道到达时 URL 与 ID 各不相同，
+精确 ID 去重无法识别。这里对文本计算 64 位 SimHash，按 4 段 × 16 位建立 LSH 索引：
+海明距离不超过 3 的两个签名至少有一段完全相同，因此只需比较同段候选。
+
+索引按小时分桶、每个段值一个 Redis 列表 {key_prefix}:YYYYMMDDHH:段号:段值，
+元素为 [签名, ID]。写入只用 RPUSH + LTRIM 追加（多个 Worker 并发写入同一段值时互不覆盖），
+并设置 EXPIREAT，只覆盖保留窗口内的数据。
+"""
+import hashlib
+import json
+import logging
+import re
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Tuple
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+SIMHASH_BITS = 64
+BANDS = 4
+BAND_BITS = SIMHASH_BITS // BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def _tokens(text: str) -> List[str]:
+    """小写分词"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def simhash64(tokens: List[str]) -> int:
+    """
+    计算 64 位 SimHash（特征为相邻两词组成的词组）
+
+    Args:
+        tokens: 分词结果
+
+    Returns:
+        64 位签名
+    """
+    features = [f"{a} {b}" for a, b in zip(tokens, tokens[1:])] or tokens
+    weights = [0] * SIMHASH_BITS
+    for feature in features:
+        h = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little')
+        for bit in range(SIMHASH_BITS):
+            if h >> bit & 1:
+                weights[bit] += 1
+            else:
+                weights[bit] -= 1
+
+    signature = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            signature |= 1 << bit
+    return signature
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """两个签名的海明距离"""
+    return bin(a ^ b).count('1')
+
+
+def band_fields(signature: int) -> List[str]:
+    """签名的 LSH 段字段名（"段号:段值"）"""
+    return [f"{band}:{(signature >> (band * BAND_BITS)) & BAND_MASK:04x}" for band in range(BANDS)]
+
+
+class NearDuplicateDetector:
+    """基于 SimHash + LSH 的近似重复检测（Redis 小时分桶索引）"""
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        key_prefix: str = "near_dup",
+        action: str = "mark",
+        max_distance: int = 3,
+        min_tokens: int = 6,
+        window_hours: int = 24,
+        text_fields: Tuple[str, ...] = ('title', 'text', 'content'),
+        bucket_size: int = 8,
+        source_overrides: Optional[Dict[str, Dict[str, Any]]] = None
+    ):
+        """
+        初始化近似重复检测器
+
+        Args:
+            client: Redis 客户端（db_out）
+            key_prefix: 索引键前缀
+            action: 默认处理方式，"mark"=保留并标注 near_duplicate_of，"drop"=丢弃
+            max_distance: 判定为近似重复的最大海明距离（不超过 3 时 LSH 不漏判）
+            min_tokens: 文本词数少于该值时不做近似去重（短评论误判率高）
+            window_hours: 索引保留窗口（小时）
+            text_fields: 参与计算签名的文本字段（取第一个非空字段；新闻标题比摘要更稳定）
+            bucket_size: 每个 LSH 段值保留的最近签名数量
+            source_overrides: 按来源覆盖 enabled / action / max_distance
+        """
+        self.client = client
+        self.key_prefix = key_prefix
+        self.action = action
+        self.max_distance = max_distance
+        self.min_tokens = min_tokens
+        self.window_hours = max(1, int(window_hours))
+        self.text_fields = tuple(text_fields)
+        self.bucket_size = bucket_size
+        self.source_overrides = source_overrides or {}
+
+    @classmethod
+    def from_config(cls, client: redis.Redis,
+                    near_dup_config: Optional[Dict[str, Any]]) -> Optional['NearDuplicateDetector']:
+        """
+        根据 near_duplicate 配置创建实例
+
+        Returns:
+            NearDuplicateDetector，未启用时返回 None
+        """
+        if not near_dup_config or not near_dup_config.get('enabled', False):
+            return None
+
+        return cls(
+            client,
+            key_prefix=near_dup_config.get('key_prefix', 'near_dup'),
+            action=near_dup_config.get('action', 'mark'),
+            max_distance=near_dup_config.get('max_distance', 3),
+            min_tokens=near_dup_config.get('min_tokens', 6),
+            window_hours=near_dup_config.get('window_hours', 24),
+            text_fields=tuple(near_dup_config.get('text_fields', ['title', 'text', 'content'])),
+            bucket_size=near_dup_config.get('bucket_size', 8),
+            source_overrides=near_dup_config.get('sources', {})
+        )
+
+    def _settings(self, source: Any) -> Optional[Tuple[str, int]]:
+        """来源对应的 (action, max_distance)，该来源未启用时返回 None"""
+        override = self.source_overrides.get(source) or {}
+        if not override.get('enabled', True):
+            return None
+        return override.get('action', self.action), override.get('max_distance', self.max_distance)
+
+    def _bucket_key(self, hour_start: int) -> str:
+        hour = datetime.fromtimestamp(hour_start, tz=timezone.utc)
+        return f"{self.key_prefix}:{hour.strftime('%Y%m%d%H')}"
+
+    def signature(self, record: Dict[str, Any]) -> Optional[int]:
+        """
+        计算清洗后记录的签名
+
+        Args:
+            record: 清洗后的数据
+
+        Returns:
+            签名，文本过短时返回 None
+        """
+        text = next((str(record[field]) for field in self.text_fields if record.get(field)), '')
+        tokens = _tokens(text)
+        if len(tokens) < self.min_tokens:
+            return None
+        return simhash64(tokens)
+
+    def check_many(self, records: List[Dict[str, Any]],
+                   pipe: Optional[redis.client.Pipeline] = None) -> List[Optional[Tuple[str, str]]]:
+        """
+        批量检测近似重复，并把非重复记录的签名写入当前小时的索引
+
+        Args:
+            records: 清洗后的数据列表（需包含 id 与 source）
+            pipe: 可选的 pipeline（传入时索引追加只入队，由调用方 execute）
+
+        Returns:
+            与输入一一对应的结果：None=非近似重复，否则为 (action, 最早出现的 ID)
+        """
+        results: List[Optional[Tuple[str, str]]] = [None] * len(records)
+
+        # 1. 计算签名
+        pending = []
+        for i, record in enumerate(records):
+            settings = self._settings(record.get('source'))
+            if settings is None:
+                continue
+            signature = self.signature(record)
+            if signature is None:
+                continue
+            pending.append((i, signature, band_fields(signature), settings))
+
+        if not pending:
+            return results
+
+        # 2. 每个小时桶、每个段值一条 LRANGE 取回候选
+        now = time.time()
+        current_hour = int(now // 3600 * 3600)
+        bucket_keys = [self._bucket_key(current_hour - h * 3600) for h in range(self.window_hours + 1)]
+        fields = sorted({field for _, _, record_fields, _ in pending for field in record_fields})
+
+        read_pipe = self.client.pipeline(transaction=False)
+        for key in bucket_keys:
+            for field in fields:
+                read_pipe.lrange(f"{key}:{field}", -self.bucket_size, -1)
+        replies = iter(read_pipe.execute())
+
+        candidates: Dict[str, List[List[Any]]] = {field: [] for field in fields}
+        for _ in bucket_keys:
+            for field in fields:
+                candidates[field].extend(json.loads(value) for value in next(replies))
+
+        # 3. 逐条比较（同批次中先出现的记录也作为候选）
+        new_entries: Dict[str, List[str]] = {}
+        for i, signature, record_fields, (action, max_distance) in pending:
+            match = None
+            for field in record_fields:
+                for sig_hex, item_id in candidates[field]:
+                    if hamming_distance(signature, int(sig_hex, 16)) <= max_distance:
+                        match = item_id
+                        break
+                if match:
+                    break
+
+            if match:
+                results[i] = (action, match)
+                continue
+
+            entry = [f"{signature:016x}", records[i]['id']]
+            for field in record_fields:
+                candidates[field].append(entry)
+                new_entries.setdefault(field, []).append(json.dumps(entry))
+
+        # 4. 追加到当前小时桶（每个段值只保留最近 bucket_size 个签名）
+        if new_entries:
+            expire_at = current_hour + (self.window_hours + 1) * 3600
+            target = pipe if pipe is not None else self.client.pipeline(transaction=False)
+            for field, values in new_entries.items():
+                list_key = f"{bucket_keys[0]}:{field}"
+                target.rpush(list_key, *values)
+                target.ltrim(list_key, -self.bucket_size, -1)
+                target.expireat(list_key, expire_at)
+            if pipe is None:
+                target.execute()
+
+        return results
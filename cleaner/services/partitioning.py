@@ -0,0 +1,77 @@
+"""
+输入分区
+多个清洗 worker 并行时，按去重 ID 的哈希把 data_queue 中的数据分发到 N 个分区列表
+{queue}:part:<i>，每个 worker 只消费自己的分区。同一 ID 的数据总是落在同一分区，
+由同一个 worker 串行处理，因此"检查 ID → 写入数据与 ID"不会在 worker 之间竞争。
+
+分发由每个 worker 内的 PartitionRouter 完成（配合 BlockingQueueConsumer 从 data_queue
+原子地取出数据，分发成功后确认），任何一个 worker 存活时数据都会继续被分发。
+"""
+import logging
+import zlib
+from typing import List
+
+import redis
+
+from .record_cleaner import identify_records
+
+logger = logging.getLogger(__name__)
+
+
+def partition_of(key: str, partition_count: int) -> int:
+    """
+    计算分区号（CRC32 取模，跨进程、跨主机稳定）
+
+    Args:
+        key: 去重 ID（无效数据用原始字符串）
+        partition_count: 分区数量
+
+    Returns:
+        分区号 [0, partition_count)
+    """
+    return zlib.crc32(key.encode('utf-8')) % partition_count
+
+
+def partition_key(queue_name: str, index: int) -> str:
+    """分区列表键名"""
+    return f"{queue_name}:part:{index}"
+
+
+class PartitionRouter:
+    """按去重 ID 把原始数据分发到分区列表"""
+
+    def __init__(self, client: redis.Redis, queue_name: str, partition_count: int):
+        """
+        初始化分发器
+
+        Args:
+            client: 输入队列所在的 Redis 客户端
+            queue_name: 输入队列名（分区列表以其为前缀）
+            partition_count: 分区数量（等于 worker 数量）
+        """
+        self.client = client
+        self.queue_name = queue_name
+        self.partition_count = max(1, int(partition_count))
+        self.routed = 0
+
+    def route(self, raw_items: List[str]):
+        """
+        分发一批原始数据（按到达顺序 LPUSH，保持各分区内的先后顺序）
+
+        无效数据按原始字符串的哈希分发，由对应 worker 计入无效统计。
+        写入失败时抛出异常，数据留在调用方的处理列表中重试。
+
+        Args:
+            raw_items: 原始 JSON 字符串列表（按到达顺序）
+        """
+        if not raw_items:
+            return
+
+        pipe = self.client.pipeline()
+        for raw, item_id in zip(raw_items, identify_records(raw_items)):
+            index = partition_of(item_id or raw, self.partition_count)
+            pipe.lpush(partition_key(self.queue_name, index), raw)
+        pipe.execute()
+
+        self.routed += len(raw_items)
+        logger.debug(f"🔀 已分发 {len(raw_items)} 条数据到 {self.partition_count} 个分区")
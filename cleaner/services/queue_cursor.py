@@ -0,0 +1,128 @@
+"""
+输入队列读取游标
+Scraper 用 LPUSH 把新数据写到 data_queue 头部，并会用 LTRIM 从尾部修剪旧数据。
+Scraper 在同一事务中递增写入计数 <data_queue>:pushed，游标记录上一轮处理完时的计数，
+两轮计数之差就是头部的新数据条数（尾部修剪与重复写入相同内容都不影响）。
+计数不存在（旧版 Scraper）时退回到头部指纹定位；仍无法定位时全量读取，由 ID 去重兜底。
+"""
+import hashlib
+import logging
+from typing import Optional, Tuple
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+
+def _fingerprint(item: Optional[str]) -> str:
+    return hashlib.md5(item.encode('utf-8')).hexdigest() if item else ''
+
+
+def pushed_counter_key(queue_name: str) -> str:
+    """Scraper 写入计数键（与 LPUSH 在同一事务中 INCRBY）"""
+    return f"{queue_name}:pushed"
+
+
+class QueueCursor:
+    """基于写入计数（退回时基于头部指纹）的队列游标（状态保存在 Redis 哈希中，进程重启后继续有效）"""
+
+    def __init__(self, r_in: redis.Redis, r_out: redis.Redis, queue_name: str,
+                 cursor_key: str, scan_chunk: int = 500, pushed_key: Optional[str] = None):
+        """
+        初始化游标
+
+        Args:
+            r_in: 输入队列所在的 Redis 客户端
+            r_out: 保存游标的 Redis 客户端（db_out）
+            queue_name: 输入队列名
+            cursor_key: 游标哈希键
+            scan_chunk: 查找头部指纹时每次读取的数量
+            pushed_key: Scraper 写入计数键（默认 <queue_name>:pushed）
+        """
+        self.r_in = r_in
+        self.r_out = r_out
+        self.queue_name = queue_name
+        self.cursor_key = cursor_key
+        self.scan_chunk = scan_chunk
+        self.pushed_key = pushed_key or pushed_counter_key(queue_name)
+
+    def snapshot(self) -> Tuple[int, Optional[str], Optional[int]]:
+        """
+        在一个事务中读取队列长度、头部数据与写入计数（三者相互一致）
+
+        Returns:
+            (队列长度, 头部数据, 写入计数)，计数不存在时为 None
+        """
+        pipe = self.r_in.pipeline(transaction=True)
+        pipe.llen(self.queue_name)
+        pipe.lindex(self.queue_name, 0)
+        pipe.get(self.pushed_key)
+        queue_length, head, pushed = pipe.execute()
+        return queue_length, head, int(pushed) if pushed is not None else None
+
+    def new_item_count(self, queue_length: int, head: Optional[str], pushed: Optional[int] = None) -> int:
+        """
+        计算队列头部有多少条未处理的新数据
+
+        Args:
+            queue_length: 当前队列长度
+            head: 当前队列头部数据（LINDEX 0）
+            pushed: 当前写入计数（snapshot 读取，None 表示 Scraper 未维护计数）
+
+        Returns:
+            新数据条数（位于下标 [0, n)），无法定位时返回 queue_length
+        """
+        state = self.r_out.hgetall(self.cursor_key)
+        if not state:
+            return queue_length
+
+        # 1. 写入计数单调递增：两轮之差即为新数据条数（超过队列长度说明新数据也被修剪了一部分）
+        if pushed is not None and state.get('pushed') not in (None, ''):
+            delta = pushed - int(state['pushed'])
+            if delta >= 0:
+                return min(delta, queue_length)
+            logger.info("ℹ️  写入计数被重置，改用头部指纹定位")
+
+        if not state.get('head'):
+            return queue_length
+        last_head = state['head']
+
+        # 2. 未发生尾部修剪时，上一轮的头部正好位于 新长度 - 旧长度
+        #    （先检查该位置：相同内容被再次写入头部时，头部指纹相同并不代表没有新数据）
+        guess = queue_length - int(state.get('length', 0))
+        if guess == 0 and _fingerprint(head) == last_head:
+            return 0
+        if 0 < guess < queue_length:
+            if _fingerprint(self.r_in.lindex(self.queue_name, guess)) == last_head:
+                return guess
+
+        # 3. 尾部被修剪过：上一轮的头部只可能位于 guess 之后（修剪只会让它更靠后），
+        #    从 guess 开始按块查找，跳过新数据中与它内容相同的副本
+        for start in range(max(guess, 0), queue_length, self.scan_chunk):
+            chunk = self.r_in.lrange(self.queue_name, start, start + self.scan_chunk - 1)
+            for offset, item in enumerate(chunk):
+                if _fingerprint(item) == last_head:
+                    return start + offset
+
+        # 4. 找不到（上一轮的数据已全部被修剪或队列被替换），全量处理
+        logger.info("ℹ️  游标位置已失效，本轮全量读取输入队列")
+        return queue_length
+
+    def save(self, queue_length: int, head: Optional[str], pushed: Optional[int] = None):
+        """
+        记录本轮处理完成时的位置
+
+        Args:
+            queue_length: 本轮开始时的队列长度
+            head: 本轮开始时的队列头部数据
+            pushed: 本轮开始时的写入计数
+        """
+        self.r_out.hset(self.cursor_key, mapping={
+            'length': queue_length,
+            'head': _fingerprint(head),
+            'pushed': '' if pushed is None else pushed
+        })
+
+    def reset(self):
+        """清除游标（下一轮全量读取）"""
+        self.r_out.delete(self.cursor_key)
@@ -1,14 +1,18 @@
 """
 数据队列监控器
 实时监控 Redis data_queue 的变化，自动触发清洗
-使用 Redis 键空间通知(Keyspace Notifications) 或轮询方式
+使用 Redis 键空间通知(Keyspace Notifications) 或轮询方式，
+或者用 BLMOVE 阻塞消费（BlockingQueueConsumer）
 """
 import logging
+import socket
 import time
 import redis
-from typing import Callable, Optional
+from typing import Callable, List, Optional
 from datetime import datetime
 
+from .adaptive_batching import AdaptiveBatchController
+
 logger = logging.getLogger(__name__)
 
 
@@ -342,7 +346,8 @@ class BatchedQueueMonitor(QueueMonitor):
         on_queue_update: Optional[Callable] = None,
         batch_size: int = 10,
         max_wait_sec: float = 5.0,
-        check_interval_sec: float = 0.5
+        check_interval_sec: float = 0.5,
+        controller: Optional[AdaptiveBatchController] = None
     ):
         """
         初始化批量队列监控器
@@ -356,10 +361,13 @@ class BatchedQueueMonitor(QueueMonitor):
             batch_size: 累积多少条数据才触发清洗
             max_wait_sec: 最长等待时间（秒），超过此时间即使未达到批量大小也触发
             check_interval_sec: 检查间隔（秒）
+            controller: 自适应批量控制器（传入时忽略固定的 batch_size / max_wait_sec）
         """
         self.batch_size = batch_size
         self.max_wait_sec = max_wait_sec
+        self.controller = controller
         self.last_trigger_time = time.time()
+        self.first_pending_time: Optional[float] = None
         
         super().__init__(
             redis_host=redis_host,
@@ -375,14 +383,59 @@ class BatchedQueueMonitor(QueueMonitor):
         self.user_callback = on_queue_update
         self.accumulated_items = 0
     
+    def _trigger_reason(self, current_time: float) -> Optional[str]:
+        """判断累计的数据是否应触发清洗，返回触发原因"""
+        if self.accumulated_items <= 0:
+            return None
+        
+        waited = current_time - (self.first_pending_time or current_time)
+        if self.controller is not None:
+            return self.controller.should_trigger(self.accumulated_items, waited)
+        
+        if self.accumulated_items >= self.batch_size:
+            return f"达到批量大小 ({self.batch_size})"
+        if waited >= self.max_wait_sec:
+            return f"超过最长等待时间 ({self.max_wait_sec}秒)"
+        return None
+    
+    def _trigger(self, reason: str):
+        """执行回调并记录耗时（供自适应控制器估计吞吐量）"""
+        logger.info(f"🔔 触发清洗 - {reason}")
+        started = time.time()
+        # 回调返回实际写入的条数时，自适应控制器只在有输出时更新最近输出时间
+        written = None
+        if self.user_callback:
+            try:
+                result = self.user_callback(self.accumulated_items)
+                if isinstance(result, int):
+                    written = result
+            except Exception as e:
+                written = 0
+                logger.error(f"执行回调出错: {e}")
+                import traceback
+                traceback.print_exc()
+        
+        finished = time.time()
+        if self.controller is not None:
+            self.controller.observe_clean(self.accumulated_items, finished - started, finished, written)
+            logger.info(f"🎛️  自适应批量: {self.controller.get_stats()}")
+        
+        self.accumulated_items = 0
+        self.first_pending_time = None
+        self.last_trigger_time = finished
+    
     def run_polling_mode(self):
         """重写轮询模式，实现批量触发逻辑"""
         logger.info("\n" + "=" * 70)
         logger.info("🔄 批量队列监控器 - 轮询模式")
         logger.info("=" * 70)
         logger.info(f"监控队列: {self.queue_name}")
-        logger.info(f"批量大小: {self.batch_size} 条")
-        logger.info(f"最长等待: {self.max_wait_sec} 秒")
+        if self.controller is not None:
+            logger.info(f"自适应批量: {self.controller.min_batch}~{self.controller.max_batch} 条, "
+                        f"目标延迟 {self.controller.target_latency_sec} 秒")
+        else:
+            logger.info(f"批量大小: {self.batch_size} 条")
+            logger.info(f"最长等待: {self.max_wait_sec} 秒")
         logger.info(f"检查间隔: {self.check_interval_sec} 秒")
         logger.info("按 Ctrl+C 停止监控")
         logger.info("=" * 70 + "\n")
@@ -391,6 +444,8 @@ class BatchedQueueMonitor(QueueMonitor):
             self.last_queue_length = self._get_queue_length()
             self.last_trigger_time = time.time()
             self.accumulated_items = 0
+            self.first_pending_time = None
+            last_check_time = time.time()
             
             logger.info(f"初始队列长度: {self.last_queue_length}\n")
             
@@ -403,40 +458,20 @@ class BatchedQueueMonitor(QueueMonitor):
                     
                     current_length = self._get_queue_length()
                     current_time = time.time()
+                    new_items = max(0, current_length - self.last_queue_length)
+                    
+                    if self.controller is not None:
+                        self.controller.observe_arrivals(new_items, current_time - last_check_time)
+                        self.controller.maybe_probe(current_time)
+                    last_check_time = current_time
                     
                     # 检查是否有新数据
-                    if current_length > self.last_queue_length:
-                        new_items = current_length - self.last_queue_length
+                    if new_items > 0:
                         self.accumulated_items += new_items
+                        if self.first_pending_time is None:
+                            self.first_pending_time = current_time
                         
                         logger.info(f"📊 新增数据: {new_items} 条 (累计: {self.accumulated_items}/批次)")
-                        
-                        # 检查是否应该触发
-                        should_trigger = False
-                        trigger_reason = ""
-                        
-                        if self.accumulated_items >= self.batch_size:
-                            should_trigger = True
-                            trigger_reason = f"达到批量大小 ({self.batch_size})"
-                            self.last_trigger_time = current_time
-                        
-                        elif (current_time - self.last_trigger_time) >= self.max_wait_sec:
-                            should_trigger = True
-                            trigger_reason = f"超过最长等待时间 ({self.max_wait_sec}秒)"
-                            self.last_trigger_time = current_time
-                        
-                        if should_trigger:
-                            logger.info(f"🔔 触发清洗 - {trigger_reason}")
-                            if self.user_callback:
-                                try:
-                                    self.user_callback(self.accumulated_items)
-                                except Exception as e:
-                                    logger.error(f"执行回调出错: {e}")
-                                    import traceback
-                                    traceback.print_exc()
-                            
-                            self.accumulated_items = 0
-                        
                         self.last_queue_length = current_length
                         consecutive_idle_rounds = 0
                     
@@ -456,6 +491,11 @@ class BatchedQueueMonitor(QueueMonitor):
                                        f"累计: {self.accumulated_items}, "
                                        f"距上次: {elapsed:.1f}秒")
                             consecutive_idle_rounds = 0
+                    
+                    # 累计的数据即使之后没有新数据到达，超过等待时间也会触发
+                    reason = self._trigger_reason(current_time)
+                    if reason:
+                        self._trigger(reason)
                 
                 except Exception as e:
                     if self.running:
@@ -467,3 +507,218 @@ class BatchedQueueMonitor(QueueMonitor):
         
         finally:
             self._cleanup()
+
+
+class BlockingQueueConsumer:
+    """
+    阻塞消费器
+    
+    用 BLMOVE（Redis < 6.2 时用 BRPOPLPUSH）把 data_queue 尾部最早的数据原子地移到
+    本 worker 的处理列表 processing:<worker_id>，再非阻塞地补齐一批交给回调清洗；
+    回调成功后删除处理列表（确认），失败或进程崩溃时数据留在处理列表中，
+    下次循环或重启时优先重新清洗（由 ID 去重保证不会重复写入）。
+    
+    与轮询监控不同，数据会从 data_queue 中取走；空闲时只有一条阻塞命令，没有轮询流量。
+    """
+    
+    # 流水线每块的 LMOVE 数量
+    DRAIN_CHUNK = 100
+    
+    def __init__(
+        self,
+        redis_host: str,
+        redis_port: int,
+        queue_name: str,
+        db: int = 0,
+        on_items: Optional[Callable[[List[str]], None]] = None,
+        worker_id: Optional[str] = None,
+        processing_prefix: str = "processing",
+        max_batch: int = 200,
+        block_timeout_sec: float = 1.0,
+        archive_key: Optional[str] = None,
+        archive_max: int = 10000
+    ):
+        """
+        初始化阻塞消费器
+        
+        Args:
+            redis_host: Redis 主机地址
+            redis_port: Redis 端口
+            queue_name: 输入队列名称
+            db: 数据库编号
+            on_items: 清洗回调，接收原始 JSON 字符串列表，抛出异常表示失败（不确认）
+            worker_id: worker 标识（需在重启后保持不变才能恢复处理列表，默认主机名）
+            processing_prefix: 处理列表键前缀
+            max_batch: 每次最多取出的数量
+            block_timeout_sec: 阻塞等待超时（秒），超时后检查是否需要停止
+            archive_key: 确认后把原始数据转存到该列表（可选，供仍需读取原始数据的程序使用）
+            archive_max: 转存列表保留的最大条数
+        """
+        self.redis_host = redis_host
+        self.redis_port = redis_port
+        self.queue_name = queue_name
+        self.db = db
+        self.on_items = on_items
+        self.worker_id = worker_id or socket.gethostname()
+        self.processing_key = f"{processing_prefix}:{self.worker_id}"
+        self.max_batch = max(1, int(max_batch))
+        self.block_timeout_sec = block_timeout_sec
+        self.archive_key = archive_key or None
+        self.archive_max = archive_max
+        
+        # 状态
+        self.running = True
+        self.use_blmove = True
+        self.batch_count = 0
+        self.item_count = 0
+        
+        # 阻塞命令独占一个连接，不使用共享连接池
+        self.client = redis.Redis(
+            host=self.redis_host,
+            port=self.redis_port,
+            db=self.db,
+            decode_responses=True
+        )
+        self.client.ping()
+        logger.info(f"✓ 阻塞消费器已连接 Redis: {self.redis_host}:{self.redis_port}/DB{self.db}")
+    
+    def _block_pop(self) -> Optional[str]:
+        """阻塞取出一条最早的数据（队列尾部）到处理列表，超时返回 None"""
+        if self.use_blmove:
+            try:
+                return self.client.blmove(self.queue_name, self.processing_key,
+                                          self.block_timeout_sec, 'RIGHT', 'LEFT')
+            except redis.ResponseError as e:
+                if 'unknown command' not in str(e).lower():
+                    raise
+                logger.info("ℹ️  Redis 不支持 BLMOVE，改用 BRPOPLPUSH")
+                self.use_blmove = False
+        return self.client.brpoplpush(self.queue_name, self.processing_key,
+                                      max(1, int(self.block_timeout_sec)))
+    
+    def _drain(self, limit: int) -> int:
+        """
+        非阻塞地再取出最多 limit 条数据到处理列表
+        
+        先用 LLEN 把命令数限制在队列现有数据量以内（低流量时不发送大量返回 nil 的 LMOVE），
+        再按块流水线执行，某块出现 nil（队列已被取空）即停止
+        
+        Returns:
+            实际取出的数量
+        """
+        moved = 0
+        remaining = min(limit, self.client.llen(self.queue_name))
+        while remaining > 0:
+            chunk = min(remaining, self.DRAIN_CHUNK)
+            pipe = self.client.pipeline(transaction=False)
+            for _ in range(chunk):
+                if self.use_blmove:
+                    pipe.lmove(self.queue_name, self.processing_key, 'RIGHT', 'LEFT')
+                else:
+                    pipe.rpoplpush(self.queue_name, self.processing_key)
+            results = pipe.execute()
+            got = sum(1 for item in results if item is not None)
+            moved += got
+            if got < chunk:
+                break
+            remaining -= chunk
+        return moved
+    
+    def _pending(self) -> List[str]:
+        """处理列表中的数据（按到达顺序，最早的在前）"""
+        return list(reversed(self.client.lrange(self.processing_key, 0, -1)))
+    
+    def _ack(self, items: List[str]):
+        """确认：删除处理列表（可选转存原始数据）"""
+        pipe = self.client.pipeline()
+        if self.archive_key:
+            pipe.lpush(self.archive_key, *items)
+            pipe.ltrim(self.archive_key, 0, self.archive_max - 1)
+        pipe.delete(self.processing_key)
+        pipe.execute()
+    
+    def _handle(self, items: List[str]) -> bool:
+        """
+        清洗一批数据，成功后确认
+        
+        Returns:
+            是否成功
+        """
+        try:
+            if self.on_items:
+                self.on_items(items)
+            self._ack(items)
+        except Exception as e:
+            logger.error(f"清洗回调出错，数据保留在 {self.processing_key} 中稍后重试: {e}")
+            import traceback
+            traceback.print_exc()
+            return False
+        
+        self.batch_count += 1
+        self.item_count += len(items)
+        return True
+    
+    def recover(self) -> bool:
+        """
+        重新清洗上次未确认的数据（进程崩溃或清洗失败后残留在处理列表中）
+        
+        Returns:
+            处理列表是否已清空
+        """
+        pending = self._pending()
+        if not pending:
+            return True
+        logger.info(f"♻️  重新清洗处理列表 {self.processing_key} 中未确认的 {len(pending)} 条数据")
+        return self._handle(pending)
+    
+    def run(self):
+        """阻塞消费主循环"""
+        logger.info("\n" + "=" * 70)
+        logger.info("⚡ 阻塞消费模式")
+        logger.info("=" * 70)
+        logger.info(f"输入队列: {self.queue_name}")
+        logger.info(f"处理列表: {self.processing_key}")
+        logger.info(f"每批最多: {self.max_batch} 条")
+        logger.info("按 Ctrl+C 停止")
+        logger.info("=" * 70 + "\n")
+        
+        try:
+            while self.running:
+                try:
+                    # 启动时或上一批失败时处理列表非空：先重试，失败则稍等（可被 stop 打断）
+                    if self.client.llen(self.processing_key) > 0 and not self.recover():
+                        for _ in range(10):
+                            if not self.running:
+                                break
+                            time.sleep(0.1)
+                        continue
+                    
+                    if self._block_pop() is None:
+                        continue
+                    
+                    self._drain(self.max_batch - 1)
+                    self._handle(self._pending())
+                
+                except redis.ConnectionError as e:
+                    logger.error(f"Redis 连接出错: {e}")
+                    time.sleep(1)
+        
+        except KeyboardInterrupt:
+            logger.info("\n⚠️  收到中断信号，停止消费...")
+        finally:
+            self._cleanup()
+    
+    def _cleanup(self):
+        """清理资源"""
+        try:
+            self.client.close()
+            logger.info("✓ Redis 连接已关闭")
+        except Exception as e:
+            logger.warning(f"关闭连接时出错: {e}")
+        
+        logger.info(f"📊 消费统计: {self.batch_count} 批, {self.item_count} 条数据")
+        logger.info("👋 阻塞消费器已停止")
+    
+    def stop(self):
+        """停止消费（最多等待一个阻塞超时）"""
+        self.running = False
@@ -0,0 +1,326 @@
+"""
+单条记录清洗逻辑
+验证、ID 生成、时间解析与字段清洗都是无状态的纯函数，
+既供 SinglePassCleaner 在进程内调用，也供多进程清洗池在子进程中调用。
+每种字段结构编译一次清洗计划，ID 只生成一次并沿用到清洗结果中
+"""
+import hashlib
+import json
+import logging
+import re
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+# 仓库根目录（Cleaner 与 Processor 共用的 utils 模块）
+_REPO_ROOT = str(Path(__file__).resolve().parent.parent.parent)
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+from utils.time_parser import parse_time
+from utils.text_tokenizer import TextTokenizer, source_text
+
+logger = logging.getLogger(__name__)
+
+
+# 预编译的文本清洗正则
+_WHITESPACE_RE = re.compile(r'\s+')
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+ID_FIELDS = ('id', 'post_id', 'tweet_id', 'guid', 'article_id')
+TIME_FIELDS = ('created_at', 'created_utc', 'published', 'published_at',
+               'timestamp', 'time', 'datetime', 'date')
+TEXT_FIELDS = ('text', 'title', 'content')
+PASSTHROUGH_FIELDS = ('source', 'url', 'author', 'score', 'comments',
+                      'sentiment', 'tags', 'subreddit', 'symbol', 'symbols')
+
+# 字段结构 -> 清洗计划（同一来源的数据字段结构基本固定，计划数量很少）
+_PLAN_CACHE: Dict[Tuple[str, ...], 'RecordPlan'] = {}
+_PLAN_CACHE_MAX = 1024
+
+
+class RecordPlan:
+    """
+    某种字段结构的清洗计划
+
+    是否评论、候选 ID 字段、时间字段、文本字段与保留字段只取决于数据中有哪些键，
+    编译一次后同结构的记录只检查这些字段的值
+    """
+
+    __slots__ = ('is_comment', 'id_fields', 'time_fields', 'text_fields', 'passthrough_fields')
+
+    def __init__(self, keys: Tuple[str, ...]):
+        key_set = set(keys)
+        # 判断是否是评论数据（有 comment_id 或 parent_id 或 post_id 但无独立 id）
+        self.is_comment = (
+            'comment_id' in key_set or
+            'parent_id' in key_set or
+            ('post_id' in key_set and 'id' not in key_set) or
+            ('message_id' in key_set and 'post_id' in key_set)
+        )
+        self.id_fields = tuple(f for f in ID_FIELDS if f in key_set)
+        self.time_fields = tuple(f for f in TIME_FIELDS if f in key_set)
+        self.text_fields = tuple(f for f in TEXT_FIELDS if f in key_set)
+        self.passthrough_fields = tuple(f for f in PASSTHROUGH_FIELDS if f in key_set)
+
+
+def get_plan(data: Dict[str, Any]) -> RecordPlan:
+    """
+    获取（必要时编译）记录的清洗计划
+
+    Args:
+        data: 数据字典
+
+    Returns:
+        RecordPlan
+    """
+    keys = tuple(data)
+    plan = _PLAN_CACHE.get(keys)
+    if plan is None:
+        if len(_PLAN_CACHE) >= _PLAN_CACHE_MAX:
+            _PLAN_CACHE.clear()
+        plan = _PLAN_CACHE[keys] = RecordPlan(keys)
+    return plan
+
+
+def validate_record(data: Dict[str, Any], plan: Optional[RecordPlan] = None) -> bool:
+    """
+    验证数据是否有效
+
+    Args:
+        data: 数据字典
+        plan: 清洗计划（不传时按字段结构获取）
+
+    Returns:
+        是否有效
+    """
+    # 检查必要字段：source 必须有，文本字段至少有一个
+    if not data.get('source'):
+        logger.debug(f"❌ 验证失败: 缺少 source 字段")
+        return False
+
+    # 文本字段：text、content、title 至少有一个且非空
+    plan = plan or get_plan(data)
+    has_text = any(
+        data[field] and str(data[field]).strip()
+        for field in plan.text_fields
+    )
+
+    if not has_text:
+        logger.debug(f"❌ 验证失败: 没有有效的文本字段 (text/content/title)")
+        return False
+
+    return True
+
+
+def compute_item_id(data: Dict[str, Any], plan: Optional[RecordPlan] = None) -> str:
+    """
+    获取数据的唯一标识（用于去重，同时作为清洗结果的 id）
+
+    Args:
+        data: 数据字典
+        plan: 清洗计划（不传时按字段结构获取）
+
+    Returns:
+        唯一标识
+    """
+    plan = plan or get_plan(data)
+
+    if plan.is_comment:
+        # 评论数据：优先使用 comment_id
+        if data.get('comment_id'):
+            return f"comment_{data['comment_id']}"
+
+        # 使用 post_id + message_id 组合
+        if data.get('post_id') and data.get('message_id'):
+            return f"comment_{data['post_id']}_{data['message_id']}"
+
+        # 使用 parent_id / post_id + author + text_hash 组合
+        parent = data.get('parent_id') or data.get('post_id')
+        if parent:
+            text_hash = hashlib.md5(str(data.get('text', '')).encode()).hexdigest()[:8]
+            author = data.get('author', 'unknown')
+            return f"comment_{parent}_{author}_{text_hash}"
+
+    # 新闻/帖子数据：优先使用各种 ID 字段
+    for id_field in plan.id_fields:
+        if data[id_field]:
+            return f"post_{data[id_field]}"
+
+    # 使用 URL
+    if data.get('url'):
+        return f"post_{hashlib.md5(data['url'].encode()).hexdigest()[:16]}"
+
+    # 使用标题和来源的组合
+    content = f"{data.get('title', '')}_{data.get('source', '')}_{data.get('text', '')[:50]}"
+    return f"post_{hashlib.md5(content.encode()).hexdigest()[:16]}"
+
+
+def parse_time_field(value, source: Optional[str] = None, field: Optional[str] = None) -> Optional[str]:
+    """
+    解析时间字段，转换为统一的 ISO 格式字符串
+
+    Args:
+        value: 时间值（可能是 Unix 时间戳、字符串等）
+        source: 数据来源（用于记忆该来源字段的时间格式）
+        field: 字段名
+
+    Returns:
+        str: ISO 格式时间字符串，如 "2024-01-01T12:00:00Z"
+    """
+    parsed = parse_time(value, source, field)
+    return parsed[1] if parsed else None
+
+
+def clean_record(data: Dict[str, Any], item_id: Optional[str] = None,
+                 plan: Optional[RecordPlan] = None,
+                 tokenizer: Optional[TextTokenizer] = None,
+                 texts: Optional[Dict[str, Optional[str]]] = None) -> Dict[str, Any]:
+    """
+    清洗数据（按清洗计划单次遍历）
+
+    Args:
+        data: 原始数据
+        item_id: 去重阶段已生成的 ID（不传时重新生成）
+        plan: 清洗计划（不传时按字段结构获取）
+        tokenizer: 分词器（传入时额外输出 clean_text / tokens / tokenizer_version）
+        texts: 已按列清洗的文本字段（列式清洗传入，不传时逐字段清洗）
+
+    Returns:
+        清洗后的数据
+    """
+    plan = plan or get_plan(data)
+
+    # 1. id 与去重 ID 保持一致
+    cleaned = {'id': item_id or compute_item_id(data, plan)}
+
+    # 2. 提取 created_at 字段（新闻/评论的发布时间），同时输出 epoch 秒 created_ts
+    parsed = None
+    source = data.get('source')
+    for field in plan.time_fields:
+        if data[field]:
+            parsed = parse_time(data[field], source, field)
+            if parsed:
+                break
+
+    now_ts = int(time.time())
+    now_utc = datetime.utcfromtimestamp(now_ts).strftime("%Y-%m-%dT%H:%M:%SZ")
+    # 如果没有找到时间字段，使用当前时间
+    created_ts, created_at = parsed or (now_ts, now_utc)
+    cleaned['created_at'] = created_at
+    cleaned['created_ts'] = created_ts
+
+    # 3. 清洗文本字段：合并空白，移除HTML标签
+    for text_field in plan.text_fields:
+        if data[text_field]:
+            if texts is not None:
+                cleaned[text_field] = texts[text_field]
+                continue
+            text = _WHITESPACE_RE.sub(' ', str(data[text_field]).strip())
+            cleaned[text_field] = _HTML_TAG_RE.sub('', text)
+
+    # 4. 保留其他重要字段
+    for key in plan.passthrough_fields:
+        cleaned[key] = data[key]
+
+    # 5. 添加处理时间戳（当前时间）
+    cleaned['timestamp'] = now_utc
+
+    # 6. 添加清洗时间戳（用于追踪）
+    cleaned['cleaned_at'] = datetime.now().isoformat()
+
+    # 7. 预先分词（Processor 在版本一致时直接使用，不再逐轮重新分词）
+    if tokenizer is not None:
+        normalized = tokenizer.clean(source_text(cleaned))
+        cleaned['clean_text'] = normalized
+        cleaned['tokens'] = tokenizer.tokenize(normalized)
+        cleaned['tokenizer_version'] = tokenizer.version
+
+    return cleaned
+
+
+def prepare_records(raw_items: List[str],
+                    tokenizer: Optional[TextTokenizer] = None) -> List[Tuple[Optional[str], Optional[Dict[str, Any]]]]:
+    """
+    解析、验证、生成 ID 并清洗（多进程清洗池的单个任务，每条数据只解析一次，
+    主进程按返回的 ID 去重后直接写入清洗结果）
+
+    Args:
+        raw_items: 原始 JSON 字符串列表
+        tokenizer: 分词器（可选）
+
+    Returns:
+        与输入一一对应的 (ID, 清洗结果)：无效数据 ID 为 None，清洗出错时清洗结果为 None
+    """
+    results = []
+    for data_str in raw_items:
+        try:
+            data = json.loads(data_str)
+            plan = get_plan(data)
+            if not validate_record(data, plan):
+                results.append((None, None))
+                continue
+            item_id = compute_item_id(data, plan)
+        except json.JSONDecodeError as e:
+            logger.warning(f"JSON 解析失败: {e}")
+            results.append((None, None))
+            continue
+        except Exception as e:
+            logger.error(f"处理数据时出错: {e}")
+            results.append((None, None))
+            continue
+        try:
+            results.append((item_id, clean_record(data, item_id, plan, tokenizer=tokenizer)))
+        except Exception as e:
+            logger.error(f"处理数据时出错: {e}")
+            results.append((item_id, None))
+    return results
+
+
+def identify_records(raw_items: List[str]) -> List[Optional[str]]:
+    """
+    解析、验证并生成 ID（多 worker 分区按 ID 分发时使用）
+
+    Args:
+        raw_items: 原始 JSON 字符串列表
+
+    Returns:
+        与输入一一对应的 ID 列表，无效数据为 None
+    """
+    item_ids = []
+    for data_str in raw_items:
+        try:
+            data = json.loads(data_str)
+            plan = get_plan(data)
+            item_ids.append(compute_item_id(data, plan) if validate_record(data, plan) else None)
+        except json.JSONDecodeError as e:
+            logger.warning(f"JSON 解析失败: {e}")
+            item_ids.append(None)
+        except Exception as e:
+            logger.error(f"处理数据时出错: {e}")
+            item_ids.append(None)
+    return item_ids
+
+
+def clean_records(items: List[Tuple[str, str]],
+                  tokenizer: Optional[TextTokenizer] = None) -> List[Optional[Dict[str, Any]]]:
+    """
+    解析并清洗（只处理去重后的新数据）
+
+    Args:
+        items: (ID, 原始 JSON 字符串) 列表
+        tokenizer: 分词器（可选）
+
+    Returns:
+        与输入一一对应的清洗结果，出错为 None
+    """
+    results = []
+    for item_id, data_str in items:
+        try:
+            results.append(clean_record(json.loads(data_str), item_id, tokenizer=tokenizer))
+        except Exception as e:
+            logger.error(f"处理数据时出错: {e}")
+            results.append(None)
+    return results
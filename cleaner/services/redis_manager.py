@@ -4,7 +4,7 @@ Redis 连接管理器
 """
 import redis
 import logging
-from typing import Optional
+from typing import Dict, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +25,30 @@ class RedisConnectionManager:
         self.subscribe_client: Optional[redis.Redis] = None
         self.publish_client: Optional[redis.Redis] = None
         self.pubsub: Optional[redis.client.PubSub] = None
+        # 每个 DB 一个共享连接池，清洗、过期清理与状态查询共用
+        self.pools: Dict[int, redis.ConnectionPool] = {}
+    
+    def get_client(self, db: int) -> redis.Redis:
+        """
+        获取使用共享连接池的客户端（同一 DB 的客户端复用连接，不需要单独关闭）
+        
+        Args:
+            db: 数据库编号
+            
+        Returns:
+            Redis 客户端
+        """
+        pool = self.pools.get(db)
+        if pool is None:
+            pool = redis.ConnectionPool(
+                host=self.host,
+                port=self.port,
+                db=db,
+                decode_responses=True
+            )
+            self.pools[db] = pool
+            logger.info(f"✓ Redis 连接池已创建: {self.host}:{self.port}/DB{db}")
+        return redis.Redis(connection_pool=pool)
     
     def connect_subscribe(self, db: int, channel: str) -> redis.client.PubSub:
         """
@@ -118,6 +142,15 @@ class RedisConnectionManager:
             except Exception as e:
                 logger.warning(f"  关闭订阅连接时出错: {e}")
         
+        # 关闭共享连接池
+        for db, pool in self.pools.items():
+            try:
+                pool.disconnect()
+                logger.info(f"✓ Redis 连接池已关闭: DB{db}")
+            except Exception as e:
+                logger.warning(f"  关闭连接池时出错: {e}")
+        self.pools.clear()
+        
         # 清理发布客户端
         if self.publish_client:
             try:
@@ -4,9 +4,24 @@
 """
 import redis
 import logging
-from typing import Dict, Any, List
+import time
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
+from .local_dedup_cache import LocalDedupCache
+from .dedup_store import create_id_store
+from .cleaning_pool import CleaningPool
+from .near_duplicate import NearDuplicateDetector
+from .export_writer import JsonlExporter, DEFAULT_MAX_BYTES
+from .queue_cursor import QueueCursor
+from .cleaner_metrics import CleanerMetrics, source_of
+from .watchlist import Watchlist
+from .columnar_cleaner import ARROW_AVAILABLE, validate_records, clean_records_columnar
+from .record_cleaner import (
+    get_plan, validate_record, compute_item_id, clean_record, parse_time_field, TextTokenizer
+)
+from utils.hourly_queue import HourlyQueue
+
 logger = logging.getLogger(__name__)
 
 
@@ -14,7 +29,19 @@ class SinglePassCleaner:
     """单次清洗处理器"""
     
     def __init__(self, redis_host: str, redis_port: int, db_in: int, db_out: int,
-                 queue_in: str, queue_out: str, id_cache_key: str):
+                 queue_in: str, queue_out: str, id_cache_key: str,
+                 local_cache: Optional[LocalDedupCache] = None,
+                 dedup_config: Optional[Dict[str, Any]] = None,
+                 pool: Optional[CleaningPool] = None,
+                 near_dup_config: Optional[Dict[str, Any]] = None,
+                 r_in: Optional[redis.Redis] = None,
+                 r_out: Optional[redis.Redis] = None,
+                 reader_config: Optional[Dict[str, Any]] = None,
+                 metrics: Optional[CleanerMetrics] = None,
+                 tokenizer: Optional[TextTokenizer] = None,
+                 hourly_output: Optional[HourlyQueue] = None,
+                 watchlist: Optional[Watchlist] = None,
+                 columnar_threshold: Optional[int] = None):
         """
         初始化单次清洗处理器
         
@@ -26,6 +53,18 @@ class SinglePassCleaner:
             queue_in: 输入队列
             queue_out: 输出队列
             id_cache_key: ID 缓存键
+            local_cache: 进程内去重缓存（可选，由调用方跨批次持有）
+            dedup_config: 去重配置（deduplication 段，决定 ID 存储结构）
+            pool: 多进程清洗池（可选，积压较多时并行解析与清洗）
+            near_dup_config: 近似重复检测配置（near_duplicate 段，未启用时不检测）
+            r_in: 输入库客户端（可选，传入时复用调用方的连接池）
+            r_out: 输出库客户端（可选，传入时复用调用方的连接池）
+            reader_config: 读取配置（reader 段，mode 为 cursor 时只读取上一轮之后的新数据）
+            metrics: 运行指标（可选，分阶段耗时与按来源的接收 / 丢弃计数）
+            tokenizer: 分词器（可选，传入时清洗结果附带 clean_text / tokens / tokenizer_version）
+            hourly_output: 按小时分区的输出队列（可选，传入时写入 {queue_out}:YYYYMMDDHH 而不是单个列表）
+            watchlist: 关注列表（可选，写入时扫描清洗结果并发出提醒）
+            columnar_threshold: 单轮待处理数据量达到该值时使用列式清洗（None 表示禁用，需要 pyarrow）
         """
         self.redis_host = redis_host
         self.redis_port = redis_port
@@ -34,21 +73,50 @@ class SinglePassCleaner:
         self.queue_in = queue_in
         self.queue_out = queue_out
         self.id_cache_key = id_cache_key
-        
-        # 连接 Redis
-        self.r_in = redis.Redis(
+        self.local_cache = local_cache
+        self.pool = pool
+        self.metrics = metrics
+        self.tokenizer = tokenizer
+        self.hourly_output = hourly_output
+        self.watchlist = watchlist
+        self.columnar_threshold = columnar_threshold
+        if columnar_threshold is not None and not ARROW_AVAILABLE:
+            logger.warning("未安装 pyarrow，列式清洗已禁用")
+            self.columnar_threshold = None
+        self.pass_output: List[str] = []
+        
+        # 连接 Redis（未传入客户端时自行创建）
+        self.r_in = r_in or redis.Redis(
             host=redis_host,
             port=redis_port,
             db=db_in,
             decode_responses=True
         )
         
-        self.r_out = redis.Redis(
+        self.r_out = r_out or redis.Redis(
             host=redis_host,
             port=redis_port,
             db=db_out,
             decode_responses=True
         )
+        
+        # 去重 ID 存储（永久 SET / 小时分桶）
+        self.id_store = create_id_store(self.r_out, id_cache_key, dedup_config)
+        
+        # 跨来源近似重复检测（SimHash + LSH）
+        self.near_dup = NearDuplicateDetector.from_config(self.r_out, near_dup_config)
+        
+        # 输入队列游标（只读取上一轮之后新增的数据）
+        reader_config = reader_config or {}
+        self.cursor: Optional[QueueCursor] = None
+        if reader_config.get('mode') == 'cursor':
+            self.cursor = QueueCursor(
+                self.r_in,
+                self.r_out,
+                queue_in,
+                reader_config.get('cursor_key', f"cursor:{queue_in}"),
+                pushed_key=reader_config.get('pushed_key')
+            )
     
     def clean_once(self, batch_size: int = 100) -> Dict[str, Any]:
         """
@@ -61,88 +129,85 @@ class SinglePassCleaner:
             清洗结果统计
         """
         import json
-        import time
         from datetime import datetime
         
         logger.info("\n🧹 开始单次清洗...")
         
-        stats = {
-            'total_processed': 0,
-            'cleaned': 0,
-            'duplicates': 0,
-            'invalid': 0,
-            'start_time': datetime.now().isoformat()
-        }
+        # 本轮写入的数据（供 export_to_file 追加导出）
+        self.pass_output = []
+        
+        stats = self._new_stats()
         
         try:
             # 获取队列当前长度（只处理这些数据，不等待新数据）
-            queue_length = self.r_in.llen(self.queue_in)
-            logger.info(f"📊 待清洗数据量: {queue_length}")
+            # 游标模式只处理上一轮之后新增的数据（位于队列头部）
+            head = pushed = None
+            if self.cursor is not None:
+                queue_length, head, pushed = self.cursor.snapshot()
+                pending = self.cursor.new_item_count(queue_length, head, pushed) if queue_length > 0 else 0
+            else:
+                queue_length = self.r_in.llen(self.queue_in)
+                pending = queue_length
+            
+            logger.info(f"📊 待清洗数据量: {pending} (队列长度 {queue_length})")
             
-            if queue_length == 0:
-                logger.info("ℹ️  队列为空，无需清洗")
+            if pending == 0:
+                logger.info("ℹ️  没有新数据，无需清洗")
                 stats['end_time'] = datetime.now().isoformat()
                 return stats
             
+            # 按需从 Redis 重建本地布隆过滤器
+            if self.local_cache is not None and self.local_cache.needs_refresh():
+                self._refresh_local_cache()
+            
+            # 积压较多且配置了清洗池时，按更大的窗口读取并交给子进程
+            parallel = self.pool is not None and self.pool.should_parallelize(pending)
+            columnar = not parallel and self._should_use_columnar(pending)
+            if parallel:
+                batch_size = max(batch_size, self.pool.window_size)
+                logger.info(f"⚙️  多进程清洗: {self.pool.workers} 个子进程, 每次读取 {batch_size} 条")
+            elif columnar:
+                batch_size = max(batch_size, self.columnar_threshold)
+                logger.info(f"⚙️  列式清洗: 每次读取 {batch_size} 条")
+            
             # 批量处理（使用 LRANGE 读取，不删除原始数据）
             processed = 0
-            while processed < queue_length:
+            while processed < pending:
                 # 计算本批次大小
-                current_batch = min(batch_size, queue_length - processed)
+                current_batch = min(batch_size, pending - processed)
                 
                 # 批量读取数据（不删除）
-                start_index = processed
-                end_index = processed + current_batch - 1
+                # 使用相对尾部的负下标：清洗期间头部新写入的数据不会造成错位
+                start_index = processed - queue_length
+                end_index = start_index + current_batch - 1
+                read_started = time.perf_counter()
                 batch_data = self.r_in.lrange(self.queue_in, start_index, end_index)
+                if self.metrics is not None:
+                    self.metrics.add_stage('read', time.perf_counter() - read_started, len(batch_data))
+                if not batch_data:
+                    # 清洗期间队列尾部被修剪
+                    break
                 
                 # 处理批次数据
-                for data_str in batch_data:
-                    try:
-                        # 解析数据
-                        data = json.loads(data_str)
-                        
-                        # 检查必要字段
-                        if not self._validate_data(data):
-                            stats['invalid'] += 1
-                            continue
-                        
-                        # 检查去重
-                        item_id = self._get_item_id(data)
-                        
-                        # 调试日志（仅在有 comment_id 或 post_id 时输出）
-                        if 'comment_id' in data or 'post_id' in data:
-                            logger.debug(f"ID生成: {item_id[:50]}... (原始字段: comment_id={data.get('comment_id')}, post_id={data.get('post_id')}, id={data.get('id')})")
-                        
-                        if self._is_duplicate(item_id):
-                            stats['duplicates'] += 1
-                            continue
-                        
-                        # 清洗数据
-                        cleaned_data = self._clean_data(data)
-                        
-                        # 推送到输出队列
-                        self.r_out.lpush(self.queue_out, json.dumps(cleaned_data, ensure_ascii=False))
-                        
-                        # 添加到缓存
-                        self._add_to_cache(item_id)
-                        
-                        stats['cleaned'] += 1
-                        
-                    except json.JSONDecodeError as e:
-                        logger.warning(f"JSON 解析失败: {e}")
-                        stats['invalid'] += 1
-                    except Exception as e:
-                        logger.error(f"处理数据时出错: {e}")
-                        stats['invalid'] += 1
+                if parallel:
+                    self._process_batch_parallel(batch_data, stats)
+                elif columnar:
+                    self._process_batch_columnar(batch_data, stats)
+                else:
+                    self._process_batch(batch_data, stats)
                 
                 processed += len(batch_data)
                 stats['total_processed'] = processed
                 
                 # 显示进度
-                if processed % 100 == 0 or processed >= queue_length:
-                    logger.info(f"进度: {processed}/{queue_length} "
+                if processed % 100 == 0 or processed >= pending:
+                    logger.info(f"进度: {processed}/{pending} "
                                f"(清洗: {stats['cleaned']}, 去重: {stats['duplicates']}, 无效: {stats['invalid']})")
             
+            # 记录游标（出错时不记录，下一轮重新读取，由 ID 去重兜底）
+            if self.cursor is not None:
+                self.cursor.save(queue_length, head, pushed)
+            
             stats['end_time'] = datetime.now().isoformat()
             
             logger.info("\n✨ 单次清洗完成")
@@ -150,6 +215,19 @@ class SinglePassCleaner:
             logger.info(f"清洗成功: {stats['cleaned']}")
             logger.info(f"去重过滤: {stats['duplicates']}")
             logger.info(f"无效数据: {stats['invalid']}")
+            if self.near_dup is not None:
+                logger.info(f"近似重复: {stats['near_duplicates']} ({self.near_dup.action})")
+            if self.watchlist is not None:
+                logger.info(f"关注提醒: {stats['alerts']}")
+            
+            if self.metrics is not None:
+                logger.info(f"分阶段耗时（累计）: {self.metrics.stage_summary()}")
+            
+            if self.local_cache is not None:
+                stats['dedup_cache'] = self.local_cache.get_stats()
+                logger.info(f"本地去重缓存: LRU 命中率 {stats['dedup_cache']['lru_hit_rate']:.1%}, "
+                           f"本地判定率 {stats['dedup_cache']['local_hit_rate']:.1%}, "
+                           f"Redis 查询 {stats['dedup_cache']['redis_lookups']} 次")
             
             return stats
             
@@ -161,86 +239,394 @@ class SinglePassCleaner:
             stats['end_time'] = datetime.now().isoformat()
             return stats
     
-    def _validate_data(self, data: Dict[str, Any]) -> bool:
+    def _new_stats(self) -> Dict[str, Any]:
+        """新一轮清洗的统计"""
+        from datetime import datetime
+        
+        return {
+            'total_processed': 0,
+            'cleaned': 0,
+            'duplicates': 0,
+            'invalid': 0,
+            'near_duplicates': 0,
+            'alerts': 0,
+            'start_time': datetime.now().isoformat()
+        }
+    
+    def clean_items(self, raw_items: List[str]) -> Dict[str, Any]:
         """
-        验证数据是否有效
+        清洗调用方已从输入队列取出的数据（阻塞消费模式），不读取队列也不使用游标
+        
+        与 clean_once 不同，写入 Redis 失败时直接抛出异常，由调用方决定不确认并重试
         
         Args:
-            data: 数据字典
+            raw_items: 原始 JSON 字符串列表（按到达顺序）
             
         Returns:
-            是否有效
+            清洗结果统计
         """
-        # 检查必要字段：source 必须有，文本字段至少有一个
-        if 'source' not in data or not data['source']:
-            logger.debug(f"❌ 验证失败: 缺少 source 字段")
-            return False
+        from datetime import datetime
         
-        # 文本字段：text、content、title 至少有一个且非空
-        has_text = any(
-            field in data and data[field] and str(data[field]).strip()
-            for field in ['text', 'content', 'title']
-        )
+        self.pass_output = []
+        stats = self._new_stats()
         
-        if not has_text:
-            logger.debug(f"❌ 验证失败: 没有有效的文本字段 (text/content/title)")
-            return False
+        if self.local_cache is not None and self.local_cache.needs_refresh():
+            self._refresh_local_cache()
         
-        return True
+        if self.pool is not None and self.pool.should_parallelize(len(raw_items)):
+            self._process_batch_parallel(raw_items, stats)
+        elif self._should_use_columnar(len(raw_items)):
+            self._process_batch_columnar(raw_items, stats)
+        else:
+            self._process_batch(raw_items, stats)
+        
+        stats['total_processed'] = len(raw_items)
+        stats['end_time'] = datetime.now().isoformat()
+        logger.info(f"⚡ 清洗 {len(raw_items)} 条: 成功 {stats['cleaned']}, "
+                    f"去重 {stats['duplicates']}, 无效 {stats['invalid']}")
+        return stats
     
-    def _get_item_id(self, data: Dict[str, Any]) -> str:
+    def _process_batch(self, batch_data: List[str], stats: Dict[str, Any]):
         """
-        获取数据的唯一标识（用于去重）
+        处理一批原始数据：解析 → 验证 → 生成ID → 批量去重 → 清洗 → 写入
         
         Args:
-            data: 数据字典
+            batch_data: 原始 JSON 字符串列表
+            stats: 清洗统计（原地更新）
+        """
+        import json
+        
+        perf = time.perf_counter
+        parse_sec = validate_sec = id_sec = 0.0
+        
+        # 1. 解析、验证并生成 ID
+        candidates = []
+        for data_str in batch_data:
+            try:
+                started = perf()
+                data = json.loads(data_str)
+                parsed = perf()
+                
+                # 按字段结构获取清洗计划，检查必要字段
+                plan = get_plan(data)
+                valid = validate_record(data, plan)
+                validated = perf()
+                parse_sec += parsed - started
+                validate_sec += validated - parsed
+                if not valid:
+                    stats['invalid'] += 1
+                    self._discard(data, 'invalid')
+                    continue
+                
+                item_id = compute_item_id(data, plan)
+                id_sec += perf() - validated
+                
+                # 调试日志（仅在有 comment_id 或 post_id 时输出）
+                if 'comment_id' in data or 'post_id' in data:
+                    logger.debug(f"ID生成: {item_id[:50]}... (原始字段: comment_id={data.get('comment_id')}, post_id={data.get('post_id')}, id={data.get('id')})")
+                
+                candidates.append((item_id, data))
+                
+            except json.JSONDecodeError as e:
+                logger.warning(f"JSON 解析失败: {e}")
+                stats['invalid'] += 1
+                self._discard(data_str, 'json')
+            except Exception as e:
+                logger.error(f"处理数据时出错: {e}")
+                stats['invalid'] += 1
+                self._discard(data_str, 'invalid')
+        
+        if self.metrics is not None:
+            self.metrics.add_stage('parse', parse_sec, len(batch_data))
+            self.metrics.add_stage('validate', validate_sec, len(batch_data))
+            self.metrics.add_stage('id', id_sec, len(candidates))
+        
+        self._dedup_and_write(candidates, stats, self._clean_many)
+        if self.metrics is not None:
+            self.metrics.flush()
+    
+    def _process_batch_parallel(self, batch_data: List[str], stats: Dict[str, Any]):
+        """
+        多进程处理一批原始数据：子进程解析 / 验证 / 生成ID / 清洗，
+        主进程按 ID 去重后按原始顺序写入（重复数据的清洗结果直接丢弃）
+        
+        Args:
+            batch_data: 原始 JSON 字符串列表
+            stats: 清洗统计（原地更新）
+        """
+        started = time.perf_counter()
+        prepared = self.pool.prepare(batch_data, self.tokenizer)
+        if self.metrics is not None:
+            self.metrics.add_stage('identify', time.perf_counter() - started, len(batch_data))
+        
+        candidates = []
+        for data_str, (item_id, record) in zip(batch_data, prepared):
+            if item_id is None:
+                stats['invalid'] += 1
+                self._discard(data_str, 'invalid')
+                continue
+            # 清洗出错的数据保留原始字符串，去重后按 clean_error 统计
+            candidates.append((item_id, record if record is not None else data_str))
+        
+        self._dedup_and_write(candidates, stats, self._prepared_records)
+        if self.metrics is not None:
+            self.metrics.flush()
+    
+    @staticmethod
+    def _prepared_records(records: List[Tuple[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """子进程已清洗的结果（原始字符串表示清洗出错）"""
+        return [payload if isinstance(payload, dict) else None for _, payload in records]
+    
+    def _should_use_columnar(self, pending: int) -> bool:
+        """待处理数据量是否达到列式清洗的阈值"""
+        return self.columnar_threshold is not None and pending >= self.columnar_threshold
+    
+    def _process_batch_columnar(self, batch_data: List[str], stats: Dict[str, Any]):
+        """
+        列式处理一批原始数据：逐条解析 → 整列验证 → 生成ID → 批量去重 → 整列清洗文本 → 写入
+        
+        输出与 _process_batch 逐字节相同
+        
+        Args:
+            batch_data: 原始 JSON 字符串列表
+            stats: 清洗统计（原地更新）
+        """
+        import json
+        
+        perf = time.perf_counter
+        
+        # 1. 解析（非对象的 JSON 与逐条路径一样视为无效）
+        started = perf()
+        records = []
+        for data_str in batch_data:
+            try:
+                data = json.loads(data_str)
+            except json.JSONDecodeError as e:
+                logger.warning(f"JSON 解析失败: {e}")
+                stats['invalid'] += 1
+                self._discard(data_str, 'json')
+                continue
+            if not isinstance(data, dict):
+                stats['invalid'] += 1
+                self._discard(data_str, 'invalid')
+                continue
+            records.append(data)
+        parsed = perf()
+        
+        # 2. 整列验证
+        valid_flags = validate_records(records)
+        validated = perf()
+        
+        # 3. 生成 ID
+        candidates = []
+        for data, valid in zip(records, valid_flags):
+            if not valid:
+                stats['invalid'] += 1
+                self._discard(data, 'invalid')
+                continue
+            try:
+                candidates.append((compute_item_id(data, get_plan(data)), data))
+            except Exception as e:
+                logger.error(f"处理数据时出错: {e}")
+                stats['invalid'] += 1
+                self._discard(data, 'invalid')
+        
+        if self.metrics is not None:
+            self.metrics.add_stage('parse', parsed - started, len(batch_data))
+            self.metrics.add_stage('validate', validated - parsed, len(records))
+            self.metrics.add_stage('id', perf() - validated, len(candidates))
+        
+        self._dedup_and_write(candidates, stats, lambda fresh: clean_records_columnar(fresh, self.tokenizer))
+        if self.metrics is not None:
+            self.metrics.flush()
+    
+    def _discard(self, payload: Any, reason: str):
+        """记录丢弃原因（payload 为字典或原始 JSON 字符串）"""
+        if self.metrics is not None:
+            self.metrics.discard(source_of(payload), reason)
+    
+    def _clean_many(self, records: List[Tuple[str, Dict[str, Any]]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        在当前进程内清洗
+        
+        Args:
+            records: (ID, 已解析的数据字典) 列表
             
         Returns:
-            唯一标识
+            与输入一一对应的清洗结果，出错为 None
         """
-        import hashlib
+        results = []
+        for item_id, data in records:
+            try:
+                results.append(self._clean_data(data, item_id))
+            except Exception as e:
+                logger.error(f"处理数据时出错: {e}")
+                results.append(None)
+        return results
+    
+    def _dedup_and_write(self, candidates: List[Tuple[str, Any]], stats: Dict[str, Any],
+                         clean_many: Callable[[List[Any]], List[Optional[Dict[str, Any]]]]):
+        """
+        整批去重，清洗新数据，检测近似重复，并与 ID 写入放在同一个事务中提交
         
-        # 判断是否是评论数据（有 comment_id 或 parent_id 或 post_id 但无独立 id）
-        is_comment = (
-            'comment_id' in data or 
-            'parent_id' in data or 
-            ('post_id' in data and 'id' not in data) or
-            ('message_id' in data and 'post_id' in data)
-        )
+        Args:
+            candidates: (ID, 数据) 列表，数据为字典或原始 JSON 字符串（由 clean_many 决定）
+            stats: 清洗统计（原地更新）
+            clean_many: 批量清洗函数，接收 (ID, 数据) 列表，返回清洗结果（出错为 None）
+        """
+        import json
+        
+        if not candidates:
+            return
+        
+        perf = time.perf_counter
+        metrics = self.metrics
+        
+        # 1. 整批检查去重（本地缓存 + 一次 Redis 往返）
+        started = perf()
+        duplicate_flags = self._check_duplicates([item_id for item_id, _ in candidates])
+        
+        fresh = []
+        seen_in_batch = set()
+        for (item_id, payload), is_duplicate in zip(candidates, duplicate_flags):
+            if is_duplicate or item_id in seen_in_batch:
+                stats['duplicates'] += 1
+                self._discard(payload, 'duplicate')
+                continue
+            seen_in_batch.add(item_id)
+            fresh.append((item_id, payload))
+        if metrics is not None:
+            metrics.add_stage('dedup', perf() - started, len(candidates))
+        
+        if not fresh:
+            return
+        
+        # 2. 清洗新数据
+        started = perf()
+        cleaned = []
+        for (item_id, payload), record in zip(fresh, clean_many(fresh)):
+            if record is None:
+                stats['invalid'] += 1
+                self._discard(payload, 'clean_error')
+                continue
+            cleaned.append((item_id, record))
+        if metrics is not None:
+            metrics.add_stage('clean', perf() - started, len(fresh))
+        
+        if not cleaned:
+            return
+        
+        # 3. 近似重复检测（索引写入与数据写入在同一事务中）
+        pipe = self.r_out.pipeline()
+        if self.near_dup is not None:
+            started = perf()
+            near_dups = self.near_dup.check_many([record for _, record in cleaned], pipe)
+            if metrics is not None:
+                metrics.add_stage('near_dup', perf() - started, len(cleaned))
+        else:
+            near_dups = [None] * len(cleaned)
+        
+        # 4. 写入；被丢弃的近似重复也记录 ID，下一轮不再重复检测
+        started = perf()
+        new_ids = []
+        outputs = []
+        written = []
+        hourly_outputs = []
+        for (item_id, record), near_dup in zip(cleaned, near_dups):
+            new_ids.append(item_id)
+            if near_dup is not None:
+                action, original_id = near_dup
+                stats['near_duplicates'] += 1
+                if action == 'drop':
+                    self._discard(record, 'near_duplicate')
+                    continue
+                record['near_duplicate_of'] = original_id
+            output = json.dumps(record, ensure_ascii=False)
+            if self.hourly_output is not None:
+                hourly_outputs.append((record['created_ts'], output))
+            else:
+                pipe.lpush(self.queue_out, output)
+            outputs.append(output)
+            written.append(record)
+            if metrics is not None:
+                metrics.accept(source_of(record))
+        
+        if hourly_outputs:
+            self.hourly_output.push(pipe, hourly_outputs)
+        self.id_store.add_many(new_ids, pipe)
+        
+        # 关注列表提醒与数据写入一起执行，只提醒实际写入的数据
+        scan_sec = 0.0
+        if self.watchlist is not None and written:
+            scan_started = perf()
+            stats['alerts'] += self.watchlist.scan(written, pipe)
+            scan_sec = perf() - scan_started
+            if metrics is not None:
+                metrics.add_stage('watchlist', scan_sec, len(written))
+        pipe.execute()
+        self.pass_output.extend(outputs)
+        
+        if self.local_cache is not None:
+            expires_at = self.id_store.entry_expiry()
+            for item_id in new_ids:
+                self.local_cache.record(item_id, expires_at)
+        if metrics is not None:
+            metrics.add_stage('write', perf() - started - scan_sec, len(cleaned))
+        
+        stats['cleaned'] += len(outputs)
+    
+    def _check_duplicates(self, item_ids: List[str]) -> List[bool]:
+        """
+        批量检查是否重复：本地缓存能确定的直接返回，其余一次性查询 Redis
         
-        if is_comment:
-            # 评论数据：优先使用 comment_id
-            if data.get('comment_id'):
-                return f"comment_{data['comment_id']}"
+        Args:
+            item_ids: 数据ID列表
             
-            # 使用 post_id + message_id 组合
-            if data.get('post_id') and data.get('message_id'):
-                return f"comment_{data['post_id']}_{data['message_id']}"
+        Returns:
+            与输入一一对应的是否重复列表
+        """
+        results: List[Optional[bool]] = [None] * len(item_ids)
+        pending = []
+        
+        for i, item_id in enumerate(item_ids):
+            if self.local_cache is not None:
+                results[i] = self.local_cache.lookup(item_id)
+            if results[i] is None:
+                pending.append(i)
+        
+        if pending:
+            remote_flags = self.id_store.contains_many([item_ids[i] for i in pending])
+            expires_at = self.id_store.entry_expiry(existing=True)
+            for i, is_duplicate in zip(pending, remote_flags):
+                results[i] = is_duplicate
+                if is_duplicate and self.local_cache is not None:
+                    self.local_cache.record(item_ids[i], expires_at)
+        
+        return results
+    
+    def _validate_data(self, data: Dict[str, Any]) -> bool:
+        """
+        验证数据是否有效
+        
+        Args:
+            data: 数据字典
             
-            # 使用 parent_id + author + text_hash 组合
-            if data.get('parent_id'):
-                text_hash = hashlib.md5(str(data.get('text', '')).encode()).hexdigest()[:8]
-                author = data.get('author', 'unknown')
-                return f"comment_{data['parent_id']}_{author}_{text_hash}"
+        Returns:
+            是否有效
+        """
+        return validate_record(data)
+    
+    def _get_item_id(self, data: Dict[str, Any]) -> str:
+        """
+        获取数据的唯一标识（用于去重）
+        
+        Args:
+            data: 数据字典
             
-            # 使用 post_id + author + text_hash 组合
-            if data.get('post_id'):
-                text_hash = hashlib.md5(str(data.get('text', '')).encode()).hexdigest()[:8]
-                author = data.get('author', 'unknown')
-                return f"comment_{data['post_id']}_{author}_{text_hash}"
-        
-        # 新闻/帖子数据：优先使用各种 ID 字段
-        for id_field in ['id', 'post_id', 'tweet_id', 'guid', 'article_id']:
-            if data.get(id_field):
-                return f"post_{data[id_field]}"
-        
-        # 使用 URL
-        if data.get('url'):
-            return f"post_{hashlib.md5(data['url'].encode()).hexdigest()[:16]}"
-        
-        # 使用标题和来源的组合
-        content = f"{data.get('title', '')}_{data.get('source', '')}_{data.get('text', '')[:50]}"
-        return f"post_{hashlib.md5(content.encode()).hexdigest()[:16]}"
+        Returns:
+            唯一标识
+        """
+        return compute_item_id(data)
     
     def _is_duplicate(self, item_id: str) -> bool:
         """
@@ -252,28 +638,7 @@ class SinglePassCleaner:
         Returns:
             是否重复
         """
-        import time
-        
-        # 检查缓存类型
-        cache_type = self.r_out.type(self.id_cache_key)
-        
-        if cache_type == 'set':
-            # SET 类型（永久模式）
-            return self.r_out.sismember(self.id_cache_key, item_id)
-        
-        elif cache_type == 'zset':
-            # ZSET 类型（时间窗口模式）
-            score = self.r_out.zscore(self.id_cache_key, item_id)
-            if score is None:
-                return False
-            
-            # 检查是否在时间窗口内
-            current_time = time.time()
-            return score > (current_time - 86400)  # 24小时窗口
-        
-        else:
-            # 缓存不存在或其他类型
-            return False
+        return self._check_duplicates([item_id])[0]
     
     def _add_to_cache(self, item_id: str):
         """
@@ -282,119 +647,37 @@ class SinglePassCleaner:
         Args:
             item_id: 数据ID
         """
-        import time
-        
-        # 检查缓存类型
-        cache_type = self.r_out.type(self.id_cache_key)
+        self.id_store.add_many([item_id])
         
-        if cache_type == 'none' or cache_type == 'zset':
-            # 使用 ZSET（时间窗口模式）
-            current_time = time.time()
-            self.r_out.zadd(self.id_cache_key, {item_id: current_time})
+        if self.local_cache is not None:
+            self.local_cache.record(item_id, self.id_store.entry_expiry())
+    
+    def _refresh_local_cache(self):
+        """从 Redis ID 缓存重建本地布隆过滤器"""
+        try:
+            if not self.id_store.enumerable:
+                # Redis 侧已是布隆过滤器，本地只保留 LRU
+                self.local_cache.disable_bloom()
+                return
             
-            # 清理过期数据
-            expiry_time = current_time - 86400  # 24小时前
-            self.r_out.zremrangebyscore(self.id_cache_key, 0, expiry_time)
-        else:
-            # 使用 SET（永久模式）
-            self.r_out.sadd(self.id_cache_key, item_id)
+            count, item_ids = self.id_store.scan_ids()
+            self.local_cache.rebuild(item_ids, count_hint=count)
+        except Exception as e:
+            # 重建失败时保持布隆过滤器不可用，所有 LRU 未命中的 ID 仍查询 Redis
+            logger.warning(f"重建本地布隆过滤器失败: {e}")
     
-    def _clean_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _clean_data(self, data: Dict[str, Any], item_id: Optional[str] = None) -> Dict[str, Any]:
         """
         清洗数据
         
         Args:
             data: 原始数据
+            item_id: 去重阶段已生成的 ID（输出 id 与去重 ID 一致）
             
         Returns:
             清洗后的数据
         """
-        import re
-        from datetime import datetime
-        
-        cleaned = {}
-        
-        # 1. 提取 id 字段（区分新闻和评论）
-        import hashlib
-        
-        # 判断是否是评论
-        is_comment = (
-            'comment_id' in data or 
-            'parent_id' in data or 
-            ('post_id' in data and 'id' not in data) or
-            ('message_id' in data and 'post_id' in data)
-        )
-        
-        if is_comment:
-            # 评论：优先使用 comment_id，然后组合 ID
-            if data.get('comment_id'):
-                cleaned['id'] = f"comment_{data['comment_id']}"
-            elif data.get('message_id') and data.get('post_id'):
-                cleaned['id'] = f"comment_{data['post_id']}_{data['message_id']}"
-            elif data.get('parent_id'):
-                text_hash = hashlib.md5(str(data.get('text', '')).encode()).hexdigest()[:8]
-                author = data.get('author', 'unknown')
-                cleaned['id'] = f"comment_{data['parent_id']}_{author}_{text_hash}"
-            elif data.get('post_id'):
-                text_hash = hashlib.md5(str(data.get('text', '')).encode()).hexdigest()[:8]
-                author = data.get('author', 'unknown')
-                cleaned['id'] = f"comment_{data['post_id']}_{author}_{text_hash}"
-            else:
-                # 最后使用时间戳
-                import time
-                cleaned['id'] = f"comment_generated_{int(time.time() * 1000)}"
-        else:
-            # 新闻/帖子：优先使用各种 ID 字段
-            id_value = (data.get("id") or data.get("post_id") or data.get("tweet_id") or 
-                       data.get("guid") or data.get("article_id"))
-            if id_value:
-                cleaned['id'] = f"post_{id_value}"
-            elif data.get('url'):
-                # 使用 URL 的哈希作为 ID
-                cleaned['id'] = f"post_{hashlib.md5(data['url'].encode()).hexdigest()[:16]}"
-            else:
-                # 最后使用时间戳
-                import time
-                cleaned['id'] = f"post_generated_{int(time.time() * 1000)}"
-        
-        # 2. 提取 created_at 字段（新闻/评论的发布时间）
-        created_at = None
-        for field in ["created_at", "created_utc", "published", "published_at",
-                      "timestamp", "time", "datetime", "date"]:
-            if field in data and data[field]:
-                created_at = self._parse_time_field(data[field])
-                if created_at:
-                    break
-        
-        if created_at:
-            cleaned['created_at'] = created_at
-        else:
-            # 如果没有找到时间字段，使用当前时间
-            cleaned['created_at'] = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
-        
-        # 3. 清洗文本字段（处理 text、title、content）
-        for text_field in ['text', 'title', 'content']:
-            if text_field in data and data[text_field]:
-                text = str(data[text_field]).strip()
-                # 移除多余空格
-                text = re.sub(r'\s+', ' ', text)
-                # 移除HTML标签（如果有）
-                text = re.sub(r'<[^>]+>', '', text)
-                cleaned[text_field] = text
-        
-        # 4. 保留其他重要字段
-        for key in ['source', 'url', 'author', 'score', 'comments', 
-                    'sentiment', 'tags', 'subreddit', 'symbol', 'symbols']:
-            if key in data:
-                cleaned[key] = data[key]
-        
-        # 5. 添加处理时间戳（当前时间）
-        cleaned['timestamp'] = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
-        
-        # 6. 添加清洗时间戳（用于追踪）
-        cleaned['cleaned_at'] = datetime.now().isoformat()
-        
-        return cleaned
+        return clean_record(data, item_id, tokenizer=self.tokenizer)
     
     def _parse_time_field(self, value) -> str:
         """
@@ -406,92 +689,28 @@ class SinglePassCleaner:
         Returns:
             str: ISO 格式时间字符串，如 "2024-01-01T12:00:00Z"
         """
-        from datetime import datetime
-        
-        if value is None:
-            return None
-        
-        try:
-            # 1. 如果是 Unix 时间戳（整数或浮点数）
-            if isinstance(value, (int, float)):
-                dt = datetime.utcfromtimestamp(float(value))
-                return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
-            
-            # 2. 如果是数字字符串
-            if isinstance(value, str) and value.strip().replace('.', '').isdigit():
-                dt = datetime.utcfromtimestamp(float(value))
-                return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
-            
-            # 3. 如果是 ISO 格式字符串
-            s = str(value).strip()
-            try:
-                dt = datetime.fromisoformat(s.replace("Z", "+00:00"))
-                return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
-            except:
-                pass
-            
-            # 4. 尝试常见格式
-            formats = [
-                "%Y-%m-%d %H:%M:%S",
-                "%Y/%m/%d %H:%M:%S",
-                "%Y-%m-%dT%H:%M:%S",
-                "%Y-%m-%d",
-            ]
-            for fmt in formats:
-                try:
-                    dt = datetime.strptime(s, fmt)
-                    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
-                except:
-                    continue
-            
-            return None
-        except Exception as e:
-            logger.warning(f"时间解析失败: {value}, 错误: {e}")
-            return None
+        return parse_time_field(value)
     
-    def export_to_file(self, output_dir: Path) -> str:
+    def export_to_file(self, output_dir: Path, max_bytes: int = DEFAULT_MAX_BYTES,
+                       prefix: str = "cleaned") -> Optional[str]:
         """
-        导出清洗结果到文件
+        把本轮清洗写入的数据追加导出到当天的文件
         
         Args:
             output_dir: 输出目录
+            max_bytes: 单个导出分段的大小上限（超过后滚动到新分段）
+            prefix: 导出文件名前缀（多 worker 时每个 worker 使用自己的前缀）
             
         Returns:
-            输出文件路径
+            输出文件路径，本轮没有新数据时返回 None
         """
-        import json
-        from datetime import datetime
-        
-        # 创建输出目录
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        # 生成文件名
-        timestamp = datetime.now().strftime("%Y-%m-%d")
-        output_file = output_dir / f"cleaned_{timestamp}.jsonl"
-        
-        # 获取队列中的所有数据
-        queue_length = self.r_out.llen(self.queue_out)
-        
-        if queue_length == 0:
-            logger.info("ℹ️  输出队列为空，无数据导出")
-            return str(output_file)
-        
-        logger.info(f"📦 导出 {queue_length} 条数据到文件...")
+        if not self.pass_output:
+            logger.info("ℹ️  本轮没有新数据，无需导出")
+            return None
         
-        # 导出数据
-        with open(output_file, 'w', encoding='utf-8') as f:
-            # 使用 LRANGE 读取所有数据（不删除）
-            data_list = self.r_out.lrange(self.queue_out, 0, -1)
-            
-            for data_str in data_list:
-                try:
-                    data = json.loads(data_str)
-                    f.write(json.dumps(data, ensure_ascii=False) + '\n')
-                except:
-                    pass
-        
-        logger.info(f"✅ 数据已导出到: {output_file}")
-        return str(output_file)
+        output_file = JsonlExporter(output_dir, max_bytes, prefix).append(self.pass_output)
+        logger.info(f"✅ 已追加 {len(self.pass_output)} 条数据到: {output_file}")
+        return output_file
     
     def close(self):
         """关闭连接"""
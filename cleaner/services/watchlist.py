@@ -0,0 +1,296 @@
+"""
+关注列表实时提醒
+用户在 Redis 哈希 {patterns_key} 中登记关注的词（股票代码、公司名、短语，值为标签），
+每次修改后 INCR {version_key}。Cleaner 把全部词编译为一个 Aho-Corasick 自动机（版本变化时重新编译），
+对每条写入的清洗结果单次扫描 title / text / content，命中后在写入数据的同一 pipeline 中：
+- XADD 到提醒流 {alert_stream}（带 MAXLEN 上限，供后端补发断线期间的提醒）
+- PUBLISH 到提醒频道 {alert_channel}（后端订阅后经 WebSocket 推送）
+
+匹配不区分大小写，英文词要求词边界（"ETH" 不会命中 "ethereum"）。
+"""
+import json
+import logging
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+# 扫描的文本字段
+TEXT_FIELDS = ('title', 'text', 'content')
+
+# 提醒中附带的摘要长度
+SNIPPET_CHARS = 200
+
+
+class AhoCorasick:
+    """Aho-Corasick 多模式匹配自动机（小写、词边界）"""
+
+    def __init__(self, patterns: Iterable[str]):
+        """
+        编译自动机
+
+        Args:
+            patterns: 关注的词（匹配前统一转为小写，空白词忽略）
+        """
+        self.patterns: List[str] = []
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[int]] = [[]]
+
+        for pattern in dict.fromkeys(p.strip().lower() for p in patterns):
+            if pattern:
+                self._add(pattern)
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def _add(self, pattern: str):
+        node = 0
+        for char in pattern:
+            nxt = self.goto[node].get(char)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[node][char] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            node = nxt
+        self.output[node].append(len(self.patterns))
+        self.patterns.append(pattern)
+
+    def _build(self):
+        """按层 BFS 计算失败指针，并把失败链上的输出合并到每个节点"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and char not in self.goto[state]:
+                    state = self.fail[state]
+                fallback = self.goto[state].get(char, 0)
+                self.fail[child] = fallback if fallback != child else 0
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def find(self, text: str) -> List[str]:
+        """
+        单次扫描文本
+
+        Args:
+            text: 待扫描文本
+
+        Returns:
+            命中的词（去重，按首次命中顺序）
+        """
+        if not self.patterns or not text:
+            return []
+
+        text = text.lower()
+        goto, fail, output, patterns = self.goto, self.fail, self.output, self.patterns
+        found: Dict[int, None] = {}
+        node = 0
+        for end, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for index in output[node]:
+                if index not in found and _on_boundary(text, end + 1 - len(patterns[index]), end + 1):
+                    found[index] = None
+        return [patterns[index] for index in found]
+
+
+def _is_word_char(char: str) -> bool:
+    """ASCII 字母数字（中文等无空格分词的文字不要求词边界）"""
+    return char.isascii() and char.isalnum()
+
+
+def _on_boundary(text: str, start: int, end: int) -> bool:
+    """命中两端为词边界（词首 / 词尾本身不是字母数字时不要求）"""
+    if _is_word_char(text[start]) and start > 0 and _is_word_char(text[start - 1]):
+        return False
+    if _is_word_char(text[end - 1]) and end < len(text) and _is_word_char(text[end]):
+        return False
+    return True
+
+
+# 尚未加载过关注列表（与版本键不存在时 GET 返回的 None 区分）
+_NOT_LOADED = object()
+
+
+class Watchlist:
+    """关注列表：从 Redis 加载并按版本重新编译，扫描清洗结果并发出提醒"""
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        patterns_key: str = "watchlist:patterns",
+        version_key: str = "watchlist:version",
+        alert_stream: str = "watchlist:alerts",
+        alert_stream_maxlen: int = 10000,
+        alert_channel: str = "watchlist_alerts",
+        refresh_interval_sec: float = 1.0
+    ):
+        """
+        初始化关注列表
+
+        Args:
+            client: 关注列表与提醒所在的 Redis 客户端（db_out）
+            patterns_key: 关注词哈希（字段为词，值为标签）
+            version_key: 版本计数器（修改关注词后 INCR）
+            alert_stream: 提醒流
+            alert_stream_maxlen: 提醒流保留的大致条数
+            alert_channel: 提醒频道
+            refresh_interval_sec: 检查版本的最小间隔（秒）
+        """
+        self.client = client
+        self.patterns_key = patterns_key
+        self.version_key = version_key
+        self.alert_stream = alert_stream
+        self.alert_stream_maxlen = alert_stream_maxlen
+        self.alert_channel = alert_channel
+        self.refresh_interval_sec = refresh_interval_sec
+
+        self.version: Any = _NOT_LOADED
+        self.entries: Dict[str, str] = {}
+        self.labels: Dict[str, str] = {}
+        self.automaton = AhoCorasick(())
+        self.last_refresh = 0.0
+        self.alerts_sent = 0
+
+    @classmethod
+    def from_config(cls, client: redis.Redis, watchlist_config: Optional[Dict[str, Any]]) -> Optional['Watchlist']:
+        """
+        根据 watchlist 配置创建实例
+
+        Returns:
+            Watchlist，未启用时返回 None
+        """
+        if not watchlist_config or not watchlist_config.get('enabled', False):
+            return None
+
+        return cls(
+            client,
+            patterns_key=watchlist_config.get('patterns_key', 'watchlist:patterns'),
+            version_key=watchlist_config.get('version_key', 'watchlist:version'),
+            alert_stream=watchlist_config.get('alert_stream', 'watchlist:alerts'),
+            alert_stream_maxlen=watchlist_config.get('alert_stream_maxlen', 10000),
+            alert_channel=watchlist_config.get('alert_channel', 'watchlist_alerts'),
+            refresh_interval_sec=watchlist_config.get('refresh_interval_sec', 1.0)
+        )
+
+    def refresh(self, now: Optional[float] = None, force: bool = False) -> bool:
+        """
+        版本变化时重新加载并编译（按 refresh_interval_sec 检查，每次只需一次 GET）
+
+        首次调用总是加载；版本键不存在（关注词直接 HSET 或版本键过期 / 被清空）时
+        每次检查都读取哈希，内容变化才重新编译
+
+        Returns:
+            是否重新编译
+        """
+        now = now if now is not None else time.time()
+        if not force and now - self.last_refresh < self.refresh_interval_sec:
+            return False
+        self.last_refresh = now
+
+        try:
+            version = self.client.get(self.version_key)
+            if not force and version is not None and version == self.version:
+                return False
+            entries = self.client.hgetall(self.patterns_key)
+        except redis.RedisError as e:
+            logger.warning(f"加载关注列表失败: {e}")
+            return False
+
+        if not force and self.version is not _NOT_LOADED and version is None and entries == self.entries:
+            self.version = version
+            return False
+
+        self.entries = entries
+        self.labels = {pattern.strip().lower(): label or pattern for pattern, label in entries.items()}
+        self.automaton = AhoCorasick(self.labels)
+        self.version = version
+        logger.info(f"👀 关注列表已编译: {len(self.automaton)} 个词 (版本 {version or 0})")
+        return True
+
+    def match(self, record: Dict[str, Any]) -> List[str]:
+        """清洗结果中命中的词"""
+        text = "\n".join(str(record[field]) for field in TEXT_FIELDS if record.get(field))
+        return self.automaton.find(text)
+
+    def scan(self, records: List[Dict[str, Any]], pipe) -> int:
+        """
+        扫描本批写入的清洗结果，提醒命令加入调用方的 pipeline（与数据写入一起执行）
+
+        Args:
+            records: 清洗结果
+            pipe: Redis pipeline
+
+        Returns:
+            提醒条数
+        """
+        self.refresh()
+        if not len(self.automaton):
+            return 0
+
+        matched_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        alerts = 0
+        for record in records:
+            for pattern in self.match(record):
+                alert = json.dumps(self._build_alert(record, pattern, matched_at), ensure_ascii=False)
+                pipe.xadd(self.alert_stream, {'data': alert}, maxlen=self.alert_stream_maxlen, approximate=True)
+                pipe.publish(self.alert_channel, alert)
+                alerts += 1
+        self.alerts_sent += alerts
+        return alerts
+
+    def _build_alert(self, record: Dict[str, Any], pattern: str, matched_at: str) -> Dict[str, Any]:
+        snippet = str(record.get('title') or record.get('text') or record.get('content') or '')
+        return {
+            'type': 'watchlist_alert',
+            'pattern': pattern,
+            'label': self.labels.get(pattern, pattern),
+            'id': record.get('id'),
+            'source': record.get('source'),
+            'url': record.get('url'),
+            'created_at': record.get('created_at'),
+            'snippet': snippet[:SNIPPET_CHARS],
+            'matched_at': matched_at
+        }
+
+
+def add_patterns(client: redis.Redis, patterns: Dict[str, str],
+                 patterns_key: str = "watchlist:patterns", version_key: str = "watchlist:version") -> int:
+    """
+    登记关注词并递增版本（同一事务）
+
+    Args:
+        patterns: {词: 标签}
+
+    Returns:
+        新版本号
+    """
+    pipe = client.pipeline()
+    pipe.hset(patterns_key, mapping=patterns)
+    pipe.incr(version_key)
+    return pipe.execute()[-1]
+
+
+def remove_patterns(client: redis.Redis, patterns: List[str],
+                    patterns_key: str = "watchlist:patterns", version_key: str = "watchlist:version") -> Tuple[int, int]:
+    """
+    删除关注词并递增版本（同一事务）
+
+    Returns:
+        (删除的个数, 新版本号)
+    """
+    pipe = client.pipeline()
+    pipe.hdel(patterns_key, *patterns)
+    pipe.incr(version_key)
+    removed, version = pipe.execute()
+    return removed, version
@@ -0,0 +1,59 @@
+"""
+清洗器运行指标快照
+显示滚动速率、按来源的写入 / 丢弃计数与分阶段耗时
+
+用法:
+    python stats_snapshot.py            # 显示一次
+    python stats_snapshot.py --watch 5  # 每 5 秒刷新
+    python stats_snapshot.py --json     # 输出 JSON
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+
+import redis
+import yaml
+
+from services.cleaner_metrics import CleanerMetrics, format_snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(description='清洗器运行指标快照')
+    parser.add_argument('--watch', type=float, default=0, help='刷新间隔（秒），0=只显示一次')
+    parser.add_argument('--json', action='store_true', help='输出 JSON')
+    args = parser.parse_args()
+
+    # 加载配置（当前目录下的配置文件）
+    config_path = Path(__file__).parent / "config_processing.yaml"
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+
+    redis_config = config['redis']
+    client = redis.Redis(
+        host=redis_config['host'],
+        port=redis_config['port'],
+        db=redis_config['db_out'],
+        decode_responses=True
+    )
+    metrics = CleanerMetrics.from_config(client, {**config.get('stats', {}), 'enabled': True},
+                                         config.get('monitor', {}))
+
+    try:
+        while True:
+            snapshot = metrics.snapshot()
+            if args.json:
+                print(json.dumps(snapshot, ensure_ascii=False))
+            else:
+                print(f"[{time.strftime('%H:%M:%S')}] " + format_snapshot(snapshot).replace("\n", "\n           "))
+            if args.watch <= 0:
+                break
+            time.sleep(args.watch)
+    except KeyboardInterrupt:
+        pass
+    except redis.ConnectionError as e:
+        print(f"❌ Redis 连接失败: {e}")
+
+
+if __name__ == "__main__":
+    main()
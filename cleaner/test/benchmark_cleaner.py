@@ -0,0 +1,404 @@
+"""
+Cleaner 吞吐量基准测试
+用 generate_test_data 的文本素材与 samples/sample_raw.jsonl 中各来源的真实字段结构合成原始数据，
+在本地 redis-server 上端到端运行 SinglePassCleaner，报告：
+- 每秒处理条数（records/sec）
+- 每条数据的 Redis 命令数（INFO total_commands_processed 差值）
+- 批次延迟 p50 / p99
+- 进程峰值内存（RSS）
+
+清洗器的设置（分词、关注列表、按小时分区输出、列式清洗、近似去重、子进程数）默认取自
+config_processing.yaml，与生产运行一致；可用命令行逐项覆盖，或用 --matrix 运行
+分词 / 关注列表 / 小时分区 / 列式清洗的全部组合。
+
+结果保存为 JSON，便于比较不同版本的清洗器。
+
+用法:
+    python test/benchmark_cleaner.py
+    python test/benchmark_cleaner.py --sizes 1000 10000 --dup-ratio 0.3 --sources rss=0.5,reddit_comment=0.5
+    python test/benchmark_cleaner.py --no-tokenizer --hourly --workers 4
+    python test/benchmark_cleaner.py --sizes 10000 --matrix
+
+⚠️ 会清空 --db-in / --db-out 指定的数据库（默认 14 / 15），请勿指向生产数据库。
+"""
+import argparse
+import itertools
+import json
+import logging
+import math
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import redis
+
+CLEANER_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(CLEANER_DIR))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from generate_test_data import CONFIG, REDIS_HOST, REDIS_PORT, TITLES, TEXT_SAMPLES, SUMMARIES, AUTHORS
+from services.single_pass_cleaner import SinglePassCleaner
+from services.local_dedup_cache import LocalDedupCache
+from services.cleaning_pool import CleaningPool
+from services.watchlist import Watchlist, add_patterns
+from utils.text_tokenizer import TextTokenizer, load_stop_words
+from utils.hourly_queue import HourlyQueue
+
+SAMPLE_FILE = CLEANER_DIR / "samples" / "sample_raw.jsonl"
+DEFAULT_OUTPUT_DIR = CLEANER_DIR / "output" / "benchmarks"
+
+# 各来源决定去重 ID 的字段（生成时替换为唯一值）
+ID_KEYS = ('id', 'guid', 'post_id', 'comment_id', 'message_id', 'tweet_id', 'article_id')
+
+# 可开关的清洗器设置（--matrix 运行这些设置的全部组合）
+TOGGLES = ('tokenizer', 'watchlist', 'hourly', 'columnar')
+
+# 关注列表启用时登记的关注词（部分命中 generate_test_data 的标题与正文）
+BENCH_WATCHLIST = {
+    'Fed': 'macro', 'Inflation': 'macro', 'Apple': 'AAPL', 'Microsoft': 'MSFT',
+    'Nvidia': 'NVDA', 'Tesla': 'TSLA', 'Oil Prices': 'energy', 'Merger Deal': 'm&a',
+}
+
+
+def config_settings(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    清洗器设置：命令行指定的项覆盖 config_processing.yaml 中的值
+
+    Returns:
+        {tokenizer, watchlist, hourly, columnar, near_dup, workers}
+    """
+    processing = CONFIG.get('processing', {})
+    layout = CONFIG.get('redis', {}).get('queue_out_layout', {}) or {}
+    from_config = {
+        'tokenizer': bool(CONFIG.get('tokenizer', {}).get('enabled', False)),
+        'watchlist': bool(CONFIG.get('watchlist', {}).get('enabled', False)),
+        'hourly': layout.get('layout', 'list') == 'hourly',
+        'columnar': bool(processing.get('columnar', False)),
+        'near_dup': bool(CONFIG.get('near_duplicate', {}).get('enabled', False)),
+        'workers': processing.get('workers', 1),
+    }
+    return {key: value if getattr(args, key) is None else getattr(args, key)
+            for key, value in from_config.items()}
+
+
+def settings_matrix(base: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """TOGGLES 的全部开关组合（近似去重与子进程数沿用 base）"""
+    return [{**base, **dict(zip(TOGGLES, values))}
+            for values in itertools.product((False, True), repeat=len(TOGGLES))]
+
+
+def settings_label(settings: Dict[str, Any]) -> str:
+    """设置的简短描述，例如 tokenizer+columnar, workers=1"""
+    enabled = [key for key in TOGGLES + ('near_dup',) if settings[key]]
+    return f"{'+'.join(enabled) or 'baseline'}, workers={settings['workers']}"
+
+
+def load_templates() -> Dict[str, Dict[str, Any]]:
+    """每个来源取一条真实原始数据作为字段结构模板"""
+    templates = {}
+    with open(SAMPLE_FILE, 'r', encoding='utf-8') as f:
+        for line in f:
+            data = json.loads(line)
+            templates.setdefault(data.get('source'), data)
+    return templates
+
+
+def parse_source_mix(spec: Optional[str], templates: Dict[str, Dict[str, Any]]) -> Dict[str, float]:
+    """
+    解析来源比例，例如 "rss=0.5,reddit_comment=0.5"（未指定时各来源均分）
+
+    Returns:
+        来源 → 权重
+    """
+    if not spec:
+        return {source: 1.0 for source in templates}
+
+    mix = {}
+    for part in spec.split(','):
+        source, _, weight = part.partition('=')
+        source = source.strip()
+        if source not in templates:
+            raise SystemExit(f"❌ 未知来源 {source}，可选: {', '.join(sorted(templates))}")
+        mix[source] = float(weight or 1)
+    return mix
+
+
+def generate_records(count: int, dup_ratio: float, source_mix: Dict[str, float],
+                     templates: Dict[str, Dict[str, Any]], seed: int) -> List[str]:
+    """
+    合成原始数据（按到达顺序）
+
+    Args:
+        count: 条数
+        dup_ratio: 重复数据比例（与之前某条数据的去重 ID 相同）
+        source_mix: 来源权重
+        templates: 来源字段模板
+        seed: 随机种子
+
+    Returns:
+        原始 JSON 字符串列表
+    """
+    rng = random.Random(seed)
+    sources = list(source_mix)
+    weights = [source_mix[source] for source in sources]
+    now = int(time.time())
+
+    records: List[str] = []
+    for n in range(count):
+        if records and rng.random() < dup_ratio:
+            records.append(rng.choice(records))
+            continue
+
+        source = rng.choices(sources, weights)[0]
+        data = dict(templates[source])
+        token = f"bench{seed}_{n}"
+        for key in ID_KEYS:
+            if key in data:
+                data[key] = token
+        data['url'] = f"{templates[source].get('url', 'https://example.com/')}#{token}"
+        data['timestamp'] = str(now - rng.randint(0, 6 * 3600))
+        data['text'] = f"{rng.choice(TEXT_SAMPLES)} {rng.choice(SUMMARIES)} #{n}"
+        if 'title' in data:
+            data['title'] = f"{rng.choice(TITLES)} #{n}"
+        if 'author' in data:
+            data['author'] = rng.choice(AUTHORS)
+        records.append(json.dumps(data, ensure_ascii=False))
+    return records
+
+
+def peak_rss_mb() -> Optional[float]:
+    """进程峰值内存（MB），无法获取时返回 None"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux 为 KB，macOS 为字节
+        return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return round(getattr(info, 'peak_wset', info.rss) / (1024 * 1024), 1)
+    except ImportError:
+        return None
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """最近秩百分位数"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def total_commands(client: redis.Redis) -> int:
+    return int(client.info('stats')['total_commands_processed'])
+
+
+def run_case(args: argparse.Namespace, size: int, records: List[str],
+             settings: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    按给定设置运行一个规模的基准测试
+
+    Returns:
+        结果字典
+    """
+    r_in = redis.Redis(host=args.host, port=args.port, db=args.db_in, decode_responses=True)
+    r_out = redis.Redis(host=args.host, port=args.port, db=args.db_out, decode_responses=True)
+    r_in.flushdb()
+    r_out.flushdb()
+
+    # 按 Scraper 的方式 LPUSH（最新的在头部）
+    pipe = r_in.pipeline(transaction=False)
+    for start in range(0, len(records), 1000):
+        pipe.lpush(args.queue, *records[start:start + 1000])
+    pipe.execute()
+
+    dedup_config = CONFIG.get('deduplication', {})
+    processing = CONFIG.get('processing', {})
+    pool = CleaningPool.from_config({**processing, 'workers': settings['workers']})
+    queue_out = f"{args.queue}:cleaned"
+
+    watchlist = None
+    if settings['watchlist']:
+        watchlist_config = {**CONFIG.get('watchlist', {}), 'enabled': True}
+        add_patterns(r_out, BENCH_WATCHLIST,
+                     watchlist_config.get('patterns_key', 'watchlist:patterns'),
+                     watchlist_config.get('version_key', 'watchlist:version'))
+        watchlist = Watchlist.from_config(r_out, watchlist_config)
+
+    hourly_output = None
+    if settings['hourly']:
+        layout = CONFIG.get('redis', {}).get('queue_out_layout', {}) or {}
+        hourly_output = HourlyQueue.from_config(r_out, queue_out, {**layout, 'layout': 'hourly'})
+    cleaner = SinglePassCleaner(
+        redis_host=args.host,
+        redis_port=args.port,
+        db_in=args.db_in,
+        db_out=args.db_out,
+        queue_in=args.queue,
+        queue_out=queue_out,
+        id_cache_key=f"{args.queue}:ids",
+        local_cache=LocalDedupCache.from_config(dedup_config.get('local_cache', {})),
+        dedup_config=dedup_config,
+        pool=pool,
+        near_dup_config=CONFIG.get('near_duplicate', {}) if settings['near_dup'] else {},
+        r_in=r_in,
+        r_out=r_out,
+        tokenizer=TextTokenizer(load_stop_words()) if settings['tokenizer'] else None,
+        hourly_output=hourly_output,
+        watchlist=watchlist,
+        columnar_threshold=processing.get('columnar_threshold', 500) if settings['columnar'] else None
+    )
+
+    # 记录每批的处理耗时（解析 → 去重 → 清洗 → 写入）
+    batch_latencies: List[float] = []
+
+    def timed(method):
+        def wrapper(batch_data, stats):
+            started = time.perf_counter()
+            method(batch_data, stats)
+            batch_latencies.append(time.perf_counter() - started)
+        return wrapper
+
+    cleaner._process_batch = timed(cleaner._process_batch)
+    cleaner._process_batch_parallel = timed(cleaner._process_batch_parallel)
+    cleaner._process_batch_columnar = timed(cleaner._process_batch_columnar)
+
+    commands_before = total_commands(r_in)
+    started = time.perf_counter()
+    stats = cleaner.clean_once(batch_size=args.batch_size)
+    elapsed = time.perf_counter() - started
+    # 减去读取计数本身的 INFO 命令
+    commands = total_commands(r_in) - commands_before - 1
+
+    if pool is not None:
+        pool.shutdown()
+    if 'error' in stats:
+        raise RuntimeError(f"清洗出错: {stats['error']}")
+
+    return {
+        'size': size,
+        'settings': settings,
+        'elapsed_sec': round(elapsed, 3),
+        'records_per_sec': round(size / elapsed, 1) if elapsed > 0 else None,
+        'redis_commands': commands,
+        'commands_per_record': round(commands / size, 3),
+        'batches': len(batch_latencies),
+        'batch_latency_p50_ms': round(percentile(batch_latencies, 50) * 1000, 2) if batch_latencies else None,
+        'batch_latency_p99_ms': round(percentile(batch_latencies, 99) * 1000, 2) if batch_latencies else None,
+        'peak_rss_mb': peak_rss_mb(),
+        'cleaned': stats['cleaned'],
+        'duplicates': stats['duplicates'],
+        'invalid': stats['invalid'],
+        'near_duplicates': stats['near_duplicates'],
+        'alerts': stats['alerts'],
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=CLEANER_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cleaner 吞吐量基准测试')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000], help='数据规模')
+    parser.add_argument('--dup-ratio', type=float, default=0.15, help='重复数据比例')
+    parser.add_argument('--sources', default=None,
+                        help='来源比例，如 rss=0.4,reddit_comment=0.6（默认各来源均分）')
+    parser.add_argument('--batch-size', type=int, default=CONFIG.get('reader', {}).get('batch_size', 200),
+                        help='每批读取数量')
+    # 以下设置不指定时取自 config_processing.yaml
+    parser.add_argument('--workers', type=int, default=None, help='多进程清洗子进程数（0=CPU 核数，1=关闭）')
+    parser.add_argument('--tokenizer', action=argparse.BooleanOptionalAction, default=None, help='预先分词')
+    parser.add_argument('--watchlist', action=argparse.BooleanOptionalAction, default=None, help='关注列表扫描')
+    parser.add_argument('--hourly', action=argparse.BooleanOptionalAction, default=None, help='按小时分区输出')
+    parser.add_argument('--columnar', action=argparse.BooleanOptionalAction, default=None, help='列式清洗')
+    parser.add_argument('--near-dup', action=argparse.BooleanOptionalAction, default=None, help='近似重复检测')
+    parser.add_argument('--matrix', action='store_true',
+                        help=f"运行 {' / '.join(TOGGLES)} 的全部组合")
+    parser.add_argument('--host', default=REDIS_HOST)
+    parser.add_argument('--port', type=int, default=REDIS_PORT)
+    parser.add_argument('--db-in', type=int, default=14, help='输入数据库（会被清空）')
+    parser.add_argument('--db-out', type=int, default=15, help='输出数据库（会被清空）')
+    parser.add_argument('--queue', default='bench_queue')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', type=Path, default=None, help='结果 JSON 路径')
+    parser.add_argument('--verbose', action='store_true', help='输出清洗器日志')
+    args = parser.parse_args()
+
+    if args.db_in in (CONFIG['redis']['db_in'], CONFIG['redis']['db_out']) or \
+            args.db_out in (CONFIG['redis']['db_in'], CONFIG['redis']['db_out']):
+        raise SystemExit("❌ 基准测试会清空数据库，不能使用配置文件中的 db_in / db_out")
+
+    # 导入 services 时已配置日志，这里只调整级别（逐批进度日志会影响计时）
+    logging.getLogger().setLevel(logging.INFO if args.verbose else logging.WARNING)
+
+    try:
+        redis.Redis(host=args.host, port=args.port).ping()
+    except redis.ConnectionError as e:
+        raise SystemExit(f"❌ 无法连接 redis-server {args.host}:{args.port}: {e}")
+
+    templates = load_templates()
+    source_mix = parse_source_mix(args.sources, templates)
+    base_settings = config_settings(args)
+    all_settings = settings_matrix(base_settings) if args.matrix else [base_settings]
+
+    print("=" * 80)
+    print("⏱️  Cleaner 吞吐量基准测试")
+    print("=" * 80)
+    print(f"规模: {args.sizes}, 重复比例: {args.dup_ratio}, 来源: {source_mix}")
+    print(f"批量: {args.batch_size}, 设置: {settings_label(base_settings)}"
+          f"{f'（{len(all_settings)} 种组合）' if args.matrix else ''}")
+    print()
+
+    results = []
+    for size in args.sizes:
+        records = generate_records(size, args.dup_ratio, source_mix, templates, args.seed)
+        for settings in all_settings:
+            result = run_case(args, size, records, settings)
+            results.append(result)
+            print(f"{size:>8} 条 [{settings_label(settings)}]: {result['records_per_sec']:>10} 条/秒, "
+                  f"{result['commands_per_record']:>6} 命令/条, "
+                  f"p50 {result['batch_latency_p50_ms']} ms, p99 {result['batch_latency_p99_ms']} ms, "
+                  f"峰值内存 {result['peak_rss_mb']} MB")
+
+    report = {
+        'meta': {
+            'run_at': datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'redis_version': redis.Redis(host=args.host, port=args.port).info('server').get('redis_version'),
+            'dup_ratio': args.dup_ratio,
+            'source_mix': source_mix,
+            'batch_size': args.batch_size,
+            'settings': base_settings,
+            'matrix': args.matrix,
+            'dedup_mode': CONFIG.get('deduplication', {}).get('mode'),
+            'seed': args.seed,
+            # 峰值内存为进程级，规模递增运行时反映的是截至该规模的峰值
+            'peak_rss_note': 'process-wide high-water mark',
+        },
+        'results': results,
+    }
+
+    output = args.output or DEFAULT_OUTPUT_DIR / f"cleaner_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n✅ 结果已保存: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+自适应批量控制单元测试
+验证零星数据快速触发、突发时批量增大、过载与下游滞后时合并批次
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.adaptive_batching import AdaptiveBatchController
+
+
+def test_trickle_triggers_after_min_wait():
+    """零星数据：单条数据等待 min_wait_sec 后触发"""
+    controller = AdaptiveBatchController(min_wait_sec=0.5, target_latency_sec=2.0)
+    controller.observe_arrivals(1, 10.0)
+    assert controller.batch_size == 1
+    assert controller.max_wait == 0.5
+    assert controller.should_trigger(1, 0.0) is not None
+    assert controller.should_trigger(0, 10.0) is None
+
+
+def test_burst_raises_batch_size():
+    """突发：批量随到达速率增大，不超过上限"""
+    controller = AdaptiveBatchController(max_batch=500, target_latency_sec=2.0, smoothing=1.0)
+    controller.observe_arrivals(100, 0.5)
+    assert controller.batch_size == 400
+    assert controller.should_trigger(100, 0.5) is None
+    assert controller.should_trigger(100, 2.0) is not None
+
+    controller.observe_arrivals(1000, 0.5)
+    assert controller.batch_size == 500
+
+
+def test_overload_and_processor_lag_grow_batches():
+    """清洗跟不上或 Processor 滞后时批量翻倍，恢复后回落"""
+    controller = AdaptiveBatchController(max_batch=1000, target_latency_sec=1.0, smoothing=1.0)
+    controller.observe_arrivals(50, 1.0)
+    controller.observe_clean(50, 2.0, now=100.0)     # 吞吐 25 条/秒 < 到达 50 条/秒
+    assert controller.batch_size == 100
+    controller.observe_clean(100, 4.0, now=104.0)
+    assert controller.batch_size == 200
+
+    controller.observe_arrivals(0, 1.0)
+    controller.observe_processor(publish_time=100.0 - 300)
+    controller.observe_clean(10, 0.01, now=105.0)
+    assert controller.processor_lag > controller.max_processor_lag_sec
+    assert controller.batch_size == 400
+    assert controller.max_wait == controller.max_wait_sec
+
+    controller.observe_processor(publish_time=106.0)
+    controller.observe_clean(10, 0.01, now=107.0)
+    assert controller.batch_size == 200
+
+
+def test_empty_cleans_do_not_create_processor_lag():
+    """全部去重、没有写入时不更新最近输出时间，Processor 不发布也不算滞后"""
+    controller = AdaptiveBatchController(target_latency_sec=1.0, smoothing=1.0)
+    controller.observe_clean(10, 0.01, now=100.0, written=10)
+    controller.observe_processor(publish_time=101.0)
+    controller.observe_clean(10, 0.01, now=500.0, written=0)
+    controller.observe_processor(publish_time=101.0)
+    assert controller.last_output_time == 100.0
+    assert controller.processor_lag == 0.0
+    assert controller.boost == 0
@@ -0,0 +1,79 @@
+"""
+阻塞消费器单元测试
+验证补齐一批时的命令数受队列现有数据量限制，取出顺序与处理列表一致，不依赖 Redis
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.queue_monitor import BlockingQueueConsumer
+
+
+class MemoryClient:
+    """只实现 _drain / _pending 用到的列表命令，并记录 LMOVE 次数"""
+
+    def __init__(self, items):
+        self.lists = {'data_queue': list(items)}
+        self.moves = 0
+
+    def pipeline(self, transaction=True):
+        return MemoryPipeline(self)
+
+    def llen(self, key):
+        return len(self.lists.get(key, []))
+
+    def lrange(self, key, start, end):
+        items = self.lists.get(key, [])
+        return items[start:] if end == -1 else items[start:end + 1]
+
+    def lmove(self, src, dst, wherefrom, whereto):
+        self.moves += 1
+        source = self.lists.get(src, [])
+        if not source:
+            return None
+        item = source.pop()
+        self.lists.setdefault(dst, []).insert(0, item)
+        return item
+
+
+class MemoryPipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def lmove(self, *args):
+        self.calls.append(args)
+
+    def execute(self):
+        return [self.client.lmove(*args) for args in self.calls]
+
+
+def _consumer(client):
+    consumer = BlockingQueueConsumer.__new__(BlockingQueueConsumer)
+    consumer.client = client
+    consumer.queue_name = 'data_queue'
+    consumer.processing_key = 'processing:w1'
+    consumer.use_blmove = True
+    return consumer
+
+
+def test_drain_is_capped_by_queue_length():
+    """队列只有 1 条时只发送 1 条 LMOVE，而不是 max_batch - 1 条"""
+    client = MemoryClient(['b'])
+    client.lists['processing:w1'] = ['a']
+    consumer = _consumer(client)
+    assert consumer._drain(199) == 1
+    assert client.moves == 1
+    assert consumer._pending() == ['a', 'b']
+    assert consumer._drain(199) == 0
+    assert client.moves == 1
+
+
+def test_drain_moves_in_chunks_up_to_limit():
+    items = [f'item{i}' for i in range(250)]
+    client = MemoryClient(reversed(items))
+    consumer = _consumer(client)
+    assert consumer._drain(199) == 199
+    assert consumer._pending() == items[:199]
+    assert client.llen('data_queue') == 51
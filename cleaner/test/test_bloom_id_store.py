@@ -0,0 +1,77 @@
+"""
+可扩展布隆过滤器 ID 存储单元测试
+验证批量读写、按层扩容、从旧 SET 迁移，以及配置变化后仍按建立时的参数查询（使用 fakeredis）
+"""
+import logging
+import sys
+from pathlib import Path
+
+import fakeredis
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.dedup_store import ScalableBloomIdStore
+
+IDS = [f"post_{i}" for i in range(250)]
+
+
+def _client():
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+def test_add_and_contains_many():
+    """已写入的 ID 不漏判，未写入的 ID 误判很少；传入 pipeline 时由调用方执行"""
+    client = _client()
+    store = ScalableBloomIdStore(client, 'ids', error_rate=0.01, initial_capacity=1000)
+    assert store.contains_many(IDS) == [False] * len(IDS)
+
+    pipe = client.pipeline()
+    store.add_many(IDS, pipe)
+    assert not any(store.contains_many(IDS[:10]))
+    pipe.execute()
+
+    assert all(store.contains_many(IDS))
+    assert sum(store.contains_many([f"comment_{i}" for i in range(1000)])) < 30
+    assert store.get_status()['count'] == len(IDS)
+
+
+def test_layers_grow_when_full():
+    """当前层写满后追加 growth 倍容量的新层，旧层中的 ID 仍能查到"""
+    store = ScalableBloomIdStore(_client(), 'ids', error_rate=0.01, initial_capacity=100, growth=2)
+    store.add_many(IDS)
+
+    assert [layer['capacity'] for layer in store.layers] == [100, 200]
+    assert [layer['count'] for layer in store.layers] == [100, 150]
+    assert all(store.contains_many(IDS))
+    assert store.get_status()['layers'] == 2
+
+
+def test_reopen_with_changed_config_uses_stored_params(caplog):
+    """配置改变后按 meta 中建立时的参数计算层，已有 ID 不会全部变成新数据"""
+    client = _client()
+    ScalableBloomIdStore(client, 'ids', error_rate=0.01, initial_capacity=100).add_many(IDS)
+
+    reopened = ScalableBloomIdStore(client, 'ids', error_rate=0.001, initial_capacity=1000)
+    with caplog.at_level(logging.WARNING):
+        assert all(reopened.contains_many(IDS))
+    assert (reopened.error_rate, reopened.initial_capacity) == (0.01, 100)
+    assert '已按' in caplog.text
+
+    # 继续写入也沿用已有参数
+    reopened.add_many(['post_new'])
+    assert all(reopened.contains_many(IDS + ['post_new']))
+
+
+def test_migrates_legacy_set():
+    """过滤器为空且存在旧 SET 时导入全部 ID，可选删除旧 SET"""
+    client = _client()
+    client.sadd('ids', *IDS)
+
+    store = ScalableBloomIdStore(client, 'ids', error_rate=0.01, initial_capacity=100, drop_legacy_set=True)
+    assert all(store.contains_many(IDS))
+    assert store.get_status()['count'] == len(IDS)
+    assert not client.exists('ids')
+
+    # 已迁移的过滤器再次打开时不会重复导入
+    client.sadd('ids', 'post_late')
+    assert ScalableBloomIdStore(client, 'ids').contains_many(['post_late']) == [False]
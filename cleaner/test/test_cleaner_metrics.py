@@ -0,0 +1,46 @@
+"""
+清洗器运行指标单元测试
+验证来源提取、进程内累加与快照格式，不依赖 Redis
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.cleaner_metrics import CleanerMetrics, source_of, format_snapshot
+
+
+def test_source_of_dict_and_raw_json():
+    """字典直接取 source，原始 JSON 用正则提取"""
+    assert source_of({'source': 'rss'}) == 'rss'
+    assert source_of('{"text": "hi", "source": "reddit_comment"}') == 'reddit_comment'
+    assert source_of('not json') == 'unknown'
+    assert source_of({'source': ''}) == 'unknown'
+
+
+def test_counters_accumulate_without_client():
+    """无 Redis 客户端时只在进程内累加，flush 清空本批增量"""
+    metrics = CleanerMetrics(client=None)
+    metrics.accept('rss', 3)
+    metrics.discard('rss', 'duplicate')
+    metrics.add_stage('parse', 0.5, 10)
+    metrics.add_stage('parse', 0.25, 5)
+    assert metrics.discarded['rss:duplicate'] == 1
+    assert metrics.stage_items['parse'] == 15
+
+    metrics.flush()
+    assert not metrics.accepted and not metrics.stage_seconds
+    assert metrics.stage_summary() == 'parse 0.75s'
+
+
+def test_format_snapshot():
+    """快照文本包含速率、计数与阶段耗时"""
+    text = format_snapshot({
+        'accepted': {'rss': 2},
+        'discarded': {'rss:invalid': 1},
+        'stages': {'clean': {'seconds': 0.2, 'items': 2, 'us_per_item': 100000.0}},
+        'rate': {'window_sec': 10, 'accepted_per_sec': 0.2, 'discarded_per_sec': 0.1},
+    })
+    assert 'accepted 0.2/s' in text
+    assert 'rss:invalid=1' in text
+    assert 'clean 0.2s (100000.0us/item)' in text
@@ -0,0 +1,59 @@
+"""
+多进程清洗池单元测试
+验证子进程的 ID 生成与清洗结果与单进程一致，不依赖 Redis
+"""
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.cleaning_pool import CleaningPool
+from services.record_cleaner import identify_records, clean_records, prepare_records
+
+RAW_ITEMS = [
+    json.dumps({'source': 'reddit', 'id': 'abc', 'text': '  Hello   <b>world</b> ', 'created_utc': 1700000000}),
+    json.dumps({'source': 'reddit', 'post_id': 'p1', 'comment_id': 'c1', 'text': 'nice'}),
+    json.dumps({'source': 'newsapi', 'url': 'https://example.com/a', 'title': 'Fed holds rates'}),
+    json.dumps({'source': 'newsapi', 'title': ''}),
+    'not json',
+]
+
+
+def test_from_config_disables_single_worker():
+    """workers 不大于 1 时不创建清洗池"""
+    assert CleaningPool.from_config({'workers': 1}) is None
+    assert CleaningPool.from_config({}) is None
+    assert CleaningPool.from_config({'workers': 3}).workers == 3
+
+
+def test_pool_matches_serial():
+    """子进程结果与进程内结果一致，且保持输入顺序"""
+    pool = CleaningPool(workers=2, parallel_threshold=1, chunk_size=2)
+    try:
+        prepared = pool.prepare(RAW_ITEMS)
+        assert len(prepared) == len(RAW_ITEMS)
+        item_ids = [item_id for item_id, _ in prepared]
+        assert item_ids == identify_records(RAW_ITEMS)
+        assert item_ids == ['post_abc', 'comment_c1', item_ids[2], None, None]
+        assert [record for _, record in prepared[3:]] == [None, None]
+
+        # 每条数据在一个任务内完成 ID 生成与清洗，结果与两阶段串行处理一致
+        pairs = list(zip(item_ids[:3], RAW_ITEMS[:3]))
+        cleaned = [record for _, record in prepared[:3]]
+        serial = clean_records(pairs)
+        volatile = ('timestamp', 'cleaned_at', 'created_at')
+        assert [{k: v for k, v in c.items() if k not in volatile} for c in cleaned] == \
+               [{k: v for k, v in c.items() if k not in volatile} for c in serial]
+        assert [c['id'] for c in cleaned] == item_ids[:3]
+        assert cleaned[0]['text'] == 'Hello world'
+        assert cleaned[0]['created_at'] == '2023-11-14T22:13:20Z'
+    finally:
+        pool.shutdown()
+
+
+def test_prepare_records_reports_clean_errors():
+    """清洗出错的数据保留 ID，清洗结果为 None"""
+    raw = json.dumps({'source': 'reddit', 'id': 'abc', 'text': 'ok', 'created_utc': 1700000000})
+    assert prepare_records([raw])[0][0] == 'post_abc'
+    assert prepare_records([raw], tokenizer=object())[0] == ('post_abc', None)
@@ -0,0 +1,61 @@
+"""
+列式清洗单元测试
+验证 Arrow 字符串内核的验证与文本清洗结果和逐条清洗逐字节相同，不依赖 Redis
+"""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.columnar_cleaner import ARROW_AVAILABLE, clean_records_columnar, validate_records
+from services.record_cleaner import clean_record, validate_record
+
+pytestmark = pytest.mark.skipif(not ARROW_AVAILABLE, reason="需要 pyarrow")
+
+# 运行时间相关的字段（两次清洗之间会变化）
+VOLATILE_FIELDS = ('timestamp', 'cleaned_at')
+
+RECORDS = [
+    {'id': 1, 'source': 'rss', 'title': '  Fed <b>holds</b>\n\nrates ', 'content': '<p>Full\tstory</p>',
+     'created_at': '2025-11-02T14:00:00Z', 'url': 'https://example.com/a'},
+    {'id': 2, 'source': 'reddit', 'text': '　全角　空白\xa0与\x85NEL 分隔 ', 'score': 5,
+     'created_at': 1762092000},
+    {'id': 3, 'source': 'stocktwits', 'text': 'a <unclosed tag and > stray <', 'symbols': ['TSLA'],
+     'created_at': '2025-11-02 14:05:00'},
+    {'id': 4, 'source': 'newsapi', 'title': 12345, 'text': '', 'content': None, 'created_at': '2025-11-02T14:00:00Z'},
+    {'id': 5, 'source': 'rss', 'text': '<a\nhref="x">multi\nline</a>\x1c\x1f end', 'created_at': '2025-11-02T14:00:00Z'},
+]
+
+
+def _stable(record):
+    return json.dumps({k: v for k, v in record.items() if k not in VOLATILE_FIELDS}, ensure_ascii=False)
+
+
+def test_validate_matches_scalar():
+    """整列验证与逐条验证结果相同"""
+    records = RECORDS + [
+        {'source': 'rss', 'text': '  \t '},
+        {'source': '', 'text': 'no source'},
+        {'source': 'rss', 'title': ['  ']},
+        {'source': 'rss'},
+    ]
+    assert validate_records(records) == [validate_record(data) for data in records]
+
+
+def test_clean_matches_scalar_byte_for_byte():
+    """列式清洗的输出（除运行时间字段外）与逐条清洗逐字节相同"""
+    items = [(f"post_{data['id']}", data) for data in RECORDS]
+    columnar = clean_records_columnar(items)
+    for (item_id, data), result in zip(items, columnar):
+        assert _stable(result) == _stable(clean_record(data, item_id))
+
+
+def test_unencodable_text_falls_back_to_scalar():
+    """孤立代理字符无法编码为 UTF-8 时回退到逐条处理"""
+    data = {'id': 9, 'source': 'rss', 'text': 'bad \ud800  surrogate', 'created_at': '2025-11-02T14:00:00Z'}
+    assert validate_records([data]) == [True]
+    result = clean_records_columnar([('post_9', data)])[0]
+    assert _stable(result) == _stable(clean_record(data, 'post_9'))
@@ -0,0 +1,100 @@
+"""
+导出恢复单元测试
+验证导出文件匹配、保留窗口过滤、按时间顺序写入与重复执行不重复写入，不依赖 Redis
+"""
+import calendar
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.export_restore import find_export_files, restore_exports
+
+
+class MemoryClient:
+    """只实现恢复用到的列表 / 集合命令"""
+
+    def __init__(self):
+        self.lists = {}
+        self.sets = {}
+
+    def pipeline(self, transaction=True):
+        return MemoryPipeline(self)
+
+    def type(self, key):
+        return 'set' if key in self.sets else 'none'
+
+    def lpush(self, key, *values):
+        for value in values:
+            self.lists.setdefault(key, []).insert(0, value)
+
+    def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+
+    def smismember(self, key, members):
+        return [int(m in self.sets.get(key, set())) for m in members]
+
+
+class MemoryPipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        def call(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+        return call
+
+    def execute(self):
+        results = [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+        self.calls = []
+        return results
+
+
+NOW = calendar.timegm((2025, 11, 2, 14, 30, 0, 0, 0, 0))
+
+
+def _write(path, records):
+    path.write_text(''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in records), encoding='utf-8')
+
+
+def test_find_export_files_orders_segments(tmp_path):
+    """按日期与分段号排序，忽略其他文件"""
+    for name in ['cleaned_2025-11-02.1.jsonl', 'cleaned_2025-11-02.jsonl', 'cleaned-w1_2025-11-01.jsonl',
+                 'cleaned_2025-10-30.jsonl', 'notes.txt', 'cleaned_2025-11-02.jsonl.tmp']:
+        (tmp_path / name).write_text('', encoding='utf-8')
+
+    names = [p.name for p in find_export_files(tmp_path, since_date='2025-11-01')]
+    assert names == ['cleaned-w1_2025-11-01.jsonl', 'cleaned_2025-11-02.jsonl', 'cleaned_2025-11-02.1.jsonl']
+
+
+def test_restore_in_time_order_and_idempotent(tmp_path):
+    """过期数据跳过，后写入的覆盖先写入的，最新数据在队列头部，重复执行不重复写入"""
+    hour = 3600
+    _write(tmp_path / 'cleaned_2025-11-01.jsonl', [
+        {'id': 'old', 'source': 'rss', 'created_ts': NOW - 30 * hour},
+        {'id': 'b', 'source': 'rss', 'created_ts': NOW - 2 * hour, 'title': 'first'},
+    ])
+    _write(tmp_path / 'cleaned_2025-11-02.jsonl', [
+        {'id': 'c', 'source': 'reddit', 'created_at': '2025-11-02T14:00:00Z'},
+        {'id': 'a', 'source': 'rss', 'created_ts': NOW - 5 * hour},
+        {'id': 'b', 'source': 'rss', 'created_ts': NOW - 2 * hour, 'title': 'second'},
+    ])
+    with open(tmp_path / 'cleaned_2025-11-02.jsonl', 'a', encoding='utf-8') as f:
+        f.write('not json\n')
+
+    client = MemoryClient()
+    files = find_export_files(tmp_path)
+    stats = restore_exports(client, 'clean_data_queue', 'set:cleaned_ids', files, batch_size=2, now=NOW)
+
+    assert (stats['lines'], stats['expired'], stats['invalid'], stats['superseded']) == (6, 1, 1, 1)
+    assert stats['restored'] == 3
+    queue = [json.loads(raw) for raw in client.lists['clean_data_queue']]
+    assert [r['id'] for r in queue] == ['c', 'b', 'a']
+    assert queue[1]['title'] == 'second'
+    assert client.sets['set:cleaned_ids'] == {'a', 'b', 'c'}
+
+    again = restore_exports(client, 'clean_data_queue', 'set:cleaned_ids', files, now=NOW)
+    assert (again['restored'], again['existing']) == (0, 3)
+    assert len(client.lists['clean_data_queue']) == 3
@@ -0,0 +1,44 @@
+"""
+追加导出单元测试
+验证分段滚动与往日分段合并
+"""
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.export_writer import JsonlExporter
+
+
+def _line(item_id, text='x'):
+    return json.dumps({'id': item_id, 'text': text})
+
+
+def test_append_rotates_by_size(tmp_path):
+    """超过大小上限后滚动到新分段，已有内容不被重写"""
+    exporter = JsonlExporter(tmp_path, max_bytes=50)
+    first = exporter.append([_line('a'), _line('b')], date='2024-01-01')
+    second = exporter.append([_line('c')], date='2024-01-01')
+
+    assert first.endswith('cleaned_2024-01-01.jsonl')
+    assert second.endswith('cleaned_2024-01-01.1.jsonl')
+    assert len(Path(first).read_text().splitlines()) == 2
+    assert exporter.append([], date='2024-01-01') is None
+
+
+def test_consolidate_merges_past_days_only(tmp_path):
+    """往日分段合并为单个文件并按 id 去重，当天的分段保留"""
+    exporter = JsonlExporter(tmp_path, max_bytes=1)
+    exporter.append([_line('a'), _line('b')], date='2024-01-01')
+    exporter.append([_line('b', 'updated'), _line('c')], date='2024-01-01')
+    exporter.append([_line('d')], date='2024-01-02')
+    exporter.append([_line('e')], date='2024-01-02')
+
+    assert exporter.consolidate(today='2024-01-02') == 1
+
+    names = sorted(p.name for p in tmp_path.iterdir())
+    assert names == ['cleaned_2024-01-01.jsonl', 'cleaned_2024-01-02.1.jsonl', 'cleaned_2024-01-02.jsonl']
+    records = [json.loads(l) for l in (tmp_path / 'cleaned_2024-01-01.jsonl').read_text().splitlines()]
+    assert [r['id'] for r in records] == ['a', 'b', 'c']
+    assert records[1]['text'] == 'updated'
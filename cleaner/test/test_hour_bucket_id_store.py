@@ -0,0 +1,71 @@
+"""
+小时分桶 ID 存储单元测试
+验证桶键命名、EXPIREAT、跨整点的 window+1 个桶查询与旧 ZSET 迁移（使用 fakeredis，时间固定）
+"""
+import calendar
+import sys
+import time
+from pathlib import Path
+
+import fakeredis
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.dedup_store import HourBucketIdStore
+
+# 2025-11-02T14:30:00Z
+NOW = calendar.timegm((2025, 11, 2, 14, 30, 0))
+HOUR = 3600
+HOUR_START = NOW - 30 * 60
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """可拨动的时钟（只影响存储计算的小时桶，过期时间直接检查 EXPIRETIME）"""
+    state = {'now': float(NOW)}
+    monkeypatch.setattr(time, 'time', lambda: state['now'])
+    return state
+
+
+def test_bucket_naming_and_expireat(clock):
+    """写入当前 UTC 小时桶 {key}:YYYYMMDDHH，EXPIREAT 为整点 + (window + 1) 小时"""
+    client = fakeredis.FakeRedis(decode_responses=True)
+    store = HourBucketIdStore(client, 'ids', window_hours=24)
+    store.add_many(['a', 'b'])
+
+    assert client.smembers('ids:2025110214') == {'a', 'b'}
+    assert client.expiretime('ids:2025110214') == HOUR_START + 25 * HOUR
+    assert store.entry_expiry() == HOUR_START + 25 * HOUR
+
+
+def test_lookup_spans_window_plus_one_buckets(clock):
+    """跨整点后仍能查到上一小时的 ID；整点起算超过 window 小时的桶不再查询"""
+    client = fakeredis.FakeRedis(decode_responses=True)
+    store = HourBucketIdStore(client, 'ids', window_hours=24)
+    store.add_many(['a'])
+
+    clock['now'] = NOW + 40 * 60                      # 15:10，跨过整点
+    store.add_many(['b'])
+    assert client.exists('ids:2025110215')
+    assert store.contains_many(['a', 'b', 'c']) == [True, True, False]
+    assert len(store._active_buckets()) == 25
+
+    clock['now'] = HOUR_START + 24 * HOUR + 59 * 60    # 次日 14:59，14 点桶仍在窗口内
+    assert store.contains_many(['a', 'b']) == [True, True]
+
+    clock['now'] = HOUR_START + 25 * HOUR              # 次日 15:00，14 点桶退出窗口（即使尚未被 Redis 删除）
+    assert store.contains_many(['a', 'b']) == [False, True]
+
+
+def test_migrates_legacy_zset(clock):
+    """旧版本单个 ZSET 中仍在窗口内的 ID 按写入时间迁移到对应小时桶，过旧的丢弃"""
+    client = fakeredis.FakeRedis(decode_responses=True)
+    client.zadd('ids', {'old': NOW - 30 * HOUR, 'recent': NOW - 2 * HOUR, 'current': NOW})
+
+    store = HourBucketIdStore(client, 'ids', window_hours=24)
+    assert store.contains_many(['old', 'recent', 'current']) == [False, True, True]
+    assert client.type('ids') == 'none'
+    assert client.smembers('ids:2025110212') == {'recent'}
+    assert client.expiretime('ids:2025110212') == HOUR_START - 2 * HOUR + 25 * HOUR
+    assert client.smembers('ids:2025110214') == {'current'}
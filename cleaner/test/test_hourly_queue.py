@@ -0,0 +1,112 @@
+"""
+按小时分区队列单元测试
+验证分桶键名、整小时过期删除与读取顺序，不依赖 Redis
+"""
+import calendar
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from utils.hourly_queue import HourlyQueue, hour_key, hour_start, index_key
+
+
+class MemoryClient:
+    """只实现 HourlyQueue 用到的列表 / 有序集合命令"""
+
+    def __init__(self):
+        self.lists = {}
+        self.zsets = {}
+
+    def pipeline(self, transaction=True):
+        return MemoryPipeline(self)
+
+    def lpush(self, key, *values):
+        for value in values:
+            self.lists.setdefault(key, []).insert(0, value)
+
+    def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    def expireat(self, key, when):
+        pass
+
+    def zrangebyscore(self, key, low, high):
+        low = float(low)
+        high = float(high)
+        members = self.zsets.get(key, {})
+        return [m for m, score in sorted(members.items(), key=lambda kv: kv[1]) if low <= score <= high]
+
+    def lrange(self, key, start, end):
+        items = self.lists.get(key, [])
+        return items[start:] if end == -1 else items[start:end + 1]
+
+    def llen(self, key):
+        return len(self.lists.get(key, []))
+
+    def delete(self, *keys):
+        for key in keys:
+            self.lists.pop(key, None)
+
+    def zrem(self, key, *members):
+        for member in members:
+            self.zsets.get(key, {}).pop(member, None)
+
+
+class MemoryPipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        def call(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+        return call
+
+    def execute(self):
+        results = [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+        self.calls = []
+        return results
+
+
+def _ts(hour, minute=0):
+    return calendar.timegm((2025, 11, 2, hour, minute, 0, 0, 0, 0))
+
+
+def test_hour_key_layout():
+    """键名按 UTC 小时分桶"""
+    assert hour_start(_ts(14, 59)) == _ts(14)
+    assert hour_key("clean_data_queue", _ts(14)) == "clean_data_queue:2025110214"
+    assert index_key("clean_data_queue") == "clean_data_queue:hours"
+
+
+def test_push_read_and_drop():
+    """写入按小时分组，读取最新小时在前，过期清理只删除整小时早于下界的列表"""
+    client = MemoryClient()
+    queue = HourlyQueue(client, "q")
+
+    pipe = client.pipeline()
+    queue.push(pipe, [(_ts(12, 10), "a"), (_ts(13, 5), "b"), (_ts(13, 50), "c"), (_ts(14, 1), "d")])
+    pipe.execute()
+
+    assert queue.hour_keys() == ["q:2025110212", "q:2025110213", "q:2025110214"]
+    assert queue.read() == ["d", "c", "b", "a"]
+    assert queue.read(since=_ts(13, 30)) == ["d", "c", "b"]
+    assert queue.length() == 4
+
+    # 下界 14:00：12 点与 13 点整小时早于下界
+    assert queue.drop_before(_ts(14)) == {'hours': 2, 'removed': 3}
+    assert queue.hour_keys() == ["q:2025110214"]
+    assert "q:2025110213" not in client.lists
+
+    # 下界不是整点时，所在小时仍保留
+    assert queue.drop_before(_ts(14, 30)) == {'hours': 0, 'removed': 0}
+    assert queue.read() == ["d"]
+
+
+def test_from_config_defaults_to_list():
+    """未配置或配置为 list 时不启用小时分区"""
+    client = MemoryClient()
+    assert HourlyQueue.from_config(client, "q", None) is None
+    assert HourlyQueue.from_config(client, "q", {'layout': 'list'}) is None
+    assert HourlyQueue.from_config(client, "q", {'layout': 'hourly', 'ttl_hours': 26}).ttl_hours == 26
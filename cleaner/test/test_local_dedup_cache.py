@@ -0,0 +1,55 @@
+"""
+本地去重缓存单元测试
+验证 LRU / 布隆过滤器的判定逻辑，不依赖 Redis
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.local_dedup_cache import LRUIdCache, BloomFilter, LocalDedupCache
+
+
+def test_lru_evicts_oldest_and_expires():
+    """LRU 超出容量淘汰最旧 ID，过期 ID 不再命中"""
+    lru = LRUIdCache(max_size=2)
+    now = time.time()
+    lru.put('a')
+    lru.put('b', expires_at=now - 1)
+    lru.put('c')
+
+    assert not lru.get('a', now)      # 被淘汰
+    assert not lru.get('b', now)      # 已过期
+    assert lru.get('c', now)
+
+
+def test_bloom_has_no_false_negatives():
+    """布隆过滤器不会漏判已添加的元素"""
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"post_{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"comment_{i}" in bloom for i in range(1000))
+    assert false_positives < 50
+
+
+def test_lookup_tiers():
+    """LRU 命中判重复，布隆未命中判新数据，其余交给 Redis"""
+    cache = LocalDedupCache(lru_size=10, bloom_capacity=100)
+    assert cache.lookup('post_1') is None          # 布隆过滤器尚未构建
+
+    cache.rebuild(['post_1', 'post_2'], count_hint=2)
+    assert cache.lookup('post_3') is False         # 一定未清洗
+    assert cache.lookup('post_1') is None          # 可能存在，需要查 Redis
+
+    cache.record('post_1')
+    assert cache.lookup('post_1') is True
+
+    stats = cache.get_stats()
+    assert stats['lookups'] == 4
+    assert stats['lru_hits'] == 1
+    assert stats['bloom_negatives'] == 1
+    assert stats['redis_lookups'] == 2
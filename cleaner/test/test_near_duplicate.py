@@ -0,0 +1,86 @@
+"""
+近似重复检测单元测试
+验证 SimHash 签名与 LSH 分段，以及基于 fakeredis 的索引读写
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.near_duplicate import (
+    NearDuplicateDetector, simhash64, hamming_distance, band_fields, _tokens
+)
+
+TITLE = "Federal Reserve holds interest rates steady as inflation cools and markets rally"
+
+
+def test_signature_ignores_case_and_punctuation():
+    """大小写、标点与空白差异不影响签名"""
+    detector = NearDuplicateDetector(client=None, min_tokens=6)
+    a = detector.signature({'title': TITLE})
+    b = detector.signature({'title': TITLE.upper() + '!!', 'text': 'different summary'})
+    assert a == b
+    assert detector.signature({'title': 'too short'}) is None
+
+
+def test_lsh_bands_share_a_band_within_distance():
+    """海明距离不超过 3 时至少有一段相同"""
+    signature = simhash64(_tokens(TITLE))
+    flipped = signature ^ (1 << 1) ^ (1 << 20) ^ (1 << 40)
+    assert hamming_distance(signature, flipped) == 3
+    assert set(band_fields(signature)) & set(band_fields(flipped))
+
+    other = simhash64(_tokens("Apple unveils new iPhone with satellite messaging and longer battery life"))
+    assert hamming_distance(signature, other) > 3
+
+
+def test_source_overrides():
+    """来源可单独关闭或改变处理方式"""
+    detector = NearDuplicateDetector(client=None, action='mark', source_overrides={
+        'reddit_comment': {'enabled': False},
+        'rss': {'action': 'drop'},
+    })
+    assert detector._settings('reddit_comment') is None
+    assert detector._settings('rss') == ('drop', 3)
+    assert detector._settings('twitter') == ('mark', 3)
+
+
+def _record(item_id, title, source='rss'):
+    return {'id': item_id, 'source': source, 'title': title}
+
+
+def test_check_many_uses_per_band_lists():
+    """索引按段值存放为列表，后续批次与同批次的近似重复都能识别"""
+    import fakeredis
+    client = fakeredis.FakeRedis(decode_responses=True)
+    detector = NearDuplicateDetector(client, bucket_size=2)
+
+    assert detector.check_many([
+        _record('a', TITLE),
+        _record('b', TITLE + '!'),
+    ]) == [None, ('mark', 'a')]
+
+    keys = client.keys('near_dup:*')
+    assert len(keys) == 4
+    assert all(client.type(key) == 'list' and client.ttl(key) > 24 * 3600 for key in keys)
+
+    assert detector.check_many([_record('c', TITLE.lower())]) == [('mark', 'a')]
+
+
+def test_concurrent_writers_do_not_overwrite_each_other():
+    """两个 Worker 读取索引后各自提交写入同一段值时，两条签名都保留在索引中"""
+    import fakeredis
+    client = fakeredis.FakeRedis(decode_responses=True)
+    worker_a = NearDuplicateDetector(client)
+    worker_b = NearDuplicateDetector(client)
+
+    pipe_a = client.pipeline(transaction=True)
+    pipe_b = client.pipeline(transaction=True)
+    assert worker_a.check_many([_record('a', TITLE)], pipe_a) == [None]
+    assert worker_b.check_many([_record('b', TITLE + '!')], pipe_b) == [None]
+    pipe_a.execute()
+    pipe_b.execute()
+
+    for key in client.keys('near_dup:*'):
+        assert [entry[-4:] for entry in client.lrange(key, 0, -1)] == ['"a"]', '"b"]']
+    assert NearDuplicateDetector(client).check_many([_record('c', TITLE + '.')]) == [('mark', 'a')]
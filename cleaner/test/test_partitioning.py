@@ -0,0 +1,56 @@
+"""
+输入分区单元测试
+验证分区号稳定，且同一去重 ID 的数据总是分发到同一分区，不依赖 Redis
+"""
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.partitioning import PartitionRouter, partition_of, partition_key
+
+
+class RecordingPipeline:
+    """只记录 LPUSH 的 pipeline"""
+
+    def __init__(self, pushed):
+        self.pushed = pushed
+
+    def lpush(self, key, value):
+        self.pushed.append((key, value))
+
+    def execute(self):
+        pass
+
+
+class RecordingClient:
+    def __init__(self):
+        self.pushed = []
+
+    def pipeline(self):
+        return RecordingPipeline(self.pushed)
+
+
+def test_partition_of_is_stable_and_in_range():
+    """CRC32 分区号与进程无关，且覆盖全部分区"""
+    assert partition_of('post_abc', 4) == partition_of('post_abc', 4)
+    indexes = {partition_of(f"post_{i}", 4) for i in range(100)}
+    assert indexes == {0, 1, 2, 3}
+    assert partition_key('data_queue', 2) == 'data_queue:part:2'
+
+
+def test_router_sends_same_id_to_same_partition():
+    """同一 ID 的重复数据分发到同一分区，无效数据也会被分发"""
+    client = RecordingClient()
+    router = PartitionRouter(client, 'data_queue', 3)
+    items = [json.dumps({'source': 'x', 'id': i % 5 + 1, 'text': f'copy {i}'}) for i in range(20)]
+    items.append('not json')
+    router.route(items)
+
+    assert len(client.pushed) == 21
+    assert router.routed == 21
+    partitions = {}
+    for key, raw in client.pushed[:-1]:
+        partitions.setdefault(json.loads(raw)['id'], set()).add(key)
+    assert all(len(keys) == 1 for keys in partitions.values())
@@ -0,0 +1,117 @@
+"""
+输入队列游标单元测试
+验证按写入计数定位新数据，头部重复写入相同内容时不漏读，不依赖 Redis
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.queue_cursor import QueueCursor
+
+
+class MemoryClient:
+    """只实现游标用到的列表 / 字符串 / 哈希命令（LPUSH 同时递增写入计数，与 Scraper 一致）"""
+
+    def __init__(self, count_pushes=True):
+        self.items = []
+        self.pushed = 0 if count_pushes else None
+        self.hashes = {}
+
+    def push(self, *values):
+        for value in values:
+            self.items.insert(0, value)
+            if self.pushed is not None:
+                self.pushed += 1
+
+    def trim(self, keep):
+        del self.items[keep:]
+
+    def pipeline(self, transaction=True):
+        return MemoryPipeline(self)
+
+    def llen(self, key):
+        return len(self.items)
+
+    def lindex(self, key, index):
+        return self.items[index] if -len(self.items) <= index < len(self.items) else None
+
+    def lrange(self, key, start, end):
+        return self.items[start:end + 1]
+
+    def get(self, key):
+        return None if self.pushed is None else str(self.pushed)
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update({k: str(v) for k, v in mapping.items()})
+
+    def delete(self, key):
+        self.hashes.pop(key, None)
+
+
+class MemoryPipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        def record(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+        return record
+
+    def execute(self):
+        return [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+def _pass(cursor):
+    """模拟一轮清洗：计算新数据条数并保存位置"""
+    queue_length, head, pushed = cursor.snapshot()
+    pending = cursor.new_item_count(queue_length, head, pushed)
+    cursor.save(queue_length, head, pushed)
+    return pending
+
+
+def test_counter_survives_repushed_head_and_trim():
+    """头部被再次写入相同内容、尾部被修剪时，新数据条数仍然准确"""
+    client = MemoryClient()
+    cursor = QueueCursor(client, client, 'data_queue', 'cursor:data_queue')
+    client.push('a', 'b', 'c')
+    assert _pass(cursor) == 3
+
+    client.push('x', 'y', 'c')
+    client.trim(4)
+    assert _pass(cursor) == 3
+    assert _pass(cursor) == 0
+
+    client.push(*[str(i) for i in range(10)])
+    client.trim(5)
+    assert _pass(cursor) == 5
+
+
+def test_fingerprint_fallback_checks_position_before_head():
+    """没有写入计数时：头部内容与上一轮相同但长度增加，仍按位置识别出新数据"""
+    client = MemoryClient(count_pushes=False)
+    cursor = QueueCursor(client, client, 'data_queue', 'cursor:data_queue')
+    client.push('a', 'b', 'c')
+    assert _pass(cursor) == 3
+
+    client.push('x', 'c')
+    assert _pass(cursor) == 2
+    assert _pass(cursor) == 0
+
+    # 尾部被修剪：从 新长度 - 旧长度 开始查找，跳过头部与上一轮头部相同的副本
+    client.push('y', 'z', 'c')
+    client.trim(6)
+    assert _pass(cursor) == 3
+
+
+def test_reset_reads_everything():
+    client = MemoryClient()
+    cursor = QueueCursor(client, client, 'data_queue', 'cursor:data_queue')
+    client.push('a', 'b')
+    assert _pass(cursor) == 2
+    cursor.reset()
+    assert _pass(cursor) == 2
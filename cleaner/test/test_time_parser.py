@@ -0,0 +1,45 @@
+"""
+共用时间解析模块单元测试
+验证各种时间格式统一为 (epoch, ISO)，以及格式记忆与整列解析
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import pandas as pd
+
+from utils.time_parser import TimeParser, to_utc_series
+
+
+def test_parse_formats_to_epoch_and_iso():
+    """数字、规范格式、带时区 ISO 与常见格式统一输出 UTC"""
+    parser = TimeParser()
+    assert parser.parse(1700000000) == (1700000000, '2023-11-14T22:13:20Z')
+    assert parser.parse('1700000000.5') == (1700000000, '2023-11-14T22:13:20Z')
+    assert parser.parse('2024-01-01T12:00:00Z') == (1704110400, '2024-01-01T12:00:00Z')
+    assert parser.parse('2024-01-01T20:00:00+08:00')[1] == '2024-01-01T12:00:00Z'
+    assert parser.parse('2024/01/01 12:00:00')[1] == '2024-01-01T12:00:00Z'
+    assert parser.parse('not a time') is None
+    assert parser.parse('') is None
+    assert parser.parse(None) is None
+
+
+def test_remembers_format_per_source_field():
+    """成功的格式按 (来源, 字段) 记住"""
+    parser = TimeParser()
+    parser.parse_epoch('2024/01/01 12:00:00', 'rss', 'published')
+    assert parser._formats[('rss', 'published')] == '%Y/%m/%d %H:%M:%S'
+    assert parser.parse_epoch('2024/01/02 12:00:00', 'rss', 'published') == 1704110400 + 86400
+
+
+def test_to_utc_series_prefers_epochs():
+    """整列解析：优先 epoch 列，其余按字符串解析，失败为 NaT"""
+    values = pd.Series(['2024-01-01T12:00:00Z', '2024-01-01 12:00:00', 'bad', None])
+    epochs = pd.Series([1700000000, None, None, None])
+    result = to_utc_series(values, epochs=epochs)
+
+    assert str(result.dt.tz) == 'UTC'
+    assert result[0] == pd.Timestamp('2023-11-14T22:13:20Z')
+    assert result[1] == pd.Timestamp('2024-01-01T12:00:00Z')
+    assert result[2:].isna().all()
@@ -0,0 +1,94 @@
+"""
+关注列表单元测试
+验证 Aho-Corasick 匹配（大小写、词边界、重叠词）与按版本重新编译，不依赖 Redis
+"""
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.watchlist import AhoCorasick, Watchlist
+
+
+class StubClient:
+    """只实现 GET / HGETALL 的客户端"""
+
+    def __init__(self, patterns, version="1"):
+        self.patterns = patterns
+        self.version = version
+        self.reads = 0
+
+    def get(self, key):
+        return self.version
+
+    def hgetall(self, key):
+        self.reads += 1
+        return dict(self.patterns)
+
+
+class RecordingPipeline:
+    def __init__(self):
+        self.calls = []
+
+    def xadd(self, key, fields, maxlen=None, approximate=True):
+        self.calls.append(('xadd', key, fields['data']))
+
+    def publish(self, channel, message):
+        self.calls.append(('publish', channel, message))
+
+
+def test_automaton_matches_overlapping_patterns():
+    """重叠与嵌套的词在一次扫描中全部命中"""
+    automaton = AhoCorasick(["fed rate", "rate cut", "cut", "fed rate cut", "rate hike"])
+    assert sorted(automaton.find("the fed rate cut is here")) == ["cut", "fed rate", "fed rate cut", "rate cut"]
+
+
+def test_automaton_case_and_boundaries():
+    """不区分大小写，英文词要求词边界，非字母数字开头的词不要求"""
+    automaton = AhoCorasick(["ETH", "$TSLA", "rate cut", "苹果"])
+    assert automaton.find("Ethereum rallies") == []
+    assert automaton.find("ETH/USD breaks out") == ["eth"]
+    assert automaton.find("Buying$TSLA calls") == ["$tsla"]
+    assert automaton.find("Fed signals a Rate Cut!") == ["rate cut"]
+    assert automaton.find("a rate cutter") == []
+    assert automaton.find("苹果公司发布新品") == ["苹果"]
+
+
+def test_scan_emits_alerts_and_recompiles_on_version_change():
+    """命中时 XADD + PUBLISH，版本变化后重新编译"""
+    client = StubClient({"TSLA": "特斯拉"})
+    watchlist = Watchlist(client, refresh_interval_sec=0)
+    records = [
+        {'id': 'a', 'source': 'rss', 'title': 'TSLA beats estimates', 'text': 'tsla up 10%'},
+        {'id': 'b', 'source': 'reddit', 'text': 'nothing to see'},
+    ]
+
+    pipe = RecordingPipeline()
+    assert watchlist.scan(records, pipe) == 1
+    assert [call[0] for call in pipe.calls] == ['xadd', 'publish']
+    alert = json.loads(pipe.calls[0][2])
+    assert (alert['id'], alert['pattern'], alert['label']) == ('a', 'tsla', '特斯拉')
+
+    # 版本未变化时不重新读取
+    watchlist.scan(records, RecordingPipeline())
+    assert client.reads == 1
+
+    client.patterns = {"nothing": "nothing"}
+    client.version = "2"
+    pipe = RecordingPipeline()
+    assert watchlist.scan(records, pipe) == 1
+    assert json.loads(pipe.calls[0][2])['id'] == 'b'
+
+
+def test_loads_patterns_without_version_key():
+    """版本键不存在时首次也会加载，之后直接 HSET 的修改内容变化时重新编译"""
+    client = StubClient({"TSLA": "特斯拉"}, version=None)
+    watchlist = Watchlist(client, refresh_interval_sec=0)
+    assert watchlist.refresh() is True
+    assert watchlist.match({'title': 'TSLA rallies'}) == ['tsla']
+
+    assert watchlist.refresh() is False
+    client.patterns = {"TSLA": "特斯拉", "NVDA": "英伟达"}
+    assert watchlist.refresh() is True
+    assert watchlist.match({'title': 'NVDA and TSLA'}) == ['nvda', 'tsla']
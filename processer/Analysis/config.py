@@ -3,8 +3,9 @@ CONFIG = {
     # 原有配置...
     "input_file": "input_data.csv",
     "output_file": "output_data.json",
-    "trending_keywords_count": 10,
+    "trending_keywords_count": 100,
     "word_cloud_count": 20,
+    "news_feed_count": 20,  # 新闻流条数（可设为几百条）
     
     # ⏰ 时间窗口配置
     "current_window_minutes": 60,  # 当前窗口时长（分钟）- 用于计算当前词频
@@ -13,6 +14,21 @@ CONFIG = {
     
     # 持续处理配置
     "process_interval_seconds": 60,  # 处理间隔（秒），默认1分钟
+
+    # 🔁 增量模式：常驻进程保留已预处理的 24 小时窗口，每次通知只读取、预处理新数据
+    "incremental": {
+        "enabled": True,
+        "initial_chunk": 200,       # 从队列头部读取新数据的第一块大小（遇到已处理的记录即停止）
+        "max_chunk": 5000,          # 后续块的大小上限（每块翻倍）
+        "full_resync_minutes": 60,  # 定期全量重建窗口的间隔（分钟），0=只在队列被清空时重建
+        "skip_unchanged": True      # 没有新数据也没有数据移出窗口时跳过本轮处理
+    },
+
+    # 📊 关键词环形缓冲：每个整点一个槽，记录包含各词的数据条数与情感细分
+    # 热词历史平均频率、情感分布与 24 点历史曲线直接从槽中读取（词按分词结果精确匹配，不再做子串匹配）
+    "keyword_buffer": {
+        "enabled": True
+    },
     
     # 🤖 BERT 情感预测配置
     "bert": {
@@ -35,6 +51,7 @@ CONFIG = {
         
         # 💡 队列名配置
         "input_queue": "clean_data_queue",    # 从 Cleaner 的输出队列读取
+        "input_layout": "list",               # 与 Cleaner 的 redis.queue_out_layout.layout 一致："list" | "hourly"（只读取历史窗口内的小时列表）
         "output_prefix": "processed_data",    # 输出键的前缀
         
         # 💡 通知监听配置（从 Cleaner 接收）
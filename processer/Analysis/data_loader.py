@@ -1,9 +1,22 @@
 import json
+import sys
+import time
 import redis
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
 from config import CONFIG
+from window_state import record_key
+
+# 仓库根目录（Cleaner 与 Processor 共用的 utils 模块）
+REPO_ROOT = str(Path(__file__).resolve().parent.parent.parent)
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from utils.time_parser import to_utc_series
+from utils.text_tokenizer import SOURCE_TEXT_FIELDS, TextTokenizer, clean_text, source_text
+from utils.hourly_queue import HourlyQueue, hour_start, HOUR_SECONDS
 
 # 导入 BERT 预测器（延迟加载，避免启动失败）
 try:
@@ -19,6 +32,7 @@ class DataLoader:
 
     def __init__(self):
         self.config = CONFIG
+        self.tokenizer = TextTokenizer(self.config['stop_words'])
         self._init_redis()
 
     def _init_redis(self):
@@ -51,6 +65,9 @@ class DataLoader:
         queue_name = self.config["redis"]["input_queue"]
         data_list = []
         
+        if self.config["redis"].get("input_layout", "list") == "hourly":
+            return self._load_hourly_from_redis(queue_name)
+        
         try:
             # 统计初始队列长度
             initial_queue_len = self.redis_client.llen(queue_name)
@@ -89,6 +106,107 @@ class DataLoader:
             print(f"❌ 从 Redis 读取数据失败: {e}")
             return pd.DataFrame()
 
+    def _load_hourly_from_redis(self, queue_name: str) -> pd.DataFrame:
+        """
+        从按小时分区的队列读取历史窗口内的数据（只读取需要的小时列表，不删除）
+        
+        Args:
+            queue_name: 队列名（小时列表为 {queue_name}:YYYYMMDDHH）
+            
+        Returns:
+            pd.DataFrame: 清洗后的数据
+        """
+        # 与 Cleaner 的过期清理保持一致：当前整点往前 history_hours 小时
+        since = hour_start(time.time()) - self.config.get("history_hours", 24) * HOUR_SECONDS
+        try:
+            hourly = HourlyQueue(self.redis_client, queue_name)
+            raw_data = hourly.read(since=since)
+            if not raw_data:
+                print(f"⚠️  警告：Redis 队列 '{queue_name}:*' 在历史窗口内没有数据")
+                return pd.DataFrame()
+            
+            data_list = []
+            for item_json in raw_data:
+                try:
+                    data_list.append(json.loads(item_json))
+                except json.JSONDecodeError as e:
+                    print(f"⚠️  JSON 解析错误，跳过该数据: {e}")
+            
+            print(f"✅ 成功从 Redis 小时列表 '{queue_name}:*' 读取 {len(data_list)} 条数据（历史数据保留）")
+            return pd.DataFrame(data_list)
+        
+        except Exception as e:
+            print(f"❌ 从 Redis 读取数据失败: {e}")
+            return pd.DataFrame()
+
+    def load_new_from_redis(self, known_keys: set) -> Optional[Tuple[pd.DataFrame, List[str], int]]:
+        """
+        增量读取：只读取滚动窗口中还没有的数据（不删除）
+
+        Cleaner 用 LPUSH 写入，新数据总在列表头部；从头部按块读取，遇到第一条已有的记录即停止。
+        第一块与各列表长度在一个 pipeline 中读取，没有新数据时只需一次往返。
+
+        Args:
+            known_keys: 窗口中已有记录的水位线键（见 window_state.record_key）
+
+        Returns:
+            (新数据, 与行对应的水位线键, 队列总长度)；Redis 未连接或读取失败时返回 None
+        """
+        if not self.redis_client:
+            return None
+
+        incremental_config = self.config.get("incremental", {})
+        chunk = incremental_config.get("initial_chunk", 200)
+        max_chunk = incremental_config.get("max_chunk", 5000)
+        queue_name = self.config["redis"]["input_queue"]
+
+        try:
+            if self.config["redis"].get("input_layout", "list") == "hourly":
+                since = hour_start(time.time()) - self.config.get("history_hours", 24) * HOUR_SECONDS
+                keys = list(reversed(HourlyQueue(self.redis_client, queue_name).hour_keys(since=since)))
+            else:
+                keys = [queue_name]
+
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key in keys:
+                pipe.llen(key)
+                pipe.lrange(key, 0, chunk - 1)
+            replies = pipe.execute()
+            queue_length = sum(replies[0::2])
+
+            data_list, row_keys = [], []
+            for key, items in zip(keys, replies[1::2]):
+                start, size = 0, chunk
+                while True:
+                    reached_known = self._collect_new(items, known_keys, data_list, row_keys)
+                    if reached_known or len(items) < size:
+                        break
+                    start += size
+                    size = min(size * 2, max_chunk)
+                    items = self.redis_client.lrange(key, start, start + size - 1)
+
+            return pd.DataFrame(data_list), row_keys, queue_length
+
+        except Exception as e:
+            print(f"❌ 从 Redis 增量读取数据失败: {e}")
+            return None
+
+    @staticmethod
+    def _collect_new(items: List[str], known_keys: set, data_list: List[Dict[str, Any]],
+                     row_keys: List[str]) -> bool:
+        """解析一块数据，收集新记录；遇到已有记录时返回 True"""
+        for item_json in items:
+            try:
+                item_data = json.loads(item_json)
+            except json.JSONDecodeError:
+                continue
+            key = record_key(item_data, item_json)
+            if key in known_keys:
+                return True
+            data_list.append(item_data)
+            row_keys.append(key)
+        return False
+
     def load_data_from_file(self, file_path: str) -> pd.DataFrame:
         """
         从本地 CSV 文件读取数据（备份方案）
@@ -158,8 +276,8 @@ class DataLoader:
         # 转换时间格式
         # 优先使用 Cleaner 提供的 created_at（ISO格式），如果不存在则使用 timestamp
         if 'created_at' in df.columns:
-            # Cleaner 提供了 created_at（ISO 格式字符串），转换为 datetime
-            df['created_at'] = pd.to_datetime(df['created_at'], errors='coerce')
+            # Cleaner 提供了 created_at（ISO 格式字符串）与 created_ts（epoch 秒），转换为 UTC datetime
+            df['created_at'] = to_utc_series(df['created_at'], epochs=df.get('created_ts'))
             # 如果没有 timestamp，从 created_at 创建
             if 'timestamp' not in df.columns:
                 df['timestamp'] = df['created_at']
@@ -168,7 +286,7 @@ class DataLoader:
                 if df['timestamp'].dtype in ['int64', 'float64']:
                     df['timestamp'] = pd.to_datetime(df['timestamp'], unit='s', errors='coerce')
                 else:
-                    df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
+                    df['timestamp'] = to_utc_series(df['timestamp'])
         else:
             # Cleaner 没有提供 created_at，使用 timestamp
             if 'timestamp' not in df.columns:
@@ -180,17 +298,24 @@ class DataLoader:
                 if df['timestamp'].dtype in ['int64', 'float64']:
                     df['timestamp'] = pd.to_datetime(df['timestamp'], unit='s', errors='coerce')
                 else:
-                    df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
+                    df['timestamp'] = to_utc_series(df['timestamp'])
                 # 创建 created_at = timestamp
                 df['created_at'] = df['timestamp']
 
         # 清理文本数据（提前做，因为 BERT 预测需要）
-        if 'text' in df.columns:
-            df['clean_text'] = df['text'].fillna('').apply(self._clean_text)
-        elif 'content' in df.columns:
-            df['clean_text'] = df['content'].fillna('').apply(self._clean_text)
-        else:
-            df['clean_text'] = ''
+        # Cleaner 已预先分词且分词器版本一致的行直接使用 clean_text / tokens，其余行在这里计算
+        precomputed = self._precomputed_rows(df)
+        pending = ~precomputed
+        if not precomputed.all():
+            if 'clean_text' not in df.columns:
+                df['clean_text'] = ''
+            # 与 Cleaner 相同的取字段规则（text 为空时用 content），同一条数据两端分词结果一致
+            text_columns = [column for column in SOURCE_TEXT_FIELDS if column in df.columns]
+            rows = df.loc[pending, text_columns].to_dict('records') if text_columns else [{}] * int(pending.sum())
+            df.loc[pending, 'clean_text'] = [self._clean_text(source_text(row)) for row in rows]
+        df['tokens'] = df['tokens'].where(precomputed, None) if 'tokens' in df.columns else None
+        if precomputed.any():
+            print(f"✓ 使用 Cleaner 预先分词结果: {int(precomputed.sum())}/{len(df)} 条 ({self.tokenizer.version})")
 
         # === 🤖 BERT 情感预测集成 ===
         # 确保 sentiment 列存在
@@ -243,28 +368,15 @@ class DataLoader:
 
         return df
 
-    def _clean_text(self, text: str) -> str:
-        """清理文本"""
-        if not isinstance(text, str):
-            return ""
+    def _precomputed_rows(self, df: pd.DataFrame) -> pd.Series:
+        """Cleaner 已用相同版本的分词器处理过的行"""
+        if not {'clean_text', 'tokens', 'tokenizer_version'}.issubset(df.columns):
+            return pd.Series(False, index=df.index)
+        return (df['tokenizer_version'] == self.tokenizer.version) & df['tokens'].map(lambda t: isinstance(t, list))
 
-        # 移除URL
-        import re
-        text = re.sub(r'http\S+', '', text)
-
-        # 移除股票代码（如$ETH.X）
-        text = re.sub(r'\$\w+\.\w+', '', text)
-
-        # 移除特殊字符，保留字母数字和空格
-        text = re.sub(r'[^\w\s]', ' ', text)
-
-        # 转换为小写
-        text = text.lower()
-
-        # 移除多余空格
-        text = ' '.join(text.split())
-
-        return text
+    def _clean_text(self, text: str) -> str:
+        """清理文本（移除 URL 与股票代码、去标点、小写、合并空白，规则与 Cleaner 共用）"""
+        return clean_text(text)
 
     def get_time_windows(self, df: pd.DataFrame) -> Dict[str, datetime]:
         """
@@ -1,7 +1,9 @@
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 from config import CONFIG
+from term_matrix import DocumentTermMatrix
 
 
 class HistoryAnalyzer:
@@ -9,7 +11,8 @@ class HistoryAnalyzer:
         self.config = CONFIG
 
     def generate_history_data(self, df: pd.DataFrame, keywords: List[str], 
-                            time_windows: Optional[Dict] = None) -> Dict[str, List[Dict[str, Any]]]:
+                            time_windows: Optional[Dict] = None,
+                            term_matrix: Optional[DocumentTermMatrix] = None) -> Dict[str, List[Dict[str, Any]]]:
         """
         生成历史趋势数据 - 严格生成 24 个整点的词频统计
         
@@ -20,6 +23,7 @@ class HistoryAnalyzer:
             keywords: 关键词列表
             time_windows: 时间窗口字典，包含 'history_window_start' 和 'latest_time'
                          如果为 None，则自动计算（不推荐）
+            term_matrix: 由 df 构建的文档-词矩阵（可选，提供时按词精确匹配，不再逐词扫描 clean_text）
         """
         history_data = {}
 
@@ -46,28 +50,17 @@ class HistoryAnalyzer:
         print(f"  时间窗口: {start_time.isoformat()} ~ {end_time.isoformat()}")
         print(f"  时间区间数: {len(time_intervals)} 个（应为 24 个）")
 
-        for keyword in keywords:
-            keyword_data = []
+        # 每行只计算一次所在的小时序号（不在 24 个区间内的为 -1），再一次性得到 关键词 × 小时 的计数
+        hour_index = self._hour_index(df[time_field], time_intervals[0][0], len(time_intervals))
+        counts = self._keyword_hour_counts(df, keywords, hour_index, len(time_intervals), term_matrix)
 
-            # 过滤包含关键词的数据
-            keyword_df = df[df['clean_text'].str.contains(keyword, case=False, na=False)]
-
-            for interval_start, interval_end in time_intervals:
-                # ✅ 使用 created_at 字段统计每个时间区间的频率（闭区间：[start, end]）
-                interval_count = len(
-                    keyword_df[
-                        (keyword_df[time_field] >= interval_start) &
-                        (keyword_df[time_field] < interval_end)
-                        ]
-                )
-
-                keyword_data.append({
-                    # ✅ 使用整点时间，ISO 8601 格式，带 UTC 时区标记
-                    "timestamp": interval_start.strftime("%Y-%m-%dT%H:%M:%SZ"),
-                    "frequency": interval_count
-                })
-
-            history_data[keyword] = keyword_data
+        # ✅ 使用整点时间，ISO 8601 格式，带 UTC 时区标记
+        labels = [interval_start.strftime("%Y-%m-%dT%H:%M:%SZ") for interval_start, _ in time_intervals]
+        for keyword, keyword_counts in zip(keywords, counts):
+            history_data[keyword] = [
+                {"timestamp": label, "frequency": int(count)}
+                for label, count in zip(labels, keyword_counts)
+            ]
             
         # 验证输出
         if history_data:
@@ -78,6 +71,42 @@ class HistoryAnalyzer:
 
         return history_data
 
+    def _hour_index(self, times: pd.Series, first_start: datetime, n_hours: int) -> np.ndarray:
+        """
+        每行所在的小时序号：[first_start + i h, first_start + (i+1) h) 内为 i，区间外或时间缺失为 -1
+
+        Args:
+            times: 时间列
+            first_start: 第一个区间的起点
+            n_hours: 区间数
+        """
+        offsets = ((times - first_start) // pd.Timedelta(hours=1)).to_numpy(dtype='float64', na_value=np.nan)
+        index = np.full(len(offsets), -1, dtype=np.int64)
+        valid = (offsets >= 0) & (offsets < n_hours)
+        index[valid] = offsets[valid].astype(np.int64)
+        return index
+
+    def _keyword_hour_counts(self, df: pd.DataFrame, keywords: List[str], hour_index: np.ndarray,
+                             n_hours: int, term_matrix: Optional[DocumentTermMatrix] = None) -> np.ndarray:
+        """
+        关键词 × 小时 的数据条数矩阵
+
+        提供文档-词矩阵时为一次稀疏矩阵乘法；否则逐词匹配 clean_text 后用一次 bincount 汇总。
+        """
+        if term_matrix is not None:
+            return term_matrix.grouped_document_counts(keywords, hour_index, n_hours)
+        if not keywords:
+            return np.zeros((0, n_hours), dtype=np.int64)
+
+        # 行 × 关键词 的命中矩阵（与原逻辑相同的子串匹配）
+        matches = np.column_stack([
+            df['clean_text'].str.contains(keyword, case=False, na=False).to_numpy(dtype=bool)
+            for keyword in keywords
+        ])
+        rows, cols = np.nonzero(matches & (hour_index >= 0)[:, None])
+        return np.bincount(cols * n_hours + hour_index[rows], minlength=len(keywords) * n_hours) \
+            .reshape(len(keywords), n_hours)
+
     def _create_time_intervals(self, start_time: datetime, end_time: datetime) -> List[tuple]:
         """创建时间区间 - 按整点小时划分"""
         intervals = []
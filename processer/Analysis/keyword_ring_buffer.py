@@ -0,0 +1,167 @@
+"""
+按小时分槽的关键词计数环形缓冲
+每个整点小时一个槽，记录该小时内包含每个词的数据条数，以及按情感标签细分的条数。
+数据到达时按发布时间计入所属的槽，整点过后最旧的槽随窗口一起移出；
+热词的历史平均频率、情感分布与 24 个整点的历史曲线都直接从槽中读取，
+开销与词表大小成正比，而不是 关键词数 × 数据条数 × 小时数。
+
+统计口径：词按分词结果精确匹配（与热词提取一致），每条数据中同一个词只计一次。
+"""
+from collections import Counter
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from term_matrix import frame_token_lists
+
+
+class HourSlot:
+    """一个整点小时内的计数"""
+
+    __slots__ = ('doc_counts', 'sentiment_counts')
+
+    def __init__(self):
+        self.doc_counts = Counter()
+        self.sentiment_counts: Dict[str, Counter] = {}
+
+
+class KeywordRingBuffer:
+    """按小时分槽的关键词计数"""
+
+    def __init__(self, tokenizer, slots: int = 26):
+        """
+        Args:
+            tokenizer: TextTokenizer（数据没有预先分词时对 clean_text 分词）
+            slots: 槽数。主流程的历史窗口为 [最新整点 - 25h, 最新整点]，共 26 个整点
+        """
+        self.tokenizer = tokenizer
+        self.slots = slots
+        self.hours: Dict[pd.Timestamp, HourSlot] = {}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, tokenizer, slots: int = 26) -> 'KeywordRingBuffer':
+        """由一次性加载的数据构建（非增量模式）"""
+        buffer = cls(tokenizer, slots)
+        buffer.add(df)
+        return buffer
+
+    def reset(self):
+        """清空全部槽"""
+        self.hours = {}
+
+    def add(self, df: pd.DataFrame) -> int:
+        """
+        把预处理后的数据计入所属小时的槽
+
+        Args:
+            df: 含 created_at（或 timestamp）、tokens / clean_text 与 sentiment 列
+
+        Returns:
+            计入的数据条数（发布时间缺失的不计入）
+        """
+        if df.empty:
+            return 0
+        time_field = 'created_at' if 'created_at' in df.columns else 'timestamp'
+        hours = pd.to_datetime(df[time_field], utc=True, errors='coerce').dt.floor('h')
+
+        rows = pd.DataFrame({
+            'hour': hours,
+            'sentiment': df['sentiment'] if 'sentiment' in df.columns else '',
+            'token': [list(dict.fromkeys(tokens)) for tokens in frame_token_lists(df, self.tokenizer)],
+        }, index=df.index).dropna(subset=['hour'])
+        if rows.empty:
+            return 0
+
+        for hour in rows['hour'].unique():
+            self._slot(hour)
+
+        # 每条数据中的词已去重，(小时, 词) 的行数即包含该词的数据条数
+        exploded = rows.explode('token').dropna(subset=['token'])
+        for (hour, token), count in exploded.groupby(['hour', 'token'], sort=False).size().items():
+            self.hours[hour].doc_counts[token] += int(count)
+        for (hour, sentiment, token), count in exploded.groupby(['hour', 'sentiment', 'token'], sort=False).size().items():
+            self.hours[hour].sentiment_counts.setdefault(sentiment, Counter())[token] += int(count)
+
+        self._trim()
+        return len(rows)
+
+    def rotate(self, cutoff: pd.Timestamp) -> int:
+        """
+        移出早于 cutoff 所在整点的槽（与滚动窗口的淘汰同步）
+
+        Returns:
+            移出的槽数
+        """
+        expired = [hour for hour in self.hours if hour < cutoff.floor('h')]
+        for hour in expired:
+            del self.hours[hour]
+        return len(expired)
+
+    def _slot(self, hour: pd.Timestamp) -> HourSlot:
+        slot = self.hours.get(hour)
+        if slot is None:
+            slot = self.hours[hour] = HourSlot()
+        return slot
+
+    def _trim(self):
+        """只保留最新的 slots 个槽"""
+        if len(self.hours) > self.slots:
+            for hour in sorted(self.hours)[:len(self.hours) - self.slots]:
+                del self.hours[hour]
+
+    def _slots_between(self, start: pd.Timestamp, end: pd.Timestamp) -> List[HourSlot]:
+        """整点在 [start, end] 内的槽"""
+        return [slot for hour, slot in self.hours.items() if start <= hour <= end]
+
+    def document_counts(self, keywords: List[str], start: Optional[pd.Timestamp] = None,
+                        end: Optional[pd.Timestamp] = None) -> Dict[str, int]:
+        """
+        包含各关键词的数据条数
+
+        Args:
+            keywords: 关键词
+            start / end: 只统计整点在该范围内的槽（闭区间，None 表示不限）
+
+        Returns:
+            {关键词: 条数}
+        """
+        slots = self._slots_between(start or pd.Timestamp.min.tz_localize('UTC'),
+                                    end or pd.Timestamp.max.tz_localize('UTC'))
+        return {keyword: sum(slot.doc_counts.get(keyword, 0) for slot in slots) for keyword in keywords}
+
+    def sentiment_counts(self, keyword: str) -> Tuple[Dict[str, int], int]:
+        """
+        包含关键词的数据按情感标签的条数（全部槽）
+
+        Returns:
+            ({情感标签: 条数}, 总条数)
+        """
+        counts = Counter()
+        total = 0
+        for slot in self.hours.values():
+            total += slot.doc_counts.get(keyword, 0)
+            for sentiment, token_counts in slot.sentiment_counts.items():
+                counts[sentiment] += token_counts.get(keyword, 0)
+        return dict(counts), total
+
+    def history(self, keywords: List[str], end_time: pd.Timestamp, hours: int = 24) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        各关键词在 end_time 之前 hours 个整点的数据条数（与 HistoryAnalyzer.generate_history_data 格式相同）
+
+        Args:
+            keywords: 关键词
+            end_time: 结束整点（不含）
+            hours: 数据点个数
+        """
+        end_hour = end_time.replace(minute=0, second=0, microsecond=0)
+        starts = [end_hour - timedelta(hours=hours - i) for i in range(hours)]
+        slots = [self.hours.get(start) for start in starts]
+        labels = [start.strftime("%Y-%m-%dT%H:%M:%SZ") for start in starts]
+        return {
+            keyword: [
+                {"timestamp": label, "frequency": slot.doc_counts.get(keyword, 0) if slot else 0}
+                for label, slot in zip(labels, slots)
+            ]
+            for keyword in keywords
+        }
@@ -6,7 +6,11 @@ from sentiment_analyzer import SentimentAnalyzer
 from history_analyzer import HistoryAnalyzer
 from news_processor import NewsProcessor
 from redis_manager import RedisManager  # 新增导入
+from window_state import RollingWindow
+from keyword_ring_buffer import KeywordRingBuffer
+from term_matrix import DocumentTermMatrix
 from config import CONFIG
+from typing import Optional
 import pandas as pd
 
 
@@ -19,6 +23,14 @@ class MainProcessor:
         self.news_processor = NewsProcessor()
         self.redis_manager = RedisManager()  # 新增
         self.config = CONFIG
+        # 增量模式：常驻进程（data_processor.py）在多次通知之间保留已预处理的窗口
+        incremental_config = self.config.get('incremental', {})
+        self.use_keyword_buffer = self.config.get('keyword_buffer', {}).get('enabled', False)
+        self.window = RollingWindow(
+            history_hours=self.config.get('history_hours', 24),
+            full_resync_minutes=incremental_config.get('full_resync_minutes', 0),
+            keywords=KeywordRingBuffer(self.text_analyzer.tokenizer) if self.use_keyword_buffer else None
+        ) if incremental_config.get('enabled', False) else None
 
     def process(self, input_file: str = None, output_file: str = None):
         """
@@ -46,13 +58,21 @@ class MainProcessor:
 
         # 1. 加载数据
         print("\n📥 加载数据...")
-        raw_data = self.data_loader.load_data(input_file)
-        
-        if raw_data.empty:
-            print("❌ 加载数据失败，退出处理")
-            return False
+        # 增量模式：只读取、预处理新数据；Redis 不可用或窗口为空时回退到全量加载
+        df = self._update_window() if self.window is not None else None
+        from_window = df is not None and not df.empty
+        if df is not None and not self.window.changed and self.config['incremental'].get('skip_unchanged', True):
+            print("⏭️  窗口没有变化（无新数据、无数据移出窗口），跳过本轮处理")
+            return True
+
+        if not from_window:
+            raw_data = self.data_loader.load_data(input_file)
+
+            if raw_data.empty:
+                print("❌ 加载数据失败，退出处理")
+                return False
 
-        df = self.data_loader.preprocess_data(raw_data)
+            df = self.data_loader.preprocess_data(raw_data)
         time_windows = self.data_loader.get_time_windows(df)
 
         print(f"✓ 加载了 {len(df)} 条数据")
@@ -71,19 +91,22 @@ class MainProcessor:
         current_df = df[df[time_field] >= time_windows['current_window_start']]
         
         # ✅ 关键修改：历史数据应该包含整个 24 小时窗口的所有数据
-        history_df = df[
+        history_mask = (
             (df[time_field] >= time_windows['history_window_start']) &
             (df[time_field] <= time_windows['latest_time'])
-        ]
+        )
 
         print(f"\n✓ 当前窗口数据（最近1小时）: {len(current_df)} 条")
         print(f"  时间范围: {time_windows['current_window_start'].isoformat()} ~ {time_windows['latest_time'].isoformat()}")
-        print(f"✓ 历史窗口数据（完整24小时）: {len(history_df)} 条")
+        print(f"✓ 历史窗口数据（完整24小时）: {int(history_mask.sum())} 条")
         print(f"  时间范围: {time_windows['history_window_start'].isoformat()} ~ {time_windows['latest_time'].isoformat()}")
 
         # 3. 词频分析
         print("\n🔍 执行文本分析...")
-        current_keywords = self.text_analyzer.extract_keywords(current_df['clean_text'].tolist())
+        current_keywords = self.text_analyzer.extract_keywords(
+            current_df['clean_text'].tolist(),
+            token_lists=current_df['tokens'].tolist() if 'tokens' in current_df.columns else None
+        )
 
         # ✅ 计算历史24小时平均频率
         # 获取实际的时间区间数（严格为 24 个整点）
@@ -94,17 +117,31 @@ class MainProcessor:
         
         print(f"  📊 历史分析: {total_intervals} 个时间区间（应为 24 个整点小时）")
         
+        # 关键词环形缓冲：增量模式下随窗口更新，否则由本次数据构建
+        # 未启用时每轮构建一次文档-词矩阵，关键词计数都用稀疏列切片完成
+        keyword_buffer = None
+        term_matrix = None
+        if self.use_keyword_buffer:
+            keyword_buffer = self.window.keywords if from_window else \
+                KeywordRingBuffer.from_frame(df, self.text_analyzer.tokenizer)
+        else:
+            term_matrix = DocumentTermMatrix.from_frame(df, self.text_analyzer.tokenizer)
+            print(f"  ✓ 文档-词矩阵: {term_matrix.n_documents} 条 × {len(term_matrix.terms)} 个词")
+
         # ✅ 使用完整的 24 小时数据进行计算
         history_keywords_freq = {}
-        for keyword, _ in current_keywords[:self.config['trending_keywords_count']]:
-            keyword_history_df = history_df[history_df['clean_text'].str.contains(keyword, case=False, na=False)]
-            history_avg_freq = len(keyword_history_df) / total_intervals if total_intervals > 0 else 0
-            history_keywords_freq[keyword] = history_avg_freq
+        trending_words = [keyword for keyword, _ in current_keywords[:self.config['trending_keywords_count']]]
+        if keyword_buffer is not None:
+            history_counts = keyword_buffer.document_counts(trending_words, history_start, history_end)
+        else:
+            history_counts = term_matrix.document_counts(trending_words, row_mask=history_mask)
+        for keyword, count in history_counts.items():
+            history_keywords_freq[keyword] = count / total_intervals if total_intervals > 0 else 0
 
         # 4. 生成热词排行榜
         print("📊 生成热词排行榜...")
         trending_keywords = self._generate_trending_keywords(
-            current_keywords, history_keywords_freq, df
+            current_keywords, history_keywords_freq, df, keyword_buffer, term_matrix
         )
 
         # 5. 生成词云数据
@@ -118,15 +155,19 @@ class MainProcessor:
         top_keywords = [keyword for keyword, _ in current_keywords[:top_keywords_count]]
         print(f"  📊 选取频率最高的 {len(top_keywords)} 个词生成历史数据")
         # ✅ 传入精确的时间窗口，确保历史数据计算与主流程一致
-        history_data = self.history_analyzer.generate_history_data(df, top_keywords, time_windows)
+        if keyword_buffer is not None:
+            history_data = keyword_buffer.history(top_keywords, time_windows['latest_time'])
+            print(f"  ✓ 从关键词环形缓冲读取 {len(keyword_buffer.hours)} 个整点槽")
+        else:
+            history_data = self.history_analyzer.generate_history_data(df, top_keywords, time_windows, term_matrix)
 
         # 7. 生成新闻流
         print("📰 生成新闻流...")
-        news_feed = self.news_processor.generate_news_feed(df, top_keywords)
+        news_feed = self.news_processor.generate_news_feed(df, top_keywords, self.config['news_feed_count'])
 
         # 8. 统计新闻来源
         print("📊 统计新闻来源分布...")
-        news_sources = self._calculate_news_sources(df)
+        news_sources = self._calculate_news_sources(df, self.window.source_counts if from_window else None)
 
         # 9. 生成输出数据
         print("\n💾 生成输出数据...")
@@ -153,24 +194,73 @@ class MainProcessor:
         else:
             print("⚠️  数据发布到 Redis 失败")
 
+        if from_window:
+            self.window.mark_processed()
+
         print("\n" + "="*60)
         print("✨ Processer 处理完成！")
         print("="*60)
         return True
 
+    def _update_window(self) -> Optional[pd.DataFrame]:
+        """
+        增量更新滚动窗口：淘汰移出窗口的数据，只读取并预处理新数据
+
+        Returns:
+            窗口数据；Redis 不可用时返回 None（回退到全量加载）
+        """
+        window = self.window
+        evicted = window.evict(window.cutoff())
+        resync = window.needs_resync()
+
+        result = self.data_loader.load_new_from_redis(set() if resync else window.ids)
+        if result is None:
+            return None
+        new_df, keys, queue_length = result
+
+        # 队列中的数据比窗口少：队列被清空或被其他工具删除，全量重建
+        if not resync and window.needs_resync(queue_length - len(keys)):
+            print("🔄 队列数据少于窗口数据，全量重建窗口")
+            resync = True
+            result = self.data_loader.load_new_from_redis(set())
+            if result is None:
+                return None
+            new_df, keys, queue_length = result
+
+        if resync:
+            window.reset()
+        if not new_df.empty:
+            window.append(self.data_loader.preprocess_data(new_df), keys)
+            evicted += window.evict(window.cutoff())
+
+        mode = "全量重建" if resync else "增量更新"
+        print(f"✓ 窗口{mode}: 新增 {len(keys)} 条，移出 {evicted} 条，窗口共 {len(window)} 条（队列 {queue_length} 条）")
+        return window.snapshot()
+
     def _generate_trending_keywords(self, current_keywords: list, history_keywords_freq: dict,
-                                    df: pd.DataFrame) -> list:
-        """生成热词排行榜"""
+                                    df: pd.DataFrame, keyword_buffer: Optional[KeywordRingBuffer] = None,
+                                    term_matrix: Optional[DocumentTermMatrix] = None) -> list:
+        """生成热词排行榜（情感分布优先从关键词环形缓冲读取，其次用文档-词矩阵过滤）"""
         trending_data = []
         max_frequency = max([freq for _, freq in current_keywords]) if current_keywords else 1
 
-        for rank, (keyword, current_freq) in enumerate(current_keywords[:self.config['trending_keywords_count']], 1):
+        top_keywords = current_keywords[:self.config['trending_keywords_count']]
+        if keyword_buffer is None:
+            # 全部热词的情感分布一次算出
+            sentiments = self.sentiment_analyzer.analyze_sentiment_distributions(
+                df, [keyword for keyword, _ in top_keywords], term_matrix)
+
+        for rank, (keyword, current_freq) in enumerate(top_keywords, 1):
             history_avg_freq = history_keywords_freq.get(keyword, 0)
 
             growth_rate = self.text_analyzer.calculate_growth_rate(current_freq, history_avg_freq)
             trend_score = self.text_analyzer.calculate_trend_score(current_freq, growth_rate, max_frequency)
 
-            sentiment_data = self.sentiment_analyzer.analyze_sentiment_distribution(df, keyword)
+            if keyword_buffer is not None:
+                sentiment_data = self.sentiment_analyzer.distribution_from_counts(
+                    *keyword_buffer.sentiment_counts(keyword))
+            else:
+                sentiment_data = sentiments[keyword]
 
             trending_data.append({
                 "keyword": keyword,
@@ -190,22 +280,25 @@ class MainProcessor:
             for keyword, freq in keywords[:self.config['word_cloud_count']]
         ]
 
-    def _calculate_news_sources(self, df: pd.DataFrame) -> dict:
+    def _calculate_news_sources(self, df: pd.DataFrame, rolling_counts: Optional[dict] = None) -> dict:
         """
         统计新闻来源分布
         
         Args:
             df: 数据框
+            rolling_counts: 滚动窗口维护的来源计数（增量模式，提供时不再扫描 df）
             
         Returns:
             dict: 新闻来源统计数据，格式为 {"source_name": count, ...}
         """
-        if 'source' not in df.columns:
+        if rolling_counts is not None:
+            source_counts = dict(rolling_counts)
+        elif 'source' not in df.columns:
             print("⚠️  警告：数据中没有 'source' 字段")
             return {}
-        
-        # 统计每个来源的数量
-        source_counts = df['source'].value_counts().to_dict()
+        else:
+            # 统计每个来源的数量
+            source_counts = df['source'].value_counts().to_dict()
         
         # 处理空值或未知来源
         if pd.isna(list(source_counts.keys())[0]) if source_counts else False:
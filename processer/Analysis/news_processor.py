@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from typing import List, Dict, Any
 from sentiment_analyzer import SentimentAnalyzer
@@ -8,36 +9,65 @@ class NewsProcessor:
         self.sentiment_analyzer = SentimentAnalyzer()
 
     def generate_news_feed(self, df: pd.DataFrame, top_keywords: List[str], limit: int = 20) -> List[Dict[str, Any]]:
-        """生成新闻流数据"""
-        # 按时间倒序排列
-        sorted_df = df.sort_values('timestamp', ascending=False)
+        """
+        生成新闻流数据（按 timestamp 取最新的 limit 条，整列计算情感标签）
+
+        Args:
+            df: 预处理后的数据
+            top_keywords: 高频关键词（保留参数，当前未参与筛选）
+            limit: 新闻条数，取几百条的开销与 20 条基本相同
+
+        Returns:
+            新闻列表，按发布时间倒序
+        """
+        if df.empty or limit <= 0:
+            return []
+
+        try:
+            latest = df.nlargest(limit, 'timestamp')
+        except TypeError:
+            # timestamp 未解析为时间类型时退回排序
+            latest = df.sort_values('timestamp', ascending=False).head(limit)
 
-        news_feed = []
-        for _, row in sorted_df.head(limit).iterrows():
+        if pd.api.types.is_datetime64_any_dtype(latest['timestamp']):
+            # ✅ ISO 8601 格式，带 UTC 时区标记
+            publish_time = latest['timestamp'].dt.strftime("%Y-%m-%dT%H:%M:%SZ").fillna('NaT')
+        else:
+            publish_time = latest['timestamp'].astype(str)
+
+        feed = pd.DataFrame({
             # 使用text作为标题，不再截取，完整展示
-            title = row['text']
+            "title": latest['text'],
+            "publish_time": publish_time,
+            "source": latest['source'],
+            "url": latest['url'].fillna('') if 'url' in latest.columns else '',  # 不存在则为空字符串
+            "sentiment": self._sentiment_labels(df, latest)
+        })
+        return feed.to_dict('records')
 
-            # 分析该条新闻的情感分布
-            news_sentiment = self.sentiment_analyzer.analyze_sentiment_distribution(
-                df[df['id'] == row['id']],  # 这里简化处理，实际可能需要关联评论
-                keyword=None
-            )
+    def _sentiment_labels(self, df: pd.DataFrame, latest: pd.DataFrame) -> pd.Series:
+        """
+        按 id 汇总情感并整列映射为标签（与逐条调用
+        _determine_sentiment_label(analyze_sentiment_distribution(df[df['id'] == id])) 结果相同）
 
-            # 根据情感分布确定主要情感类型
-            sentiment_label = self._determine_sentiment_label(news_sentiment)
+        分布中只有 positive/negative 且两者之和为 100，因此 Bullish 占比（四舍五入后）
+        不低于 50% 即为 'positive'，否则为 'negative'（包括找不到同 id 数据的情况）
 
-            news_item = {
-                "title": title,
-                # ✅ ISO 8601 格式，带 UTC 时区标记
-                "publish_time": row['timestamp'].strftime("%Y-%m-%dT%H:%M:%SZ") if isinstance(row['timestamp'], pd.Timestamp) else str(row['timestamp']),
-                "source": row['source'],
-                "url": row.get('url', ''),  # 获取URL，如果不存在则为空字符串
-                "sentiment": sentiment_label  # 使用简单的字符串标签
-            }
+        Args:
+            df: 全部数据（同一 id 可能有多条）
+            latest: 选出的新闻
 
-            news_feed.append(news_item)
+        Returns:
+            与 latest 行对齐的标签
+        """
+        if 'id' in df.columns:
+            same_id = df[df['id'].isin(latest['id'].dropna().unique())]
+            grouped = same_id['sentiment'].eq('Bullish').groupby(same_id['id'])
+            bullish_percent = np.round(latest['id'].map(grouped.sum()) / latest['id'].map(grouped.size()) * 100)
+        else:
+            bullish_percent = latest['sentiment'].eq('Bullish') * 100
 
-        return news_feed
+        return pd.Series(np.where(bullish_percent >= 50, 'positive', 'negative'), index=latest.index)
 
     def _determine_sentiment_label(self, sentiment_data: Dict[str, Any]) -> str:
         """
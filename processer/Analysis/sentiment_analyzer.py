@@ -1,15 +1,19 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import pandas as pd
 from collections import Counter
+from term_matrix import DocumentTermMatrix
 
 
 class SentimentAnalyzer:
     def __init__(self):
         self.sentiment_labels = ['Bullish', 'Bearish']
 
-    def analyze_sentiment_distribution(self, df: pd.DataFrame, keyword: str = None) -> Dict[str, Any]:
-        """分析情感分布"""
-        if keyword:
+    def analyze_sentiment_distribution(self, df: pd.DataFrame, keyword: str = None,
+                                       term_matrix: Optional[DocumentTermMatrix] = None) -> Dict[str, Any]:
+        """分析情感分布（提供由 df 构建的文档-词矩阵时按词精确匹配）"""
+        if keyword and term_matrix is not None:
+            filtered_df = df[term_matrix.document_mask(keyword)]
+        elif keyword:
             # 过滤包含关键词的文本
             filtered_df = df[df['clean_text'].str.contains(keyword, case=False, na=False)]
         else:
@@ -17,8 +21,46 @@ class SentimentAnalyzer:
 
         # 统计情感分布
         sentiment_counts = filtered_df['sentiment'].value_counts()
+        return self.distribution_from_counts(sentiment_counts, len(filtered_df))
 
-        total = len(filtered_df)
+    def analyze_sentiment_distributions(self, df: pd.DataFrame, keywords: List[str],
+                                        term_matrix: Optional[DocumentTermMatrix] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        一次计算多个关键词的情感分布（结果与逐个调用 analyze_sentiment_distribution 相同）
+
+        Args:
+            df: 预处理后的数据
+            keywords: 关键词
+            term_matrix: 由 df 构建的文档-词矩阵；为 None 时逐个关键词做子串匹配
+
+        Returns:
+            {关键词: 情感分布}
+        """
+        if term_matrix is None:
+            return {keyword: self.analyze_sentiment_distribution(df, keyword) for keyword in keywords}
+
+        # 情感标签编码为分组号（其他标签与缺失值归入最后一组，只计入总条数），
+        # 关键词 × 标签的计数由一次稀疏矩阵乘法得到
+        label_codes = {label: i for i, label in enumerate(self.sentiment_labels)}
+        codes = df['sentiment'].map(label_codes).fillna(len(self.sentiment_labels)).to_numpy(dtype=int)
+        counts = term_matrix.grouped_document_counts(keywords, codes, len(self.sentiment_labels) + 1)
+
+        return {
+            keyword: self.distribution_from_counts(dict(zip(self.sentiment_labels, row.tolist())), int(row.sum()))
+            for keyword, row in zip(keywords, counts)
+        }
+
+    def distribution_from_counts(self, sentiment_counts, total: int) -> Dict[str, Any]:
+        """
+        由情感标签计数计算分布（百分比）
+
+        Args:
+            sentiment_counts: {情感标签: 条数}（dict 或 value_counts 结果）
+            total: 总条数
+
+        Returns:
+            {"positive": 百分比, "negative": 百分比, "total_comments": 总条数}
+        """
         if total == 0:
             return {
                 "positive": 0,
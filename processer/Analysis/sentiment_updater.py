@@ -3,10 +3,20 @@
 将 BERT 预测的 sentiment 实时更新到 Redis 队列
 """
 import json
+import sys
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, List, Dict, Any, Tuple
 import redis
-from typing import List, Dict, Any
 from config import CONFIG
 
+# 仓库根目录（Cleaner 与 Processor 共用的 utils 模块）
+REPO_ROOT = str(Path(__file__).resolve().parent.parent.parent)
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from utils.hourly_queue import HourlyQueue
+
 
 class SentimentUpdater:
     """将预测的 sentiment 更新回 Redis 队列"""
@@ -37,6 +47,28 @@ class SentimentUpdater:
                 self.redis_client = None
         
         self.queue_name = self.config['redis'].get('output_queue_name', 'clean_data_queue')
+        
+        # Cleaner 按小时分区输出时，逐个小时列表查找并原地更新
+        self.hourly = None
+        if self.config['redis'].get('input_layout', 'list') == 'hourly':
+            self.hourly = HourlyQueue(self.redis_client, self.queue_name)
+    
+    def _iter_queue_items(self) -> Iterator[Tuple[str, str]]:
+        """遍历队列数据，产出 (列表键, JSON 字符串)；按小时分区时遍历各小时列表"""
+        if self.hourly is not None:
+            yield from self.hourly.iter_items()
+            return
+        queue_length = self.redis_client.llen(self.queue_name)
+        for i in range(queue_length):
+            item_json = self.redis_client.lindex(self.queue_name, i)
+            if item_json:
+                yield self.queue_name, item_json
+    
+    def _queue_length(self) -> int:
+        """队列数据量（按小时分区时为各小时列表之和）"""
+        if self.hourly is not None:
+            return self.hourly.length()
+        return self.redis_client.llen(self.queue_name)
     
     def update_sentiment_in_queue(self, record_id: str, sentiment: str) -> bool:
         """
@@ -45,7 +77,7 @@ class SentimentUpdater:
         注意：由于 Redis 列表元素不可变，此方法将：
         1. 扫描列表找到目标记录
         2. 删除原记录
-        3. 更新后重新插入到末尾
+        3. 更新后重新插入到末尾（按小时分区时为所在小时列表的末尾）
         
         Args:
             record_id: 记录 ID（id 或 post_id）
@@ -58,42 +90,35 @@ class SentimentUpdater:
             return False
         
         try:
-            # 获取队列长度
-            queue_length = self.redis_client.llen(self.queue_name)
-            if queue_length == 0:
-                return False
-            
             # 逐个扫描队列元素
-            found_index = -1
+            found_key = None
+            found_json = None
             original_data = None
             
-            for i in range(queue_length):
-                item_json = self.redis_client.lindex(self.queue_name, i)
-                if not item_json:
-                    continue
-                
+            for key, item_json in self._iter_queue_items():
                 try:
                     item_data = json.loads(item_json)
                     item_id = item_data.get('id') or item_data.get('post_id')
                     
                     if item_id == record_id:
-                        found_index = i
+                        found_key = key
+                        found_json = item_json
                         original_data = item_data
                         break
                 except json.JSONDecodeError:
                     continue
             
             # 如果找到目标记录
-            if found_index >= 0 and original_data:
+            if found_key is not None and original_data:
                 # 更新 sentiment
                 original_data['sentiment'] = sentiment
                 
                 # 删除原记录
                 # 使用 LREM 删除第一个匹配项
-                self.redis_client.lrem(self.queue_name, 1, json.dumps(original_data, ensure_ascii=False))
+                self.redis_client.lrem(found_key, 1, found_json)
                 
                 # 重新插入到队尾
-                self.redis_client.rpush(self.queue_name, json.dumps(original_data, ensure_ascii=False))
+                self.redis_client.rpush(found_key, json.dumps(original_data, ensure_ascii=False))
                 
                 return True
             
@@ -134,7 +159,7 @@ class SentimentUpdater:
         
         # ✅ 第二步：扫描队列并在一次管道中处理所有更新
         try:
-            queue_length = self.redis_client.llen(self.queue_name)
+            queue_length = self._queue_length()
             
             if queue_length == 0:
                 print("⚠️  队列为空")
@@ -142,15 +167,11 @@ class SentimentUpdater:
             
             print(f"   队列长度: {queue_length}, 搜索 {len(id_sentiment_map)} 条记录...")
             
-            # ✅ 优化：扫描整个队列一次，构建更新列表
+            # ✅ 优化：扫描整个队列一次，构建更新列表（按列表键分组，小时分区时各自原地更新）
             items_to_remove = []
-            items_to_add = []
+            items_to_add: Dict[str, List[str]] = {}
             
-            for i in range(queue_length):
-                item_json = self.redis_client.lindex(self.queue_name, i)
-                if not item_json:
-                    continue
-                
+            for key, item_json in self._iter_queue_items():
                 try:
                     item_data = json.loads(item_json)
                     item_id = str(item_data.get('id') or item_data.get('post_id', ''))
@@ -158,8 +179,8 @@ class SentimentUpdater:
                     # ✅ 如果这个 ID 需要更新
                     if item_id in id_sentiment_map:
                         item_data['sentiment'] = id_sentiment_map[item_id]
-                        items_to_remove.append(item_json)
-                        items_to_add.append(json.dumps(item_data, ensure_ascii=False))
+                        items_to_remove.append((key, item_json))
+                        items_to_add.setdefault(key, []).append(json.dumps(item_data, ensure_ascii=False))
                         stats['success'] += 1
                 
                 except json.JSONDecodeError:
@@ -171,12 +192,12 @@ class SentimentUpdater:
                 
                 with self.redis_client.pipeline(transaction=False) as pipe:
                     # 删除旧记录
-                    for item_json in items_to_remove:
-                        pipe.lrem(self.queue_name, 1, item_json)
+                    for key, item_json in items_to_remove:
+                        pipe.lrem(key, 1, item_json)
                     
                     # 添加新记录
-                    if items_to_add:
-                        pipe.rpush(self.queue_name, *items_to_add)
+                    for key, items in items_to_add.items():
+                        pipe.rpush(key, *items)
                     
                     # ✅ 执行管道
                     pipe.execute()
@@ -208,14 +229,13 @@ class SentimentUpdater:
             return {}
         
         try:
-            queue_length = self.redis_client.llen(self.queue_name)
+            queue_length = self._queue_length()
             
             # 统计缺失 sentiment 的记录数
             missing_sentiment_count = 0
             has_sentiment_count = 0
             
-            for i in range(min(queue_length, 1000)):  # 只扫描前 1000 条以避免过慢
-                item_json = self.redis_client.lindex(self.queue_name, i)
+            for _, item_json in islice(self._iter_queue_items(), 1000):  # 只扫描前 1000 条以避免过慢
                 if item_json:
                     try:
                         item_data = json.loads(item_json)
@@ -0,0 +1,133 @@
+"""
+文档-词稀疏矩阵
+每轮处理构建一次：词表把每个词映射为列号，CSR 矩阵每行一条数据、每列一个词，值为出现次数。
+关键词过滤与按窗口计数都用稀疏列切片和向量化求和完成，
+代替对整个 DataFrame 反复执行 str.contains(keyword)（子串匹配会让 "cut" 命中 "shortcut"）。
+"""
+from itertools import chain
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+def frame_token_lists(df: pd.DataFrame, tokenizer) -> List[List[str]]:
+    """
+    每行的分词结果（优先使用 Cleaner 预先分词的 tokens，缺失时对 clean_text 分词）
+
+    Args:
+        df: 预处理后的数据
+        tokenizer: TextTokenizer
+
+    Returns:
+        与 df 行一一对应的词列表
+    """
+    tokens = df['tokens'] if 'tokens' in df.columns else [None] * len(df)
+    texts = df['clean_text'] if 'clean_text' in df.columns else [''] * len(df)
+    return [
+        token_list if isinstance(token_list, list)
+        else tokenizer.tokenize(text) if isinstance(text, str) else []
+        for token_list, text in zip(tokens, texts)
+    ]
+
+
+class DocumentTermMatrix:
+    """文档-词矩阵（行顺序与构建时的 DataFrame 一致）"""
+
+    def __init__(self, token_lists: List[List[str]]):
+        """
+        Args:
+            token_lists: 每条数据的词列表
+        """
+        lengths = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=len(token_lists))
+        codes, terms = pd.factorize(pd.Series(list(chain.from_iterable(token_lists)), dtype=object))
+        indptr = np.concatenate(([0], np.cumsum(lengths)))
+
+        self.terms: List[str] = list(terms)
+        self.vocabulary: Dict[str, int] = {term: i for i, term in enumerate(self.terms)}
+        self.matrix = sparse.csr_matrix(
+            (np.ones(len(codes), dtype=np.int32), codes.astype(np.int32), indptr),
+            shape=(len(token_lists), len(self.terms))
+        )
+        self.matrix.sum_duplicates()
+        # 按列切片用 CSC
+        self._columns = self.matrix.tocsc()
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, tokenizer) -> 'DocumentTermMatrix':
+        """由预处理后的 DataFrame 构建"""
+        return cls(frame_token_lists(df, tokenizer))
+
+    @property
+    def n_documents(self) -> int:
+        return self.matrix.shape[0]
+
+    def documents(self, keyword: str) -> np.ndarray:
+        """包含关键词的行号"""
+        col = self.vocabulary.get(keyword)
+        if col is None:
+            return np.empty(0, dtype=np.int32)
+        return self._columns.indices[self._columns.indptr[col]:self._columns.indptr[col + 1]]
+
+    def document_mask(self, keyword: str) -> np.ndarray:
+        """包含关键词的行（布尔数组，可直接用于 df[mask]）"""
+        mask = np.zeros(self.n_documents, dtype=bool)
+        mask[self.documents(keyword)] = True
+        return mask
+
+    def document_counts(self, keywords: List[str], row_mask: Optional[Any] = None) -> Dict[str, int]:
+        """
+        包含各关键词的数据条数
+
+        Args:
+            keywords: 关键词
+            row_mask: 只统计这些行（布尔数组或 Series，与构建时的行对齐），None 表示全部
+
+        Returns:
+            {关键词: 条数}
+        """
+        weights = np.ones(self.n_documents, dtype=np.int64) if row_mask is None \
+            else np.asarray(row_mask, dtype=bool).astype(np.int64)
+        cols = [self.vocabulary.get(keyword) for keyword in keywords]
+        present = [col for col in cols if col is not None]
+        if not present:
+            return {keyword: 0 for keyword in keywords}
+
+        # 选出的列与行权重做一次矩阵-向量乘法
+        counts = dict(zip(present, self._presence(present).T.dot(weights).tolist()))
+        return {keyword: int(counts[col]) if col is not None else 0 for keyword, col in zip(keywords, cols)}
+
+    def grouped_document_counts(self, keywords: List[str], groups: np.ndarray, n_groups: int) -> np.ndarray:
+        """
+        各关键词在每个分组内的数据条数（如按小时序号、按情感标签编码分组）
+
+        Args:
+            keywords: 关键词
+            groups: 每行的分组号（与构建时的行对齐），不在 [0, n_groups) 内的行不计入
+            n_groups: 分组数
+
+        Returns:
+            关键词数 × 分组数 的计数矩阵
+        """
+        result = np.zeros((len(keywords), n_groups), dtype=np.int64)
+        cols = [self.vocabulary.get(keyword) for keyword in keywords]
+        present = [i for i, col in enumerate(cols) if col is not None]
+        if not present:
+            return result
+
+        groups = np.asarray(groups)
+        rows = np.flatnonzero((groups >= 0) & (groups < n_groups))
+        one_hot = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int64), (rows, groups[rows].astype(np.int64))),
+            shape=(self.n_documents, n_groups)
+        )
+        # (关键词 × 行) · (行 × 分组)：一次稀疏矩阵乘法得到全部计数
+        result[present] = (self._presence([cols[i] for i in present]).T @ one_hot).toarray()
+        return result
+
+    def _presence(self, cols: List[int]) -> sparse.csc_matrix:
+        """选出的列（二值化：每条数据中的词只计一次）"""
+        presence = self._columns[:, cols]
+        presence.data = np.ones_like(presence.data)
+        return presence
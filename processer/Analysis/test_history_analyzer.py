@@ -0,0 +1,51 @@
+"""
+HistoryAnalyzer 向量化单元测试
+验证按小时序号分箱的计数与逐关键词、逐区间过滤的结果相同（含整点边界与缺失时间），不依赖 Redis
+"""
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from history_analyzer import HistoryAnalyzer
+from term_matrix import DocumentTermMatrix
+from text_analyzer import TextAnalyzer
+
+END = pd.Timestamp('2025-11-02T15:00:00Z')
+TIME_WINDOWS = {'latest_time': END, 'history_window_start': END - pd.Timedelta(hours=25)}
+
+
+def _frame():
+    offsets = [-25, -24, -23.5, -1, -0.01, 0, 0.5, -12, -12, None]
+    texts = ['tesla', 'tesla rally', 'nvidia', 'tesla nvidia', 'rally', 'tesla', 'nvidia', 'tesla', 'nvidia chip', 'tesla']
+    times = [END + pd.Timedelta(hours=h) if h is not None else pd.NaT for h in offsets]
+    return pd.DataFrame({'created_at': pd.Series(times, dtype='datetime64[ns, UTC]'), 'clean_text': texts})
+
+
+def _reference(df, keywords, analyzer):
+    """逐关键词、逐区间过滤（向量化之前的实现）"""
+    intervals = analyzer._create_24hour_intervals(TIME_WINDOWS['history_window_start'], END)
+    result = {}
+    for keyword in keywords:
+        keyword_df = df[df['clean_text'].str.contains(keyword, case=False, na=False)]
+        result[keyword] = [
+            {"timestamp": start.strftime("%Y-%m-%dT%H:%M:%SZ"),
+             "frequency": len(keyword_df[(keyword_df['created_at'] >= start) & (keyword_df['created_at'] < end)])}
+            for start, end in intervals
+        ]
+    return result
+
+
+def test_vectorized_history_matches_interval_filters():
+    """子串匹配路径与文档-词矩阵路径都与逐区间过滤一致"""
+    df = _frame()
+    analyzer = HistoryAnalyzer()
+    keywords = ['tesla', 'nvidia', 'rally', 'missing']
+    expected = _reference(df, keywords, analyzer)
+
+    assert analyzer.generate_history_data(df, keywords, TIME_WINDOWS) == expected
+    matrix = DocumentTermMatrix.from_frame(df, TextAnalyzer().tokenizer)
+    assert analyzer.generate_history_data(df, keywords, TIME_WINDOWS, matrix) == expected
+    assert [point['frequency'] for point in expected['tesla']].count(0) == 21
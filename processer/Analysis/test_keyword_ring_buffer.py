@@ -0,0 +1,63 @@
+"""
+关键词环形缓冲单元测试
+验证历史曲线、历史条数与情感分布和逐词扫描的结果一致，整点槽随窗口移出，不依赖 Redis
+"""
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from history_analyzer import HistoryAnalyzer
+from keyword_ring_buffer import KeywordRingBuffer
+from sentiment_analyzer import SentimentAnalyzer
+from text_analyzer import TextAnalyzer
+
+TOKENIZER = TextAnalyzer().tokenizer
+END = pd.Timestamp('2025-11-02T15:00:00Z')
+
+
+def _frame():
+    rows = [
+        (END - pd.Timedelta(minutes=10), 'tesla earnings beat tesla', 'Bullish'),
+        (END - pd.Timedelta(minutes=50), 'nvidia chip demand', 'Bearish'),
+        (END - pd.Timedelta(hours=3, minutes=5), 'tesla recall', 'Bearish'),
+        (END - pd.Timedelta(hours=23, minutes=30), 'nvidia tesla partnership', 'neutral'),
+        (END - pd.Timedelta(hours=25), 'tesla deliveries', 'Bullish'),
+    ]
+    df = pd.DataFrame(rows, columns=['created_at', 'clean_text', 'sentiment'])
+    df['tokens'] = [TOKENIZER.tokenize(text) for text in df['clean_text']]
+    return df
+
+
+def test_history_and_sentiment_match_row_scans():
+    """24 点历史曲线与情感分布和逐词扫描 DataFrame 的结果相同"""
+    df = _frame()
+    buffer = KeywordRingBuffer.from_frame(df, TOKENIZER)
+    keywords = ['tesla', 'nvidia', 'chip']
+    time_windows = {'latest_time': END, 'history_window_start': END - pd.Timedelta(hours=25)}
+
+    assert buffer.history(keywords, END) == HistoryAnalyzer().generate_history_data(df, keywords, time_windows)
+    assert buffer.document_counts(['tesla'], END - pd.Timedelta(hours=25), END) == {'tesla': 4}
+
+    analyzer = SentimentAnalyzer()
+    for keyword in keywords:
+        assert analyzer.distribution_from_counts(*buffer.sentiment_counts(keyword)) == \
+            analyzer.analyze_sentiment_distribution(df, keyword)
+
+
+def test_exact_token_matching():
+    """按词精确匹配：cut 不命中 shortcut"""
+    df = pd.DataFrame({'created_at': [END - pd.Timedelta(minutes=5)] * 2,
+                       'clean_text': ['fed cut expected', 'shortcut to profits'],
+                       'sentiment': ['Bullish', 'Bearish']})
+    buffer = KeywordRingBuffer.from_frame(df, TOKENIZER)
+    assert buffer.document_counts(['cut']) == {'cut': 1}
+
+
+def test_rotate_drops_expired_hours():
+    """整点过后最旧的槽移出"""
+    buffer = KeywordRingBuffer.from_frame(_frame(), TOKENIZER)
+    assert buffer.rotate(END - pd.Timedelta(hours=24)) == 1
+    assert buffer.document_counts(['tesla']) == {'tesla': 3}
@@ -0,0 +1,60 @@
+"""
+新闻流单元测试
+验证 nlargest 选取与整列情感标签和逐行 iterrows + 按 id 过滤的结果一致，不依赖 Redis
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from news_processor import NewsProcessor
+
+END = pd.Timestamp('2025-11-02T15:00:00Z')
+
+
+def _frame():
+    sentiments = ['Bullish', 'Bearish', 'neutral', None]
+    df = pd.DataFrame({
+        'id': [f'p{i % 7}' for i in range(12)],
+        'text': [f'headline {i}' for i in range(12)],
+        'timestamp': [END - pd.Timedelta(minutes=7 * i) for i in range(12)],
+        'source': ['reddit', 'rss'] * 6,
+        'url': [f'https://example.com/{i}' for i in range(12)],
+        'sentiment': [sentiments[(i * 5) % 4] for i in range(12)],
+    })
+    df.loc[3, 'id'] = np.nan
+    return df
+
+
+def _reference(processor, df, limit):
+    """逐行 iterrows + 按 id 过滤（向量化之前的实现）"""
+    feed = []
+    for _, row in df.sort_values('timestamp', ascending=False).head(limit).iterrows():
+        distribution = processor.sentiment_analyzer.analyze_sentiment_distribution(df[df['id'] == row['id']])
+        feed.append({
+            "title": row['text'],
+            "publish_time": row['timestamp'].strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "source": row['source'],
+            "url": row.get('url', ''),
+            "sentiment": processor._determine_sentiment_label(distribution),
+        })
+    return feed
+
+
+def test_feed_matches_row_by_row_generation():
+    """同一 id 的多条数据合并计算情感，缺失 id 视为 negative"""
+    df = _frame()
+    processor = NewsProcessor()
+    for limit in [1, 5, 12, 50]:
+        assert processor.generate_news_feed(df, [], limit) == _reference(processor, df, limit)
+
+
+def test_feed_without_url_column():
+    df = _frame().drop(columns=['url'])
+    feed = NewsProcessor().generate_news_feed(df, [], 3)
+    assert [item['url'] for item in feed] == ['', '', '']
+    assert [item['title'] for item in feed] == ['headline 0', 'headline 1', 'headline 2']
+    assert NewsProcessor().generate_news_feed(df.iloc[0:0], [], 3) == []
@@ -0,0 +1,69 @@
+"""
+文档-词矩阵单元测试
+验证按词精确匹配的过滤与按窗口计数和逐词扫描一致，不依赖 Redis
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sentiment_analyzer import SentimentAnalyzer
+from term_matrix import DocumentTermMatrix
+from text_analyzer import TextAnalyzer
+
+TOKENIZER = TextAnalyzer().tokenizer
+
+
+def _frame():
+    df = pd.DataFrame({
+        'clean_text': ['tesla earnings beat tesla', 'nvidia chip demand', 'tesla recall',
+                       'fed cut expected', 'shortcut to profits', ''],
+        'sentiment': ['Bullish', 'Bearish', 'Bearish', 'neutral', 'Bullish', 'neutral'],
+    })
+    # 第一行使用 Cleaner 预先分词的结果，其余行现场分词
+    df['tokens'] = [['tesla', 'earnings', 'beat', 'tesla']] + [None] * 5
+    return df
+
+
+def test_document_counts_and_masks():
+    """每条数据中的词只计一次，行过滤按位置对齐"""
+    matrix = DocumentTermMatrix.from_frame(_frame(), TOKENIZER)
+    assert matrix.n_documents == 6
+    assert matrix.document_counts(['tesla', 'nvidia', 'missing']) == {'tesla': 2, 'nvidia': 1, 'missing': 0}
+    assert matrix.document_counts(['tesla'], row_mask=np.array([False, True, True, True, True, True])) == {'tesla': 1}
+    assert matrix.document_mask('tesla').tolist() == [True, False, True, False, False, False]
+
+
+def test_exact_token_semantics():
+    """cut 不再命中 shortcut"""
+    df = _frame()
+    matrix = DocumentTermMatrix.from_frame(df, TOKENIZER)
+    assert matrix.document_counts(['cut']) == {'cut': 1}
+    assert df['clean_text'].str.contains('cut').sum() == 2
+
+
+def test_sentiment_distribution_with_matrix():
+    """用矩阵过滤的情感分布与没有子串歧义时的逐词扫描相同"""
+    df = _frame()
+    matrix = DocumentTermMatrix.from_frame(df, TOKENIZER)
+    analyzer = SentimentAnalyzer()
+    for keyword in ['tesla', 'nvidia', 'recall']:
+        assert analyzer.analyze_sentiment_distribution(df, keyword, matrix) == \
+            analyzer.analyze_sentiment_distribution(df, keyword)
+
+
+def test_sentiment_distributions_in_one_pass():
+    """一次计算的多个关键词情感分布与逐个计算相同（含缺失情感标签与未出现的词）"""
+    df = _frame()
+    df.loc[1, 'sentiment'] = None
+    matrix = DocumentTermMatrix.from_frame(df, TOKENIZER)
+    analyzer = SentimentAnalyzer()
+    keywords = ['tesla', 'nvidia', 'cut', 'recall', 'missing']
+    expected = {keyword: analyzer.analyze_sentiment_distribution(df, keyword, matrix) for keyword in keywords}
+    assert analyzer.analyze_sentiment_distributions(df, keywords, matrix) == expected
+    assert analyzer.analyze_sentiment_distributions(df, ['tesla', 'nvidia']) == \
+        {keyword: analyzer.analyze_sentiment_distribution(df, keyword) for keyword in ['tesla', 'nvidia']}
+    assert expected['nvidia']['total_comments'] == 1
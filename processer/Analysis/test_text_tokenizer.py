@@ -0,0 +1,82 @@
+"""
+预先分词单元测试
+验证 Cleaner 输出的 tokens 与 Processor 自行分词的结果一致，且分词器版本不一致时回退重新分词，不依赖 Redis
+"""
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / 'cleaner'))
+
+from config import CONFIG
+from data_loader import DataLoader
+from text_analyzer import TextAnalyzer
+from services.record_cleaner import clean_record
+from utils.text_tokenizer import TextTokenizer, load_stop_words
+
+TEXTS = [
+    "BTC breaking out!!! https://t.co/abc $BTC.X to the moon, 2024 target 100000",
+    "The Fed raises rates again; markets tumble as bonds sell off",
+    "",
+]
+
+
+def _loader() -> DataLoader:
+    # 跳过 Redis 连接
+    loader = DataLoader.__new__(DataLoader)
+    loader.config = CONFIG
+    loader.tokenizer = TextTokenizer(CONFIG['stop_words'])
+    return loader
+
+
+def test_cleaner_tokens_match_processor():
+    """Cleaner 预先分词的结果与 Processor 的 clean_text / 分词结果相同"""
+    tokenizer = TextTokenizer(load_stop_words())
+    analyzer = TextAnalyzer()
+    loader = _loader()
+    assert tokenizer.version == analyzer.tokenizer.version
+
+    for i, text in enumerate(TEXTS):
+        cleaned = clean_record({'id': str(i), 'text': text, 'source': 'twitter'}, tokenizer=tokenizer)
+        assert cleaned['clean_text'] == loader._clean_text(text)
+        assert cleaned['tokens'] == analyzer._tokenize_text(loader._clean_text(text))
+        assert cleaned['tokenizer_version'] == tokenizer.version
+
+
+def test_version_mismatch_falls_back():
+    """只有版本一致且 tokens 为列表的行才视为预先分词"""
+    loader = _loader()
+    df = pd.DataFrame({
+        'clean_text': ['btc moon', 'fed rates', 'eth'],
+        'tokens': [['btc', 'moon'], ['fed', 'rates'], None],
+        'tokenizer_version': [loader.tokenizer.version, 'v0-deadbeef', loader.tokenizer.version],
+    })
+    assert loader._precomputed_rows(df).tolist() == [True, False, False]
+    assert not loader._precomputed_rows(df[['clean_text']]).any()
+
+
+def test_extract_keywords_uses_token_lists():
+    """extract_keywords 使用预先分词结果，缺失的行对 clean_text 分词"""
+    analyzer = TextAnalyzer()
+    texts = ['bitcoin rally bitcoin', 'ethereum rally']
+    # 第一行的 tokens 故意与文本不同，证明直接使用了预先分词结果
+    keywords = dict(analyzer.extract_keywords(texts, top_n=10, token_lists=[['solana'], None]))
+    assert keywords == {'solana': 1, 'ethereum': 1, 'rally': 1}
+
+    assert dict(analyzer.extract_keywords(texts, top_n=10)) == {'bitcoin': 2, 'rally': 2, 'ethereum': 1}
+
+
+def test_text_field_choice_matches_cleaner():
+    """只有 content 的行：Processor 回退分词与 Cleaner 取同一字段（即使数据中存在 text 列）"""
+    tokenizer = TextTokenizer(load_stop_words())
+    records = [
+        {'id': 'a', 'source': 'rss', 'text': 'Tesla recall widens after probe', 'created_at': '2025-11-02T14:00:00Z'},
+        {'id': 'b', 'source': 'rss', 'content': 'Nvidia earnings beat estimates', 'created_at': '2025-11-02T14:05:00Z'},
+    ]
+    expected = [clean_record(record, tokenizer=tokenizer)['clean_text'] for record in records]
+
+    df = _loader().preprocess_data(pd.DataFrame(records))
+    assert df['clean_text'].tolist() == expected
+    assert expected[1] == 'nvidia earnings beat estimates'
@@ -0,0 +1,111 @@
+"""
+增量模式单元测试
+验证从队列头部读取到已处理记录即停止、窗口淘汰与来源计数、无变化时跳过，不依赖 Redis
+"""
+import json
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import CONFIG
+from data_loader import DataLoader
+from main import MainProcessor
+from window_state import RollingWindow
+
+
+class MemoryClient:
+    """只实现 LLEN / LRANGE 的客户端"""
+
+    def __init__(self, items):
+        self.items = list(items)
+        self.lrange_calls = 0
+
+    def pipeline(self, transaction=True):
+        return MemoryPipeline(self)
+
+    def llen(self, key):
+        return len(self.items)
+
+    def lrange(self, key, start, end):
+        self.lrange_calls += 1
+        return self.items[start:end + 1]
+
+    def lpush(self, *items):
+        self.items[:0] = reversed(items)
+
+
+class MemoryPipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        def call(*args):
+            self.calls.append((name, args))
+        return call
+
+    def execute(self):
+        return [getattr(self.client, name)(*args) for name, args in self.calls]
+
+
+def _item(item_id, age_hours=1, source='rss'):
+    return json.dumps({'id': item_id, 'source': source, 'text': f'post {item_id}',
+                       'created_ts': int(time.time() - age_hours * 3600)})
+
+
+def _loader(client, initial_chunk=2) -> DataLoader:
+    # 跳过 Redis 连接与 BERT，预处理只转换时间
+    loader = DataLoader.__new__(DataLoader)
+    loader.config = {**CONFIG, 'incremental': {'initial_chunk': initial_chunk, 'max_chunk': 4}}
+    loader.redis_client = client
+    loader.preprocess_data = lambda df: df.assign(created_at=pd.to_datetime(df['created_ts'], unit='s', utc=True))
+    return loader
+
+
+def test_load_new_stops_at_first_known_record():
+    """从头部按块读取，遇到第一条已处理的记录即停止"""
+    client = MemoryClient([_item(f'p{i}') for i in range(20)])
+    df, keys, queue_length = _loader(client).load_new_from_redis({'p5', 'p6'})
+    assert keys == ['p0', 'p1', 'p2', 'p3', 'p4']
+    assert list(df['id']) == keys
+    assert queue_length == 20
+    # 第一块 2 条（pipeline），之后 4 条一块，读到 p5 所在的块为止
+    assert client.lrange_calls == 2
+
+
+def test_window_evicts_and_keeps_source_counts():
+    """移出窗口的数据同时从 ID 集合与来源计数中删除"""
+    window = RollingWindow(history_hours=24)
+    df = pd.DataFrame({'id': ['a', 'b', 'c'], 'source': ['rss', 'reddit', 'rss'],
+                       'created_at': pd.to_datetime([time.time() - 30 * 3600, time.time(), time.time()],
+                                                    unit='s', utc=True)})
+    window.append(df, ['a', 'b', 'c'])
+    assert window.evict(window.cutoff()) == 1
+    assert window.ids == {'b', 'c'}
+    assert dict(window.source_counts) == {'rss': 1, 'reddit': 1}
+    assert '_window_key' not in window.snapshot().columns
+
+
+def test_update_window_only_processes_new_records_and_skips_when_unchanged():
+    """首次全量建立窗口，之后只预处理新数据，没有变化时窗口版本不变"""
+    client = MemoryClient([_item(f'p{i}') for i in range(5)] + [_item('old', age_hours=30)])
+    processor = MainProcessor.__new__(MainProcessor)
+    processor.config = CONFIG
+    processor.data_loader = _loader(client)
+    processor.window = RollingWindow(history_hours=24)
+
+    assert len(processor._update_window()) == 5
+    processor.window.mark_processed()
+
+    processor._update_window()
+    assert not processor.window.changed
+
+    client.lpush(_item('p5', source='reddit'), _item('p6', source='reddit'))
+    df = processor._update_window()
+    assert processor.window.changed
+    assert sorted(df['id']) == ['p0', 'p1', 'p2', 'p3', 'p4', 'p5', 'p6']
+    assert processor.window.source_counts['reddit'] == 2
@@ -1,45 +1,52 @@
 import re
+import sys
 from collections import Counter
-from typing import List, Dict, Any, Tuple
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
 import pandas as pd
 from config import CONFIG
 
+# 仓库根目录（Cleaner 与 Processor 共用的 utils 模块）
+REPO_ROOT = str(Path(__file__).resolve().parent.parent.parent)
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from utils.text_tokenizer import TextTokenizer
+
 
 class TextAnalyzer:
     def __init__(self):
         self.config = CONFIG
         self.stop_words = set(self.config['stop_words'])
+        self.tokenizer = TextTokenizer(self.stop_words)
 
-    def extract_keywords(self, texts: List[str], top_n: int = None) -> List[Tuple[str, int]]:
-        """提取关键词并计算词频"""
+    def extract_keywords(self, texts: List[str], top_n: int = None,
+                         token_lists: Optional[List[Any]] = None) -> List[Tuple[str, int]]:
+        """
+        提取关键词并计算词频
+
+        Args:
+            texts: clean_text 列表
+            top_n: 返回数量
+            token_lists: 与 texts 对应的预先分词结果（Cleaner 提供，缺失的行为 None 时对 text 分词）
+        """
         if top_n is None:
             top_n = self.config['word_cloud_count']
 
-        all_words = []
-        for text in texts:
-            if isinstance(text, str):
-                words = self._tokenize_text(text)
-                all_words.extend(words)
-
-        # 计算词频
-        word_freq = Counter(all_words)
+        word_freq = Counter()
+        token_lists = token_lists if token_lists is not None else [None] * len(texts)
+        for text, tokens in zip(texts, token_lists):
+            if isinstance(tokens, list):
+                word_freq.update(tokens)
+            elif isinstance(text, str):
+                word_freq.update(self._tokenize_text(text))
 
         # 返回前N个关键词
         return word_freq.most_common(top_n)
 
     def _tokenize_text(self, text: str) -> List[str]:
-        """分词处理"""
-        words = text.split()
-
-        # 过滤停用词和短词
-        filtered_words = [
-            word for word in words
-            if (len(word) > 2 and
-                word not in self.stop_words and
-                not word.isdigit())
-        ]
-
-        return filtered_words
+        """分词处理（过滤停用词、短词与纯数字，规则与 Cleaner 共用）"""
+        return self.tokenizer.tokenize(text)
 
     def calculate_growth_rate(self, current_freq: int, history_avg_freq: float) -> float:
         """计算增长率 - 当前30分钟频率与历史24小时平均频率比较"""
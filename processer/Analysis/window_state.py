@@ -0,0 +1,136 @@
+"""
+Processor 常驻的滚动窗口状态（增量模式）
+保存已预处理（清理文本、分词、BERT 情感）的 24 小时窗口数据，
+每次通知只读取、预处理新写入的数据，并淘汰移出窗口的旧数据：
+- 水位线：窗口中已有的记录 ID。Cleaner 用 LPUSH 写入，新数据总在列表（或小时列表）头部，
+  从头部读取到第一条已有 ID 即停止，读取量与新数据量成正比
+- 淘汰：与 Cleaner 的过期清理相同，只保留当前整点往前 history_hours 小时的数据
+- 没有新数据也没有淘汰时窗口版本不变，Processor 跳过本轮处理
+- 可选的关键词环形缓冲（KeywordRingBuffer）随数据加入与淘汰同步更新
+"""
+import time
+from collections import Counter
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+
+def record_key(data: Dict[str, Any], raw: str) -> str:
+    """记录的水位线键（与 SentimentUpdater 相同取 id / post_id，都没有时用原始 JSON）"""
+    item_id = data.get('id') or data.get('post_id')
+    return str(item_id) if item_id else raw
+
+
+class RollingWindow:
+    """已预处理数据的滚动窗口"""
+
+    def __init__(self, history_hours: int = 24, full_resync_minutes: float = 0, keywords=None):
+        """
+        Args:
+            history_hours: 窗口长度（小时），与 Cleaner 的保留时间一致
+            full_resync_minutes: 定期全量重建的间隔（分钟），0 表示只在检测到队列被清空时重建
+            keywords: 关键词环形缓冲（可选）
+        """
+        self.history_hours = history_hours
+        self.full_resync_minutes = full_resync_minutes
+        self.keywords = keywords
+        self.frame = pd.DataFrame()
+        self.ids = set()
+        self.source_counts = Counter()
+        self.version = 0
+        self.processed_version = None
+        self.synced_at = None
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def changed(self) -> bool:
+        """窗口自上次处理以来是否有变化"""
+        return self.version != self.processed_version
+
+    def mark_processed(self):
+        """记录当前版本已处理（发布）"""
+        self.processed_version = self.version
+
+    def needs_resync(self, queue_length: Optional[int] = None) -> bool:
+        """
+        是否需要全量重建
+
+        Args:
+            queue_length: 队列当前总长度（比窗口中的数据少说明队列被清空或被其他工具删除）
+        """
+        if self.synced_at is None:
+            return True
+        if queue_length is not None and queue_length < len(self.frame):
+            return True
+        return bool(self.full_resync_minutes) and time.time() - self.synced_at >= self.full_resync_minutes * 60
+
+    def reset(self):
+        """清空窗口（全量重建前调用）"""
+        self.frame = pd.DataFrame()
+        self.ids = set()
+        self.source_counts = Counter()
+        if self.keywords is not None:
+            self.keywords.reset()
+        self.version += 1
+        self.synced_at = time.time()
+
+    def cutoff(self, now: Optional[float] = None) -> pd.Timestamp:
+        """窗口下界：当前整点往前 history_hours 小时（UTC）"""
+        now = now if now is not None else time.time()
+        return pd.Timestamp(now, unit='s', tz='UTC').floor('h') - pd.Timedelta(hours=self.history_hours)
+
+    def append(self, df: pd.DataFrame, keys: list) -> int:
+        """
+        加入预处理后的新数据
+
+        Args:
+            df: preprocess_data 的输出（队列顺序，最新在前）
+            keys: 与 df 行一一对应的水位线键
+
+        Returns:
+            加入的行数
+        """
+        if df.empty:
+            return 0
+        df = df.reset_index(drop=True)
+        df['_window_key'] = keys
+        # 新数据在前，与队列顺序（最新在头部）一致
+        self.frame = df if self.frame.empty else pd.concat([df, self.frame], ignore_index=True)
+        self.ids.update(keys)
+        if 'source' in df.columns:
+            self.source_counts.update(df['source'].dropna())
+        if self.keywords is not None:
+            self.keywords.add(df)
+        self.version += 1
+        return len(df)
+
+    def evict(self, cutoff: pd.Timestamp) -> int:
+        """
+        淘汰发布时间早于 cutoff 的数据
+
+        Returns:
+            淘汰的行数
+        """
+        if self.frame.empty:
+            return 0
+        time_field = 'created_at' if 'created_at' in self.frame.columns else 'timestamp'
+        expired = self.frame[time_field] < cutoff
+        if not expired.any():
+            return 0
+
+        old = self.frame[expired]
+        self.ids.difference_update(old['_window_key'])
+        if 'source' in old.columns:
+            self.source_counts.subtract(old['source'].dropna())
+            self.source_counts = +self.source_counts
+        self.frame = self.frame[~expired].reset_index(drop=True)
+        if self.keywords is not None:
+            self.keywords.rotate(cutoff)
+        self.version += 1
+        return len(old)
+
+    def snapshot(self) -> pd.DataFrame:
+        """当前窗口数据（供分析使用，不含内部列）"""
+        return self.frame.drop(columns=['_window_key'], errors='ignore')
@@ -38,6 +38,8 @@ class TestRedisClient:
         mock_client.ping.return_value = True
         mock_client.llen.return_value = 100
         mock_client.get.return_value = '10'  # 来源计数
+        mock_pipeline = MagicMock()
+        mock_client.pipeline.return_value = mock_pipeline
         mock_redis.return_value = mock_client
         
         client = RedisClient(queue_name='test_queue')
@@ -46,8 +48,54 @@ class TestRedisClient:
         result = client.push_data(data)
         
         assert result is True
-        mock_client.lpush.assert_called_once()
-        mock_client.incr.assert_called_once()
+        # LPUSH 与写入计数在同一事务中执行
+        mock_pipeline.lpush.assert_called_once_with('test_queue', json.dumps(data, ensure_ascii=False))
+        mock_pipeline.incr.assert_called_once_with('test_queue:pushed')
+        mock_pipeline.execute.assert_called_once()
+        # 来源计数
+        mock_client.incr.assert_called_once_with(client._source_count_key('reddit'))
+    
+    @patch('utils.redis_client.redis.Redis')
+    def test_push_batch_increments_pushed_counter(self, mock_redis):
+        """测试批量推送时写入计数按实际推送条数递增（与 LPUSH 同一事务）"""
+        mock_client = MagicMock()
+        mock_client.ping.return_value = True
+        mock_client.get.return_value = '0'
+        mock_pipeline = MagicMock()
+        mock_client.pipeline.return_value = mock_pipeline
+        mock_redis.return_value = mock_client
+        
+        client = RedisClient(queue_name='test_queue')
+        data_list = [
+            {'source': 'reddit', 'title': 'Post 1'},
+            {'source': 'reddit', 'title': 'Post 2'},
+            {'source': 'rss', 'title': 'Article'},
+        ]
+        
+        assert client.push_batch(data_list) == 3
+        assert mock_pipeline.lpush.call_count == 3
+        mock_pipeline.incrby.assert_called_once_with('test_queue:pushed', 3)
+        mock_pipeline.execute.assert_called_once()
+    
+    @patch('utils.redis_client.redis.Redis')
+    def test_push_batch_skips_counter_when_nothing_pushed(self, mock_redis):
+        """测试全部超过配额时不执行事务、不递增写入计数"""
+        mock_client = MagicMock()
+        mock_client.ping.return_value = True
+        mock_client.get.return_value = '600'
+        mock_pipeline = MagicMock()
+        mock_client.pipeline.return_value = mock_pipeline
+        mock_redis.return_value = mock_client
+        
+        client = RedisClient(
+            queue_name='test_queue',
+            storage_config={'max_keep': 1000},
+            source_quotas={'reddit': 0.5}
+        )
+        
+        assert client.push_batch([{'source': 'reddit', 'title': 'Post'}]) == 0
+        mock_pipeline.incrby.assert_not_called()
+        mock_pipeline.execute.assert_not_called()
     
     @patch('utils.redis_client.redis.Redis')
     def test_push_data_quota_exceeded(self, mock_redis):
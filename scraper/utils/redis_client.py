@@ -53,6 +53,8 @@ class RedisClient:
         self.source_quotas = source_quotas or kwargs.get('source_quotas') or {}
         # 以 Redis Key 记录每个来源的计数，避免全量扫描
         self.source_count_prefix = f"{self.queue_name}:source_count:"
+        # 累计写入条数（只增不减，Cleaner 游标用它定位上一轮之后的新数据）
+        self.pushed_key = f"{self.queue_name}:pushed"
 
         try:
             self.client = redis.Redis(
@@ -103,7 +105,11 @@ class RedisClient:
                 logger.warning(f"⚠️  来源 {source} 已超过配额，丢弃新数据以保护总量（soft limit）")
                 return False
 
-            self.client.lpush(self.queue_name, json_data)
+            # 写入计数与 LPUSH 在同一事务中递增（Cleaner 游标据此计算新数据条数）
+            pipe = self.client.pipeline()
+            pipe.lpush(self.queue_name, json_data)
+            pipe.incr(self.pushed_key)
+            pipe.execute()
             # 更新来源计数
             try:
                 self.client.incr(self._source_count_key(source))
@@ -189,6 +195,7 @@ class RedisClient:
                 to_incr[source] = to_incr.get(source, 0) + 1
                 success_count += 1
             if success_count:
+                pipe.incrby(self.pushed_key, success_count)
                 pipe.execute()
                 # 批量增加来源计数
                 for s, c in to_incr.items():
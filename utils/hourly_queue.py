@@ -0,0 +1,156 @@
+"""
+按小时分区的清洗结果队列
+Cleaner 写入、Cleaner 过期清理、Processor 读取与 sentiment 回写共用同一套键布局：
+- 每小时一个列表 {queue}:YYYYMMDDHH（UTC，按数据的 created_ts 分桶，LPUSH 写入，最新在头部）
+- 有序集合 {queue}:hours 记录活跃的小时列表，分数为该小时起点的 epoch 秒
+- 过期清理直接删除整小时的列表，读取时只取需要的小时
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+HOUR_SECONDS = 3600
+HOUR_FORMAT = "%Y%m%d%H"
+
+
+def hour_start(epoch: float) -> int:
+    """epoch 秒所在小时的起点"""
+    epoch = int(epoch)
+    return epoch - epoch % HOUR_SECONDS
+
+
+def hour_key(queue_name: str, start: int) -> str:
+    """小时列表的键名，如 clean_data_queue:2025110214"""
+    return f"{queue_name}:{datetime.fromtimestamp(start, tz=timezone.utc).strftime(HOUR_FORMAT)}"
+
+
+def index_key(queue_name: str) -> str:
+    """活跃小时索引（有序集合）的键名"""
+    return f"{queue_name}:hours"
+
+
+class HourlyQueue:
+    """按小时分区的队列（不持有数据，只负责键布局）"""
+
+    def __init__(self, client, queue_name: str, ttl_hours: Optional[int] = None):
+        """
+        初始化队列
+
+        Args:
+            client: Redis 客户端（decode_responses=True）
+            queue_name: 队列名（小时列表与索引以其为前缀）
+            ttl_hours: 小时列表的兜底过期时间（从该小时结束起算），None 表示只由过期清理删除
+        """
+        self.client = client
+        self.queue_name = queue_name
+        self.index_key = index_key(queue_name)
+        self.ttl_hours = ttl_hours
+
+    @classmethod
+    def from_config(cls, client, queue_name: str, layout_config: Optional[Dict[str, Any]]) -> Optional['HourlyQueue']:
+        """
+        根据布局配置创建实例
+
+        Args:
+            layout_config: {'layout': 'list' | 'hourly', 'ttl_hours': ...}
+
+        Returns:
+            HourlyQueue，布局为 list（单个列表）时返回 None
+        """
+        if not layout_config or layout_config.get('layout', 'list') != 'hourly':
+            return None
+        return cls(client, queue_name, layout_config.get('ttl_hours'))
+
+    def push(self, pipe, payloads: List[Tuple[float, str]]):
+        """
+        把数据写入所属小时的列表（命令加入调用方的 pipeline，与其他写入一起执行）
+
+        Args:
+            pipe: Redis pipeline
+            payloads: [(created_ts, JSON 字符串), ...]
+        """
+        by_hour: Dict[int, List[str]] = {}
+        for created_ts, payload in payloads:
+            by_hour.setdefault(hour_start(created_ts), []).append(payload)
+
+        for start, items in by_hour.items():
+            key = hour_key(self.queue_name, start)
+            pipe.lpush(key, *items)
+            pipe.zadd(self.index_key, {key: start})
+            if self.ttl_hours:
+                pipe.expireat(key, start + HOUR_SECONDS * (self.ttl_hours + 1))
+
+    def hour_keys(self, since: Optional[float] = None) -> List[str]:
+        """
+        活跃的小时列表（从旧到新）
+
+        Args:
+            since: 只返回包含该时刻及之后数据的小时（epoch 秒），None 表示全部
+        """
+        low = hour_start(since) if since is not None else '-inf'
+        return self.client.zrangebyscore(self.index_key, low, '+inf')
+
+    def read(self, since: Optional[float] = None) -> List[str]:
+        """
+        读取数据（一条 pipeline，最新的小时在前，与单列表 LRANGE 0 -1 的顺序一致）
+
+        Args:
+            since: 只读取包含该时刻及之后数据的小时（epoch 秒），None 表示全部
+        """
+        keys = self.hour_keys(since)
+        if not keys:
+            return []
+        pipe = self.client.pipeline(transaction=False)
+        for key in reversed(keys):
+            pipe.lrange(key, 0, -1)
+        items = []
+        for chunk in pipe.execute():
+            items.extend(chunk)
+        return items
+
+    def iter_items(self, chunk_size: int = 500) -> Iterator[Tuple[str, str]]:
+        """逐块遍历全部数据，产出 (小时列表键, JSON 字符串)"""
+        for key in self.hour_keys():
+            start = 0
+            while True:
+                chunk = self.client.lrange(key, start, start + chunk_size - 1)
+                for item in chunk:
+                    yield key, item
+                if len(chunk) < chunk_size:
+                    break
+                start += chunk_size
+
+    def length(self) -> int:
+        """全部小时列表的总长度"""
+        keys = self.hour_keys()
+        if not keys:
+            return 0
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.llen(key)
+        return sum(pipe.execute())
+
+    def drop_before(self, cutoff: float) -> Dict[str, int]:
+        """
+        删除早于 cutoff 的整小时列表（cutoff 为整点时与逐条比较 created_ts < cutoff 等价）
+
+        Args:
+            cutoff: 保留下界（epoch 秒）
+
+        Returns:
+            {'hours': 删除的小时数, 'removed': 删除的数据条数}
+        """
+        # 小时起点 + 1 小时 <= cutoff 的整小时全部早于 cutoff
+        keys = self.client.zrangebyscore(self.index_key, '-inf', hour_start(cutoff) - HOUR_SECONDS)
+        if not keys:
+            return {'hours': 0, 'removed': 0}
+
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.llen(key)
+        removed = sum(pipe.execute())
+
+        pipe = self.client.pipeline()
+        pipe.delete(*keys)
+        pipe.zrem(self.index_key, *keys)
+        pipe.execute()
+        return {'hours': len(keys), 'removed': removed}
@@ -0,0 +1,114 @@
+"""
+文本规范化与分词工具模块
+Cleaner 与 Processor 共用同一套规则：
+- clean_text：移除 URL 与 $XXX.X 代码、标点替换为空格、小写、合并空白
+- tokenize：按空白切分，过滤停用词、长度 ≤ 2 的词与纯数字
+- source_text：取哪个字段分词（text 优先，为空时用 content）
+
+规则版本与停用词表的摘要组成 TextTokenizer.version。Cleaner 把 clean_text / tokens / tokenizer_version
+写入清洗结果，Processor 只在版本一致时直接使用，否则重新计算（修改规则时需递增 TOKENIZER_VERSION）。
+"""
+import hashlib
+import importlib.util
+import re
+from pathlib import Path
+from typing import Any, Iterable, List, Mapping, Optional
+
+TOKENIZER_VERSION = 1
+
+# 分词使用的文本字段（按顺序取第一个非空字符串）
+SOURCE_TEXT_FIELDS = ('text', 'content')
+
+_URL_RE = re.compile(r'http\S+')
+_TICKER_RE = re.compile(r'\$\w+\.\w+')
+_PUNCT_RE = re.compile(r'[^\w\s]')
+
+# 停用词表的唯一来源：Processor 配置
+PROCESSOR_CONFIG = Path(__file__).resolve().parent.parent / "processer" / "Analysis" / "config.py"
+
+
+def clean_text(text: Any) -> str:
+    """
+    规范化文本
+
+    Args:
+        text: 原始文本（非字符串返回空字符串）
+
+    Returns:
+        小写、无标点、单空格分隔的文本
+    """
+    if not isinstance(text, str):
+        return ""
+    text = _URL_RE.sub('', text)
+    text = _TICKER_RE.sub('', text)
+    text = _PUNCT_RE.sub(' ', text)
+    return ' '.join(text.lower().split())
+
+
+def source_text(record: Mapping[str, Any]) -> str:
+    """
+    分词使用的原文（Cleaner 对清洗结果、Processor 对未预先分词的行使用同一规则）
+
+    Args:
+        record: 清洗结果（字典，或 DataFrame 行转换的字典）
+
+    Returns:
+        第一个非空的 text / content 字段，都为空时返回空字符串
+    """
+    for field in SOURCE_TEXT_FIELDS:
+        value = record.get(field)
+        if isinstance(value, str) and value:
+            return value
+    return ""
+
+
+class TextTokenizer:
+    """带版本号的分词器"""
+
+    def __init__(self, stop_words: Iterable[str]):
+        """
+        初始化分词器
+
+        Args:
+            stop_words: 停用词
+        """
+        self.stop_words = frozenset(stop_words)
+        digest = hashlib.sha1('\n'.join(sorted(self.stop_words)).encode('utf-8')).hexdigest()[:8]
+        self.version = f"v{TOKENIZER_VERSION}-{digest}"
+
+    def clean(self, text: Any) -> str:
+        """规范化文本（同 clean_text）"""
+        return clean_text(text)
+
+    def tokenize(self, text: str) -> List[str]:
+        """
+        对规范化后的文本分词
+
+        Args:
+            text: clean_text 的结果
+
+        Returns:
+            过滤后的词列表（保持原顺序，可重复）
+        """
+        stop_words = self.stop_words
+        return [
+            word for word in text.split()
+            if len(word) > 2 and word not in stop_words and not word.isdigit()
+        ]
+
+
+def load_stop_words(config_path: Optional[Path] = None) -> List[str]:
+    """
+    从 Processor 配置读取停用词（Cleaner 使用，保证两端分词一致）
+
+    Args:
+        config_path: Processor 的 config.py 路径（默认仓库内的 processer/Analysis/config.py）
+
+    Returns:
+        停用词列表
+    """
+    path = Path(config_path or PROCESSOR_CONFIG)
+    spec = importlib.util.spec_from_file_location("_processor_config", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return list(module.CONFIG['stop_words'])
@@ -0,0 +1,207 @@
+"""
+时间解析工具模块
+Cleaner 清洗、Cleaner 过期清理与 Processor 预处理共用同一套时间解析规则：
+- 规范格式 "YYYY-MM-DDTHH:MM:SSZ" 直接切片解析
+- 每个 (来源, 字段) 记住上次成功的格式，下次优先尝试
+- pandas Series 整列解析
+- 输出统一为 (epoch 秒, ISO 字符串)，不带时区的时间按 UTC 处理
+"""
+import calendar
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ISO_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+# fromisoformat 无法识别时依次尝试的格式
+FALLBACK_FORMATS = (
+    "%Y-%m-%d %H:%M:%S",
+    "%Y/%m/%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d",
+)
+
+# 格式记忆中的特殊标记
+_EPOCH = 'epoch'
+_ISO = 'iso'
+
+
+def _parse_canonical(s: str) -> Optional[int]:
+    """解析规范格式 "YYYY-MM-DDTHH:MM:SSZ"，不匹配时返回 None"""
+    if len(s) != 20 or s[4] != '-' or s[7] != '-' or s[10] != 'T' or s[13] != ':' or s[16] != ':' or s[19] != 'Z':
+        return None
+    try:
+        return calendar.timegm((int(s[0:4]), int(s[5:7]), int(s[8:10]),
+                                int(s[11:13]), int(s[14:16]), int(s[17:19]), 0, 0, 0))
+    except ValueError:
+        return None
+
+
+def _to_epoch(dt: datetime) -> int:
+    """datetime 转 epoch 秒（无时区按 UTC）"""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def format_epoch(epoch: int) -> str:
+    """epoch 秒转规范 ISO 字符串"""
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).strftime(ISO_FORMAT)
+
+
+class TimeParser:
+    """带格式记忆的时间解析器（每个进程持有一个即可）"""
+
+    def __init__(self):
+        # (来源, 字段) -> 上次成功的格式
+        self._formats: Dict[Tuple[Any, Any], str] = {}
+
+    def _try_format(self, s: str, fmt: str) -> Optional[int]:
+        """按指定格式解析字符串，失败返回 None"""
+        try:
+            if fmt == _EPOCH:
+                return int(float(s))
+            if fmt == _ISO:
+                return _to_epoch(datetime.fromisoformat(s.replace("Z", "+00:00")))
+            return _to_epoch(datetime.strptime(s, fmt))
+        except (ValueError, TypeError, OverflowError, OSError):
+            return None
+
+    def parse_epoch(self, value: Any, source: Any = None, field: Any = None) -> Optional[int]:
+        """
+        解析时间值为 epoch 秒
+
+        Args:
+            value: 时间值（Unix 时间戳、数字字符串、ISO 字符串或常见格式字符串）
+            source: 数据来源（与 field 一起作为格式记忆的键）
+            field: 字段名
+
+        Returns:
+            epoch 秒，无法解析时返回 None
+        """
+        if value is None or isinstance(value, bool):
+            return None
+
+        # 1. Unix 时间戳（整数或浮点数）
+        if isinstance(value, (int, float)):
+            if value != value:  # NaN
+                return None
+            return int(value)
+
+        s = str(value).strip()
+        if not s:
+            return None
+
+        # 2. 规范格式（Cleaner 输出）
+        epoch = _parse_canonical(s)
+        if epoch is not None:
+            return epoch
+
+        # 3. 该来源/字段上次成功的格式
+        key = (source, field)
+        remembered = self._formats.get(key)
+        if remembered is not None:
+            epoch = self._try_format(s, remembered)
+            if epoch is not None:
+                return epoch
+
+        # 4. 依次尝试：数字字符串 → ISO → 常见格式
+        candidates = [_EPOCH] if s.replace('.', '').isdigit() else []
+        candidates.append(_ISO)
+        candidates.extend(FALLBACK_FORMATS)
+        for fmt in candidates:
+            if fmt == remembered:
+                continue
+            epoch = self._try_format(s, fmt)
+            if epoch is not None:
+                self._formats[key] = fmt
+                return epoch
+
+        return None
+
+    def parse(self, value: Any, source: Any = None, field: Any = None) -> Optional[Tuple[int, str]]:
+        """
+        解析时间值为 (epoch 秒, 规范 ISO 字符串)
+
+        Args:
+            value: 时间值
+            source: 数据来源
+            field: 字段名
+
+        Returns:
+            (epoch, "YYYY-MM-DDTHH:MM:SSZ")，无法解析时返回 None
+        """
+        epoch = self.parse_epoch(value, source, field)
+        if epoch is None:
+            return None
+        try:
+            return epoch, format_epoch(epoch)
+        except (ValueError, OverflowError, OSError):
+            return None
+
+    def parse_many(self, values: Iterable[Any], source: Any = None,
+                   field: Any = None) -> List[Optional[int]]:
+        """
+        批量解析为 epoch 秒
+
+        Args:
+            values: 时间值序列
+            source: 数据来源
+            field: 字段名
+
+        Returns:
+            与输入一一对应的 epoch 列表，无法解析为 None
+        """
+        return [self.parse_epoch(value, source, field) for value in values]
+
+
+# 进程级默认解析器
+default_parser = TimeParser()
+
+
+def parse_time(value: Any, source: Any = None, field: Any = None) -> Optional[Tuple[int, str]]:
+    """使用默认解析器解析为 (epoch, ISO 字符串)"""
+    return default_parser.parse(value, source, field)
+
+
+def parse_epoch(value: Any, source: Any = None, field: Any = None) -> Optional[int]:
+    """使用默认解析器解析为 epoch 秒"""
+    return default_parser.parse_epoch(value, source, field)
+
+
+def to_utc_series(values, epochs=None):
+    """
+    整列解析为带 UTC 时区的 pandas datetime
+
+    先用 epochs（如 Cleaner 输出的 created_ts）；其余值按规范格式整列解析，
+    仍无法解析的少量值逐个交给 TimeParser，最终失败的为 NaT。
+
+    Args:
+        values: pandas Series（时间字符串或数字）
+        epochs: 可选的 epoch 秒 Series，与 values 对齐
+
+    Returns:
+        datetime64[UTC] 的 pandas Series
+    """
+    import pandas as pd
+
+    result = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns, UTC]')
+
+    if epochs is not None:
+        epoch_values = pd.to_numeric(epochs, errors='coerce')
+        result = result.fillna(pd.to_datetime(epoch_values, unit='s', utc=True, errors='coerce'))
+
+    pending = result.isna() & values.notna()
+    if pending.any():
+        strings = values[pending].astype(str)
+        result[pending] = pd.to_datetime(strings, format=ISO_FORMAT, utc=True, errors='coerce')
+
+    pending = result.isna() & values.notna()
+    if pending.any():
+        parsed = default_parser.parse_many(values[pending].tolist())
+        result[pending] = pd.to_datetime(pd.Series(parsed, index=values[pending].index, dtype='float64'),
+                                         unit='s', utc=True, errors='coerce')
+
+    return result